@@ -18,9 +18,20 @@ import sqlite3
 import json
 import csv
 import io
-from datetime import datetime, date
+import tempfile
+import uuid
+import re
+import gzip
+import zlib
+import hashlib
+import threading
+import queue
+from datetime import datetime, date, time, timedelta, timezone
 from contextlib import contextmanager
-from flask import Flask, request, jsonify, send_file, make_response
+from functools import lru_cache
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, request, jsonify, send_file, render_template, Response, stream_with_context
 from flask_cors import CORS
 from reportlab.lib.pagesizes import A4, letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -31,6 +42,7 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from reportlab.graphics.shapes import Drawing, Rect
 from reportlab.graphics import renderPDF
 import logging
+import orjson
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -43,28 +55,200 @@ CORS(app, origins="*")
 DATABASE_PATH = os.getenv('DATABASE_PATH', '/tmp/raf_bomber_command_advanced.db')
 PORT = int(os.getenv('PORT', 5000))
 
+# Compiled statements kept per connection (sqlite3 default is 128)
+SQL_STATEMENT_CACHE_SIZE = 512
+
+# Row counts for every data table, fetched in a single statement
+TABLE_COUNTS_SQL = '''
+    SELECT (SELECT COUNT(*) FROM personnel),
+           (SELECT COUNT(*) FROM aircraft),
+           (SELECT COUNT(*) FROM squadrons),
+           (SELECT COUNT(*) FROM missions)
+'''
+
+# Page cache per connection; negative values are KiB (64 MiB)
+SQL_PAGE_CACHE_SIZE = -65536
+
+# Memory-mapped I/O per connection, in bytes (256 MiB)
+SQL_MMAP_SIZE = 256 * 1024 * 1024
+
+# Idle connections kept open between requests; they keep their page cache,
+# memory map and compiled statements warm
+SQL_POOL_SIZE = int(os.getenv('SQL_POOL_SIZE', 8))
+connection_pool = queue.LifoQueue(maxsize=SQL_POOL_SIZE)
+
+# Keep IN (...) lookups well below SQLITE_MAX_VARIABLE_NUMBER
+SERVICE_NUMBER_BATCH_SIZE = 500
+
+# Rows written per csv.writer.writerows() call and per streamed chunk
+CSV_EXPORT_BATCH_SIZE = 2048
+
+# Streaming gzip level for CSV exports (speed over ratio, since it runs per request)
+CSV_EXPORT_GZIP_LEVEL = 6
+
+# Numeric julianday() shadows of the ISO-8601 date columns used by filters
+PERSONNEL_JULIAN_DAY_COLUMNS = {
+    'date_of_death_jd': 'date_of_death',
+    'service_start_jd': 'service_start_date',
+    'service_end_jd': 'service_end_date',
+}
+
+# julianday() of proleptic Gregorian ordinal 0
+JULIAN_DAY_OFFSET = 1721424.5
+
+# Personnel columns written to CSV exports, in header order
+PERSONNEL_EXPORT_COLUMNS = (
+    'service_number', 'rank', 'name', 'role', 'squadron', 'aircraft_type',
+    'date_of_birth', 'date_of_death', 'age_at_death', 'place_of_birth',
+    'memorial_location', 'memorial_panel', 'awards', 'final_mission',
+    'base_location', 'mission_count', 'service_start_date', 'service_end_date'
+)
+
+# Personnel columns rendered by the search result cards
+PERSONNEL_LIST_COLUMNS = (
+    'id', 'service_number', 'rank', 'name', 'role', 'squadron', 'aircraft_type',
+    'base_location', 'age_at_death', 'mission_count', 'memorial_location',
+    'memorial_panel', 'awards', 'service_start_date', 'service_end_date', 'biography'
+)
+
+PERSONNEL_EXPORT_HEADER = [
+    'Service Number', 'Rank', 'Name', 'Role', 'Squadron', 'Aircraft Type',
+    'Date of Birth', 'Date of Death', 'Age at Death', 'Place of Birth',
+    'Memorial Location', 'Memorial Panel', 'Awards', 'Final Mission',
+    'Base Location', 'Mission Count', 'Service Start', 'Service End'
+]
+
+AIRCRAFT_EXPORT_HEADER = [
+    'Aircraft ID', 'Aircraft Type', 'Squadron', 'Squadron Code',
+    'Service Start', 'Service End', 'Service Days',
+    'Fate', 'Notable Crew', 'Missions Flown', 'Base Location',
+    'Manufacturer', 'First Flight Date'
+]
+
+# Browser cache lifetime for the static frontend page
+FRONTEND_MAX_AGE = 3600
+
+# Frontend script; served under a content-hashed name and cached for a year
+FRONTEND_SCRIPT = 'advanced_filters.js'
+FRONTEND_ASSET_MAX_AGE = 31536000
+
+# Background export jobs (PDF reports and bulk CSV)
+EXPORT_JOBS_DIR = os.getenv('EXPORT_JOBS_DIR', '/tmp/raf_bomber_command_exports')
+EXPORT_WORKERS = int(os.getenv('EXPORT_WORKERS', 2))
+
+# Finished export jobs (and their files) are removed after this many seconds
+EXPORT_JOB_TTL = int(os.getenv('EXPORT_JOB_TTL', 86400))
+
+export_executor = ThreadPoolExecutor(max_workers=EXPORT_WORKERS, thread_name_prefix='export')
+
+# Rendered memorial PDFs, one file per service number and report date
+PDF_CACHE_DIR = os.getenv('PDF_CACHE_DIR', '/tmp/raf_bomber_command_pdf_cache')
+
+# Most cached PDFs kept on disk; the oldest are removed first
+PDF_CACHE_MAX_FILES = int(os.getenv('PDF_CACHE_MAX_FILES', 256))
+
+# Renders tried for one download when the file keeps being pruned first
+PDF_RENDER_ATTEMPTS = 3
+
+# Partial renders older than this (seconds) were left by a crashed render
+PDF_ORPHAN_MAX_AGE = 3600
+
+# Interactive PDF downloads render on their own pool so they never queue
+# behind background export jobs
+PDF_RENDER_WORKERS = int(os.getenv('PDF_RENDER_WORKERS', 2))
+
+pdf_executor = ThreadPoolExecutor(max_workers=PDF_RENDER_WORKERS, thread_name_prefix='pdf')
+
+# Bump when the memorial report layout changes so cached PDFs are re-rendered
+MEMORIAL_PDF_VERSION = 1
+
+# Longest browser cache lifetime for a downloaded memorial PDF (one day);
+# responses are capped further so a dated report expires at midnight
+PDF_CACHE_MAX_AGE = 86400
+
+# In-flight renders keyed by cache path so concurrent misses share one render
+pdf_renders = {}
+pdf_renders_lock = threading.Lock()
+
 # RAF Colors for professional styling
 RAF_BLUE = HexColor('#5D9CEC')
 RAF_GOLD = HexColor('#FFD700')
 RAF_DARK_BLUE = HexColor('#003366')
 MEMORIAL_GREY = HexColor('#666666')
 
+def open_db_connection():
+    """Open a database connection configured for the read-heavy API."""
+    conn = sqlite3.connect(DATABASE_PATH, cached_statements=SQL_STATEMENT_CACHE_SIZE,
+                           check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA cache_size = {SQL_PAGE_CACHE_SIZE}")
+    conn.execute(f"PRAGMA mmap_size = {SQL_MMAP_SIZE}")
+    return conn
+
+def release_db_connection(conn):
+    """Return a connection to the pool, discarding any uncommitted work."""
+    if conn.in_transaction:
+        conn.rollback()
+    try:
+        connection_pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
 @contextmanager
 def get_db_connection():
-    """Context manager for database connections with proper error handling."""
+    """Context manager for pooled database connections with proper error handling."""
     conn = None
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        conn.row_factory = sqlite3.Row
+        try:
+            conn = connection_pool.get_nowait()
+        except queue.Empty:
+            conn = open_db_connection()
         yield conn
     except sqlite3.Error as e:
         logger.error(f"Database error: {e}")
-        if conn:
-            conn.rollback()
         raise
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
+
+def fetch_dicts(cursor):
+    """Materialize an executed cursor as dicts in one pass over plain tuples.
+    
+    The column names are read once from cursor.description and shared by
+    every row, instead of building each dict from a sqlite3.Row.
+    """
+    columns = [description[0] for description in cursor.description]
+    cursor.row_factory = None
+    return [dict(zip(columns, row)) for row in cursor]
+
+def json_response(payload, status=200):
+    """JSON response encoded with orjson (C encoder) instead of stdlib json."""
+    return Response(orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS),
+                    status=status, mimetype='application/json')
+
+@lru_cache(maxsize=8)
+def gzip_payload(payload):
+    """Gzip a serialized payload; repeated payloads are compressed once."""
+    return gzip.compress(payload, compresslevel=9)
+
+def compressed_json_response(payload, etag=None):
+    """Pre-serialized JSON response, gzipped when the client accepts it.
+    
+    When an ETag is given, the gzip body gets its own suffixed strong ETag,
+    as in frontend_response(), since each encoding is a separate representation.
+    """
+    response = Response(mimetype='application/json')
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response.set_data(gzip_payload(payload))
+        response.headers['Content-Encoding'] = 'gzip'
+        if etag is not None:
+            etag += '-gz'
+    else:
+        response.set_data(payload)
+    response.vary.add('Accept-Encoding')
+    if etag is not None:
+        response.set_etag(etag)
+    return response
 
 def initialize_database():
     """Initialize the database with RAF Bomber Command memorial data."""
@@ -73,6 +257,9 @@ def initialize_database():
     with get_db_connection() as conn:
         cursor = conn.cursor()
         
+        # WAL lets API readers proceed while seeding or export jobs write
+        cursor.execute("PRAGMA journal_mode=WAL")
+        
         # Create enhanced tables with additional search fields
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS personnel (
@@ -101,6 +288,47 @@ def initialize_database():
             )
         ''')
         
+        # Full-text index over the searchable personnel columns, kept in
+        # sync by triggers. The content view renames rank, which FTS5 reserves.
+        cursor.execute('''
+            CREATE VIEW IF NOT EXISTS personnel_fts_content AS
+            SELECT id, name, service_number, squadron, role, rank AS service_rank, biography
+            FROM personnel
+        ''')
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS personnel_fts USING fts5(
+                name, service_number, squadron, role, service_rank, biography,
+                content='personnel_fts_content', content_rowid='id'
+            )
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS personnel_fts_insert AFTER INSERT ON personnel BEGIN
+                INSERT INTO personnel_fts(rowid, name, service_number, squadron, role, service_rank, biography)
+                VALUES (new.id, new.name, new.service_number, new.squadron, new.role, new.rank, new.biography);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS personnel_fts_delete AFTER DELETE ON personnel BEGIN
+                INSERT INTO personnel_fts(personnel_fts, rowid, name, service_number, squadron, role, service_rank, biography)
+                VALUES ('delete', old.id, old.name, old.service_number, old.squadron, old.role, old.rank, old.biography);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS personnel_fts_update AFTER UPDATE ON personnel BEGIN
+                INSERT INTO personnel_fts(personnel_fts, rowid, name, service_number, squadron, role, service_rank, biography)
+                VALUES ('delete', old.id, old.name, old.service_number, old.squadron, old.role, old.rank, old.biography);
+                INSERT INTO personnel_fts(rowid, name, service_number, squadron, role, service_rank, biography)
+                VALUES (new.id, new.name, new.service_number, new.squadron, new.role, new.rank, new.biography);
+            END
+        ''')
+        
+        # Julian-day copies of the filterable date columns (numeric, indexable)
+        cursor.execute("PRAGMA table_info(personnel)")
+        personnel_columns = {row['name'] for row in cursor.fetchall()}
+        for jd_column in PERSONNEL_JULIAN_DAY_COLUMNS:
+            if jd_column not in personnel_columns:
+                cursor.execute(f"ALTER TABLE personnel ADD COLUMN {jd_column} REAL")
+        
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS aircraft (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -121,6 +349,11 @@ def initialize_database():
             )
         ''')
         
+        # Squadron number parsed from the squadron name, joined to squadrons by equality
+        cursor.execute("PRAGMA table_info(aircraft)")
+        if 'squadron_number' not in {row['name'] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE aircraft ADD COLUMN squadron_number TEXT")
+        
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS squadrons (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -154,6 +387,29 @@ def initialize_database():
             )
         ''')
         
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS export_jobs (
+                id TEXT PRIMARY KEY,
+                job_type TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                filename TEXT,
+                mimetype TEXT,
+                result_path TEXT,
+                error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                completed_at TIMESTAMP
+            )
+        ''')
+        
+        # Precomputed /api/statistics payloads, refreshed whenever data is written
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stats_cache (
+                k TEXT PRIMARY KEY,
+                v_json BLOB NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
         # Insert enhanced memorial data including Patrick Cassidy
         personnel_data = [
             ('1802082', 'Sergeant', 'Patrick Cassidy', 'Flight Engineer', '97 Squadron RAF Pathfinders', 'Avro Lancaster', 
@@ -328,12 +584,46 @@ def initialize_database():
             except sqlite3.IntegrityError:
                 logger.info(f"Mission record already exists, skipping...")
         
+        # '97 Squadron RAF Pathfinders' -> '97'
+        cursor.execute('''
+            UPDATE aircraft SET squadron_number = CASE
+                WHEN instr(squadron, ' ') > 0 THEN substr(squadron, 1, instr(squadron, ' ') - 1)
+                ELSE squadron
+            END
+            WHERE squadron_number IS NULL
+        ''')
+        
+        for jd_column, date_column in PERSONNEL_JULIAN_DAY_COLUMNS.items():
+            cursor.execute(f'''
+                UPDATE personnel SET {jd_column} = julianday({date_column})
+                WHERE {jd_column} IS NULL AND {date_column} IS NOT NULL
+            ''')
+        
+        # Rebuild the full-text index from the content table
+        cursor.execute("INSERT INTO personnel_fts(personnel_fts) VALUES('rebuild')")
+        
+        refresh_statistics_cache(cursor)
+        
         conn.commit()
         
         # Create indexes for advanced search performance
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_personnel_dates ON personnel(date_of_birth, date_of_death)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_personnel_death_jd ON personnel(date_of_death_jd)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_personnel_service_start_jd ON personnel(service_start_jd)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_personnel_service_end_jd ON personnel(service_end_jd)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_personnel_location ON personnel(base_location, place_of_birth)")
+        # Facet columns: exact-match filters and DISTINCT lookups read these indexes only
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_personnel_role ON personnel(role)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_personnel_rank ON personnel(rank)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_personnel_squadron ON personnel(squadron)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_personnel_aircraft_type ON personnel(aircraft_type)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_personnel_memorial_location ON personnel(memorial_location)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_aircraft_type ON aircraft(aircraft_type, manufacturer)")
+        # LIKE is case-insensitive, so prefix searches need NOCASE indexes
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_aircraft_id_nocase ON aircraft(aircraft_id COLLATE NOCASE)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_aircraft_type_nocase ON aircraft(aircraft_type COLLATE NOCASE)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_aircraft_squadron_nocase ON aircraft(squadron COLLATE NOCASE)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_aircraft_squadron_number ON aircraft(squadron_number)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_missions_date ON missions(mission_date, target_country)")
         
         # Verify Patrick Cassidy memorial record
@@ -345,19 +635,20 @@ def initialize_database():
             logger.error("❌ Patrick Cassidy memorial record not found!")
         
         # Get database statistics
-        cursor.execute("SELECT COUNT(*) FROM personnel")
-        personnel_count = cursor.fetchone()[0]
-        cursor.execute("SELECT COUNT(*) FROM aircraft")
-        aircraft_count = cursor.fetchone()[0]
-        cursor.execute("SELECT COUNT(*) FROM squadrons")
-        squadron_count = cursor.fetchone()[0]
-        cursor.execute("SELECT COUNT(*) FROM missions")
-        mission_count = cursor.fetchone()[0]
+        cursor.execute(TABLE_COUNTS_SQL)
+        personnel_count, aircraft_count, squadron_count, mission_count = cursor.fetchone()
         
         logger.info(f"Advanced database initialized: {personnel_count} personnel, {aircraft_count} aircraft, {squadron_count} squadrons, {mission_count} missions")
 
-def create_pdf_memorial_report(person_data, output_buffer):
-    """Create a professional PDF memorial report for an individual."""
+def create_pdf_memorial_report(person_data, output_buffer, report_date=None):
+    """Create a professional PDF memorial report for an individual.
+    
+    The footer is stamped with report_date, today unless given.
+    """
+    report_date = report_date or date.today()
+    # Materialize sqlite3.Row once; dict lookups are hashed and support .get()
+    person_data = dict(person_data)
+    
     doc = SimpleDocTemplate(output_buffer, pagesize=A4, 
                           rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
     
@@ -400,9 +691,8 @@ def create_pdf_memorial_report(person_data, output_buffer):
     story.append(Paragraph("Preserving the Memory of Those Who Served", subtitle_style))
     story.append(Spacer(1, 20))
     
-    # Personal Information
-    story.append(Paragraph("PERSONAL DETAILS", styles['Heading2']))
-    
+    # Personal and memorial details share one table so ReportLab only
+    # wraps and splits a single flowable
     personal_data = [
         ['Name:', person_data['name']],
         ['Service Number:', person_data['service_number']],
@@ -418,22 +708,6 @@ def create_pdf_memorial_report(person_data, output_buffer):
         ['Mission Count:', f"{person_data.get('mission_count', 'Not recorded')} operations"]
     ]
     
-    personal_table = Table(personal_data, colWidths=[2*inch, 4*inch])
-    personal_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), RAF_BLUE),
-        ('TEXTCOLOR', (0, 0), (0, -1), HexColor('#FFFFFF')),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 1, HexColor('#CCCCCC'))
-    ]))
-    
-    story.append(personal_table)
-    story.append(Spacer(1, 20))
-    
-    # Memorial Information
-    story.append(Paragraph("MEMORIAL INFORMATION", styles['Heading2']))
-    
     memorial_data = [
         ['Memorial Location:', person_data['memorial_location'] or 'Not recorded'],
         ['Memorial Panel:', person_data['memorial_panel'] or 'Not recorded'],
@@ -442,17 +716,36 @@ def create_pdf_memorial_report(person_data, output_buffer):
         ['Final Mission:', person_data['final_mission'] or 'Not recorded']
     ]
     
-    memorial_table = Table(memorial_data, colWidths=[2*inch, 4*inch])
-    memorial_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), RAF_GOLD),
-        ('TEXTCOLOR', (0, 0), (0, -1), HexColor('#000000')),
+    memorial_header = len(personal_data) + 1
+    details_data = ([['PERSONAL DETAILS', '']] + personal_data
+                    + [['MEMORIAL INFORMATION', '']] + memorial_data)
+    
+    details_table = Table(details_data, colWidths=[2*inch, 4*inch])
+    details_table.setStyle(TableStyle([
         ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
         ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
         ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 1, HexColor('#CCCCCC'))
+        ('GRID', (0, 0), (-1, -1), 1, HexColor('#CCCCCC')),
+        # Personal details
+        ('BACKGROUND', (0, 1), (0, memorial_header - 1), RAF_BLUE),
+        ('TEXTCOLOR', (0, 1), (0, memorial_header - 1), HexColor('#FFFFFF')),
+        # Memorial information
+        ('BACKGROUND', (0, memorial_header + 1), (0, -1), RAF_GOLD),
+        ('TEXTCOLOR', (0, memorial_header + 1), (0, -1), HexColor('#000000')),
+        # Section header rows
+        ('SPAN', (0, 0), (-1, 0)),
+        ('SPAN', (0, memorial_header), (-1, memorial_header)),
+        ('BACKGROUND', (0, 0), (-1, 0), RAF_DARK_BLUE),
+        ('BACKGROUND', (0, memorial_header), (-1, memorial_header), RAF_DARK_BLUE),
+        ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#FFFFFF')),
+        ('TEXTCOLOR', (0, memorial_header), (-1, memorial_header), HexColor('#FFFFFF')),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, memorial_header), (-1, memorial_header), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('FONTSIZE', (0, memorial_header), (-1, memorial_header), 12)
     ]))
     
-    story.append(memorial_table)
+    story.append(details_table)
     story.append(Spacer(1, 20))
     
     # Biography
@@ -468,7 +761,7 @@ def create_pdf_memorial_report(person_data, output_buffer):
                                        textColor=MEMORIAL_GREY, alignment=TA_CENTER, fontName='Helvetica-Oblique')))
     
     story.append(Spacer(1, 20))
-    story.append(Paragraph(f"Report generated: {datetime.now().strftime('%B %d, %Y')}", 
+    story.append(Paragraph(f"Report generated: {report_date.strftime('%B %d, %Y')}", 
                           ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, 
                                        textColor=MEMORIAL_GREY, alignment=TA_CENTER)))
     
@@ -479,125 +772,496 @@ def create_pdf_memorial_report(person_data, output_buffer):
     # Build PDF
     doc.build(story)
 
-def build_advanced_search_query(filters):
-    """Build SQL query with advanced search filters."""
-    base_query = '''
-        SELECT p.*, s.base_location as squadron_base, s.group_number 
-        FROM personnel p 
-        LEFT JOIN squadrons s ON p.squadron LIKE '%' || s.squadron_number || '%'
-        WHERE 1=1
+def fetch_personnel_by_service_numbers(cursor, service_numbers, columns=PERSONNEL_EXPORT_COLUMNS):
+    """Yield personnel rows for many service numbers using batched IN lookups."""
+    service_numbers = list(dict.fromkeys(service_numbers))
+    columns = ', '.join(columns)
+    
+    for start in range(0, len(service_numbers), SERVICE_NUMBER_BATCH_SIZE):
+        batch = service_numbers[start:start + SERVICE_NUMBER_BATCH_SIZE]
+        placeholders = ','.join('?' * len(batch))
+        cursor.execute(
+            f"SELECT {columns} FROM personnel WHERE service_number IN ({placeholders}) ORDER BY name ASC",
+            batch
+        )
+        yield from cursor
+
+class FilterValidationError(ValueError):
+    """Raised when an advanced search filter value cannot be coerced."""
+
+def like_term(value):
+    """Wrap a filter value for substring LIKE matching."""
+    return f'%{value}%'
+
+def julian_day(value):
+    """Convert an ISO-8601 date to the number SQLite's julianday() returns."""
+    return date.fromisoformat(str(value)).toordinal() + JULIAN_DAY_OFFSET
+
+def exact_values(value):
+    """Coerce a single value or a multi-select list into a tuple for IN matching."""
+    values = value if isinstance(value, (list, tuple)) else [value]
+    return tuple(str(v) for v in values if v not in (None, '')) or None
+
+# Advanced search filters: (request key, SQL condition, coercion).
+# Every '?' in the condition is bound to the coerced value; '{}' is
+# expanded to one placeholder per value for tuple-valued (IN) filters.
+FILTER_SPEC = (
+    ('date_from', 'p.date_of_death_jd >= ?', julian_day),
+    ('date_to', 'p.date_of_death_jd <= ?', julian_day),
+    ('service_from', 'p.service_start_jd >= ?', julian_day),
+    ('service_to', 'p.service_end_jd <= ?', julian_day),
+    ('aircraft_type', 'p.aircraft_type IN ({})', exact_values),
+    ('squadron', 'p.squadron LIKE ?', like_term),
+    ('role', 'p.role IN ({})', exact_values),
+    ('rank', 'p.rank IN ({})', exact_values),
+    ('base_location', '(p.base_location LIKE ? OR s.base_location LIKE ?)', like_term),
+    ('age_from', 'p.age_at_death >= ?', int),
+    ('age_to', 'p.age_at_death <= ?', int),
+    ('min_missions', 'p.mission_count >= ?', int),
+    ('memorial_location', 'p.memorial_location LIKE ?', like_term),
+)
+
+AWARDS_CONDITIONS = {
+    True: 'p.awards IS NOT NULL AND p.awards != "None recorded"',
+    False: '(p.awards IS NULL OR p.awards = "None recorded")',
+}
+
+def coerce_filters(filters):
+    """Validate and coerce raw filter values in one pass; empty values become None."""
+    clean = {}
+    
+    for key, _, coerce in FILTER_SPEC:
+        value = filters.get(key)
+        if value in (None, '', []):
+            clean[key] = None
+            continue
+        try:
+            clean[key] = coerce(value)
+        except (TypeError, ValueError):
+            raise FilterValidationError(f"Invalid value for {key}: {value!r}")
+    
+    has_awards = str(filters.get('has_awards', '')).lower()
+    clean['has_awards'] = {'true': True, 'false': False}.get(has_awards)
+    
+    return clean
+
+SEARCH_CRITERIA_KEYS = ('query', 'has_awards') + tuple(key for key, _, _ in FILTER_SPEC)
+
+def has_search_criteria(filters):
+    """True when a search request sets a query or at least one filter."""
+    for key in SEARCH_CRITERIA_KEYS:
+        value = filters.get(key)
+        if isinstance(value, str):
+            value = value.strip()
+        if value not in (None, '', []):
+            return True
+    return False
+
+SEARCH_BASE_QUERY = '''
+        SELECT {columns}
+        FROM {source} {join}
+        WHERE {where}
     '''
+
+SQUADRON_JOIN = "LEFT JOIN squadrons s ON p.squadron LIKE '%' || s.squadron_number || '%'"
+
+FILTER_CONDITIONS = {key: condition for key, condition, _ in FILTER_SPEC}
+
+FTS_TOKEN_PATTERN = re.compile(r'\w+')
+
+def fts_match_query(query):
+    """Convert free text to an FTS5 MATCH expression; the last token is a prefix."""
+    tokens = [f'"{token}"' for token in FTS_TOKEN_PATTERN.findall(query)]
+    if not tokens:
+        return None
+    tokens[-1] += '*'
+    return ' '.join(tokens)
+
+@lru_cache(maxsize=256)
+def build_search_sql(filter_keys, has_awards, has_query, has_text_match, columns):
+    """Build (and memoize) the search SQL for one combination of active filters.
     
-    params = []
-    conditions = []
-    
-    # Text search
-    if filters.get('query'):
-        text_condition = '''
-            (p.name LIKE ? OR p.service_number LIKE ? OR p.squadron LIKE ? 
-             OR p.role LIKE ? OR p.rank LIKE ? OR p.biography LIKE ?)
-        '''
-        search_term = f'%{filters["query"]}%'
-        conditions.append(text_condition)
-        params.extend([search_term] * 6)
-    
-    # Date range filters
-    if filters.get('date_from'):
-        conditions.append('p.date_of_death >= ?')
-        params.append(filters['date_from'])
-    
-    if filters.get('date_to'):
-        conditions.append('p.date_of_death <= ?')
-        params.append(filters['date_to'])
-    
-    # Service period filters
-    if filters.get('service_from'):
-        conditions.append('p.service_start_date >= ?')
-        params.append(filters['service_from'])
-    
-    if filters.get('service_to'):
-        conditions.append('p.service_end_date <= ?')
-        params.append(filters['service_to'])
-    
-    # Aircraft type filter
-    if filters.get('aircraft_type'):
-        conditions.append('p.aircraft_type LIKE ?')
-        params.append(f'%{filters["aircraft_type"]}%')
-    
-    # Squadron filter
-    if filters.get('squadron'):
-        conditions.append('p.squadron LIKE ?')
-        params.append(f'%{filters["squadron"]}%')
-    
-    # Role filter
-    if filters.get('role'):
-        conditions.append('p.role LIKE ?')
-        params.append(f'%{filters["role"]}%')
-    
-    # Rank filter
-    if filters.get('rank'):
-        conditions.append('p.rank LIKE ?')
-        params.append(f'%{filters["rank"]}%')
-    
-    # Base location filter
-    if filters.get('base_location'):
-        conditions.append('(p.base_location LIKE ? OR s.base_location LIKE ?)')
-        base_term = f'%{filters["base_location"]}%'
-        params.extend([base_term, base_term])
-    
-    # Age range filters
-    if filters.get('age_from'):
-        conditions.append('p.age_at_death >= ?')
-        params.append(int(filters['age_from']))
-    
-    if filters.get('age_to'):
-        conditions.append('p.age_at_death <= ?')
-        params.append(int(filters['age_to']))
-    
-    # Mission count filter
-    if filters.get('min_missions'):
-        conditions.append('p.mission_count >= ?')
-        params.append(int(filters['min_missions']))
+    filter_keys holds (key, value count) pairs. Caching by filter set means
+    only a handful of distinct SQL strings reach sqlite3, so they stay
+    compiled in the connection statement cache.
+    """
+    conditions = [FILTER_CONDITIONS[key].format(','.join('?' * count))
+                  for key, count in filter_keys]
     
     # Awards filter
-    if filters.get('has_awards') == 'true':
-        conditions.append('p.awards IS NOT NULL AND p.awards != "None recorded"')
-    elif filters.get('has_awards') == 'false':
-        conditions.append('(p.awards IS NULL OR p.awards = "None recorded")')
-    
-    # Memorial location filter
-    if filters.get('memorial_location'):
-        conditions.append('p.memorial_location LIKE ?')
-        params.append(f'%{filters["memorial_location"]}%')
-    
-    # Build final query
-    if conditions:
-        query = base_query + ' AND ' + ' AND '.join(conditions)
-    else:
-        query = base_query
-    
-    # Add ordering
-    query += '''
-        ORDER BY 
-            CASE 
-                WHEN p.service_number = ? THEN 1
-                WHEN p.name LIKE ? THEN 2
-                WHEN p.squadron LIKE ? THEN 3
-                ELSE 4
-            END,
-            p.name ASC
-        LIMIT 100
-    '''
+    if has_awards is not None:
+        conditions.append(AWARDS_CONDITIONS[has_awards])
+    
+    filter_sql = ''.join(' AND ' + condition for condition in conditions)
+    
+    # Squadron table is only needed to match squadron base locations
+    join = SQUADRON_JOIN if any(key == 'base_location' for key, _ in filter_keys) else ''
+    selected = ', '.join(f'p.{column}' for column in columns)
+    
+    if not has_query:
+        query = SEARCH_BASE_QUERY.format(columns=selected, source='personnel p', join=join,
+                                         where='1=1' + filter_sql)
+        return query + ' ORDER BY p.name ASC LIMIT 100'
+    
+    # Exact service number hit: indexed equality lookup
+    query = SEARCH_BASE_QUERY.format(
+        columns=selected + ', 0 AS rk, 0 AS score', source='personnel p', join=join,
+        where='p.service_number = ?' + filter_sql
+    )
+    
+    # Full-text matches over the remaining records, best BM25 score first;
+    # finer ranking is done by rank_search_results() on the limited result set
+    if has_text_match:
+        query += ' UNION ALL ' + SEARCH_BASE_QUERY.format(
+            columns=selected + ', 1 AS rk, bm25(personnel_fts) AS score',
+            source='personnel_fts JOIN personnel p ON p.id = personnel_fts.rowid',
+            join=join,
+            where='personnel_fts MATCH ? AND p.service_number != ?' + filter_sql
+        )
+    
+    # The outer select keeps the rank columns out of the result rows
+    return (f"SELECT {', '.join(columns)} FROM ({query}) "
+            "ORDER BY rk, score LIMIT 100")
+
+def build_advanced_search_query(filters, columns=PERSONNEL_LIST_COLUMNS):
+    """Build SQL query with advanced search filters.
+    
+    Only the personnel columns in columns are selected; the list default
+    skips detail-only fields such as next of kin and final mission.
+    When a text query is present the result is a UNION ALL of an exact
+    service_number lookup (served by the UNIQUE index, no sort) and an
+    FTS5 match over personnel_fts, so free text never scans the table.
+    """
+    clean = coerce_filters(filters)
+    filter_keys = []
+    params = []
+    
+    for key, condition, _ in FILTER_SPEC:
+        value = clean[key]
+        if value is None:
+            continue
+        if isinstance(value, tuple):
+            filter_keys.append((key, len(value)))
+            params.extend(value)
+        else:
+            filter_keys.append((key, 1))
+            params.extend([value] * condition.count('?'))
+    
+    exact_term = filters.get('query')
+    match_query = fts_match_query(exact_term) if exact_term else None
+    query = build_search_sql(tuple(filter_keys), clean['has_awards'], bool(exact_term),
+                             match_query is not None, columns)
+    
+    if not exact_term:
+        return query, params
+    
+    text_params = [match_query, exact_term] + params if match_query else []
+    return query, [exact_term] + params + text_params
+
+def rank_search_results(rows, query):
+    """Order search rows: exact service number, name match, squadron match, then the rest.
+    
+    Ties are ordered by name. Ranking the (at most 100) fetched rows in
+    Python spares SQLite three LIKE comparisons per candidate row.
+    """
+    if not query:
+        return list(rows)
+    
+    term = query.lower()
+    
+    def rank(row):
+        if row['service_number'] == query:
+            tier = 0
+        elif term in row['name'].lower():
+            tier = 1
+        elif term in row['squadron'].lower():
+            tier = 2
+        else:
+            tier = 3
+        return tier, row['name']
+    
+    return sorted(rows, key=rank)
+
+def select_personnel_for_export(cursor, data):
+    """Select the personnel rows for a CSV export request; returns (rows, filename)."""
+    if data.get('service_numbers'):
+        # Export selected records in batched lookups
+        results = list(fetch_personnel_by_service_numbers(cursor, data['service_numbers']))
+        return results, "RAF_Personnel_Selected_Records.csv"
+    
+    if data.get('advanced_search'):
+        # Export advanced search results
+        search_query, params = build_advanced_search_query(data, PERSONNEL_EXPORT_COLUMNS)
+        cursor.execute(search_query, params)
+        return rank_search_results(cursor.fetchall(), data.get('query')), "RAF_Personnel_Advanced_Search.csv"
+    
+    if data.get('query'):
+        # Export basic search results
+        search_query, params = build_advanced_search_query({'query': data['query']}, PERSONNEL_EXPORT_COLUMNS)
+        cursor.execute(search_query, params)
+        filename = f"RAF_Personnel_Search_{data['query'].replace(' ', '_')}.csv"
+        return rank_search_results(cursor.fetchall(), data['query']), filename
+    
+    # Export all personnel (rows are read lazily from the cursor as tuples)
+    cursor.row_factory = None
+    cursor.execute(f"SELECT {', '.join(PERSONNEL_EXPORT_COLUMNS)} FROM personnel ORDER BY name ASC")
+    return cursor, "RAF_Personnel_Complete_Database.csv"
+
+def select_aircraft_for_export(cursor):
+    """Select every aircraft row for CSV export; returns (rows, filename)."""
+    cursor.row_factory = None
+    cursor.execute('''
+        SELECT aircraft_id, aircraft_type, squadron, squadron_code,
+               service_period_start, service_period_end, service_days,
+               fate, notable_crew, missions_flown, base_location,
+               manufacturer, first_flight_date
+        FROM aircraft ORDER BY aircraft_id ASC
+    ''')
+    return cursor, "RAF_Aircraft_Database_Advanced.csv"
+
+def csv_export_stream(select_rows, header):
+    """Generate a CSV export in batches on its own database connection.
+    
+    select_rows(cursor) returns (rows, filename). The first value yielded
+    is the filename, or None when there are no rows; CSV text chunks
+    follow, one per batch of CSV_EXPORT_BATCH_SIZE rows. The connection
+    stays open until the generator is exhausted or closed, so rows are
+    never all held in memory.
+    """
+    with get_db_connection() as conn:
+        rows, filename = select_rows(conn.cursor())
+        rows = iter(rows)
+        batch = list(islice(rows, CSV_EXPORT_BATCH_SIZE))
+        
+        if not batch:
+            yield None
+            return
+        
+        yield filename
+        
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+        
+        while batch:
+            writer.writerows(batch)
+            chunk = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            yield chunk
+            batch = list(islice(rows, CSV_EXPORT_BATCH_SIZE))
+
+def gzip_stream(chunks):
+    """Gzip a stream of text chunks incrementally, without buffering the whole body."""
+    compressor = zlib.compressobj(CSV_EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+def csv_export_response(stream, filename):
+    """Stream a primed csv_export_stream() as a CSV attachment, gzipped when accepted."""
+    headers = {'Content-Disposition': f'attachment; filename="{filename}"'}
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        stream = gzip_stream(stream)
+        headers['Content-Encoding'] = 'gzip'
+    
+    response = Response(stream_with_context(stream), mimetype='text/csv', headers=headers)
+    response.vary.add('Accept-Encoding')
+    return response
+
+def memorial_pdf_filename(person):
+    """Download filename for a memorial report."""
+    name_safe = person['name'].replace(' ', '_').replace(',', '')
+    return f"RAF_Memorial_Report_{name_safe}_{person['service_number']}.pdf"
+
+def render_memorial_pdf_job(result_path, service_number):
+    """Export job task: render a memorial PDF to disk."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM personnel WHERE service_number = ?", (service_number,))
+        person = cursor.fetchone()
+    
+    if not person:
+        raise LookupError(f"Personnel record {service_number} not found")
+    
+    create_pdf_memorial_report(person, result_path)
+    return memorial_pdf_filename(person), 'application/pdf'
+
+def memorial_pdf_cache_path(person, report_date):
+    """Location of the cached memorial PDF for a personnel record.
+    
+    The name carries a digest of the record, the report version and the
+    date stamped in the footer, so an edited record, a new layout or a new
+    day gets a new file (and a new ETag).
+    """
+    safe_number = re.sub(r'[^A-Za-z0-9_-]', '_', person['service_number'])
+    key = [MEMORIAL_PDF_VERSION, report_date.isoformat(), dict(person)]
+    digest = hashlib.md5(orjson.dumps(key)).hexdigest()[:16]
+    return os.path.join(PDF_CACHE_DIR, f"{safe_number}-{digest}.pdf")
+
+def prune_pdf_cache():
+    """Drop cached PDFs from earlier days, the oldest beyond PDF_CACHE_MAX_FILES,
+    and temporary files orphaned by renders that never finished."""
+    cutoff = datetime.combine(date.today(), time()).timestamp()
+    orphan_cutoff = datetime.now().timestamp() - PDF_ORPHAN_MAX_AGE
+    cached, expired = [], []
+    
+    with os.scandir(PDF_CACHE_DIR) as entries:
+        for entry in entries:
+            if entry.name.endswith('.pdf'):
+                cached.append((entry.stat().st_mtime, entry.path))
+            elif entry.name.endswith('.tmp') and entry.stat().st_mtime < orphan_cutoff:
+                expired.append(entry.path)
+    
+    cached.sort(reverse=True)
+    for index, (mtime, path) in enumerate(cached):
+        if index >= PDF_CACHE_MAX_FILES or mtime < cutoff:
+            expired.append(path)
+    
+    for path in expired:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+def render_memorial_pdf_to_cache(person, cache_path, report_date):
+    """Render a memorial PDF next to its cache path and move it into place."""
+    os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=PDF_CACHE_DIR, suffix='.tmp')
+    os.close(fd)
+    
+    try:
+        create_pdf_memorial_report(person, tmp_path, report_date)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    finally:
+        with pdf_renders_lock:
+            pdf_renders.pop(cache_path, None)
+    
+    prune_pdf_cache()
+
+def cached_memorial_pdf(person):
+    """Open the cached memorial PDF, rendering it on the PDF pool on a miss.
+    
+    Returns (open binary file, cache path). The file is opened as soon as it
+    exists, so a prune in another thread can unlink it without breaking the
+    download; a file pruned before it could be opened is rendered again.
+    """
+    report_date = date.today()
+    cache_path = memorial_pdf_cache_path(person, report_date)
     
-    # Add ordering parameters
-    exact_term = filters.get('query', '')
-    search_term = f'%{exact_term}%'
-    params.extend([exact_term, search_term, search_term])
+    for _ in range(PDF_RENDER_ATTEMPTS):
+        try:
+            return open(cache_path, 'rb'), cache_path
+        except FileNotFoundError:
+            pass
+        
+        with pdf_renders_lock:
+            future = pdf_renders.get(cache_path)
+            if future is None:
+                future = pdf_executor.submit(render_memorial_pdf_to_cache, dict(person), cache_path, report_date)
+                pdf_renders[cache_path] = future
+        
+        future.result()
     
-    return query, params
+    return open(cache_path, 'rb'), cache_path
+
+def seconds_until_midnight():
+    """Seconds left in the current day, when today's dated reports go stale."""
+    midnight = datetime.combine(date.today() + timedelta(days=1), time())
+    return max(int((midnight - datetime.now()).total_seconds()), 0)
+
+def render_personnel_csv_job(result_path, data):
+    """Export job task: write a personnel CSV export to disk."""
+    stream = csv_export_stream(lambda cursor: select_personnel_for_export(cursor, data),
+                               PERSONNEL_EXPORT_HEADER)
+    filename = next(stream)
+    
+    if filename is None:
+        raise LookupError('No records found for export')
+    
+    with open(result_path, 'w', newline='', encoding='utf-8') as output:
+        output.writelines(stream)
+    return filename, 'text/csv'
+
+def sqlite_timestamp():
+    """Current UTC time in the format of SQLite's CURRENT_TIMESTAMP."""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+def update_export_job(job_id, **fields):
+    """Persist status changes for an export job."""
+    assignments = ', '.join(f'{column} = ?' for column in fields)
+    with get_db_connection() as conn:
+        conn.execute(f"UPDATE export_jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+        conn.commit()
+
+def run_export_job(job_id, task, *args):
+    """Worker entry point: run an export task and record its outcome."""
+    update_export_job(job_id, status='running')
+    result_path = os.path.join(EXPORT_JOBS_DIR, job_id)
+    
+    try:
+        filename, mimetype = task(result_path, *args)
+    except Exception as e:
+        logger.error(f"Export job {job_id} failed: {e}")
+        update_export_job(job_id, status='failed', error=str(e),
+                          completed_at=sqlite_timestamp())
+        return
+    
+    update_export_job(job_id, status='completed', filename=filename, mimetype=mimetype,
+                      result_path=result_path, completed_at=sqlite_timestamp())
+
+def sweep_export_jobs(conn):
+    """Delete finished export jobs older than EXPORT_JOB_TTL, with their files."""
+    cursor = conn.execute(
+        "SELECT id FROM export_jobs WHERE status IN ('completed', 'failed') AND created_at < datetime('now', ?)",
+        (f'-{EXPORT_JOB_TTL} seconds',)
+    )
+    expired = [row[0] for row in cursor]
+    
+    for job_id in expired:
+        try:
+            os.unlink(os.path.join(EXPORT_JOBS_DIR, job_id))
+        except FileNotFoundError:
+            pass
+    
+    conn.executemany("DELETE FROM export_jobs WHERE id = ?", [(job_id,) for job_id in expired])
+
+def submit_export_job(job_type, task, *args):
+    """Queue an export task on the background worker pool and return its job id."""
+    job_id = uuid.uuid4().hex
+    os.makedirs(EXPORT_JOBS_DIR, exist_ok=True)
+    
+    with get_db_connection() as conn:
+        sweep_export_jobs(conn)
+        conn.execute("INSERT INTO export_jobs (id, job_type) VALUES (?, ?)", (job_id, job_type))
+        conn.commit()
+    
+    export_executor.submit(run_export_job, job_id, task, *args)
+    return job_id
+
+def export_job_accepted(job_id):
+    """202 response pointing the client at the job status endpoint."""
+    return jsonify({
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': f'/api/jobs/{job_id}'
+    }), 202
 
 # API Routes
 
+# Constant opening of every healthy /api/health body, encoded once
+HEALTH_RESPONSE_PREFIX = orjson.dumps({
+    'status': 'healthy',
+    'database': 'connected',
+    'advanced_search': 'enabled',
+    'export_features': 'enabled'
+})[:-1] + b','
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint with database verification."""
@@ -606,34 +1270,23 @@ def health_check():
             cursor = conn.cursor()
             
             # Verify database tables and Patrick Cassidy record
-            cursor.execute("SELECT COUNT(*) FROM personnel")
-            personnel_count = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM aircraft")
-            aircraft_count = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM squadrons")
-            squadron_count = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM missions")
-            mission_count = cursor.fetchone()[0]
+            cursor.execute(TABLE_COUNTS_SQL)
+            personnel_count, aircraft_count, squadron_count, mission_count = cursor.fetchone()
             
             # Verify Patrick Cassidy memorial record
             cursor.execute("SELECT name FROM personnel WHERE service_number = '1802082'")
             patrick_record = cursor.fetchone()
             
-            return jsonify({
-                'status': 'healthy',
-                'database': 'connected',
+            # Only the counts and timestamp vary; orjson formats the datetime itself
+            body = HEALTH_RESPONSE_PREFIX + orjson.dumps({
                 'personnel_records': personnel_count,
                 'aircraft_records': aircraft_count,
                 'squadron_records': squadron_count,
                 'mission_records': mission_count,
                 'patrick_cassidy_memorial': 'verified' if patrick_record else 'missing',
-                'advanced_search': 'enabled',
-                'export_features': 'enabled',
-                'timestamp': datetime.now().isoformat()
-            })
+                'timestamp': datetime.now()
+            })[1:]
+            return Response(body, mimetype='application/json')
     except Exception as e:
         logger.error(f"Health check failed: {e}")
         return jsonify({'status': 'unhealthy', 'error': str(e)}), 500
@@ -642,7 +1295,12 @@ def health_check():
 def advanced_personnel_search():
     """Advanced personnel search with multiple filters."""
     try:
+        if not request.is_json:
+            return json_response({'error': 'Request body must be JSON'}, 415)
+        
         data = request.get_json() or {}
+        if not has_search_criteria(data):
+            return json_response({'error': 'At least one search filter is required'}, 400)
         
         # Build advanced search query
         query, params = build_advanced_search_query(data)
@@ -650,29 +1308,80 @@ def advanced_personnel_search():
         with get_db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
-            results = [dict(row) for row in cursor.fetchall()]
+            results = rank_search_results(fetch_dicts(cursor), data.get('query'))
             
-            return jsonify({
+            return json_response({
                 'results': results,
+                'results_html': render_template('personnel_results.html', results=results),
                 'count': len(results),
                 'filters_applied': data,
                 'export_available': True,
                 'search_type': 'advanced'
             })
             
+    except FilterValidationError as e:
+        return json_response({'error': 'Invalid search filters', 'details': str(e)}, 400)
     except Exception as e:
         logger.error(f"Advanced personnel search error: {e}")
-        return jsonify({'error': 'Advanced search failed', 'details': str(e)}), 500
+        return json_response({'error': 'Advanced search failed', 'details': str(e)}, 500)
+
+def ndjson_search_stream(search_sql, params, text_query):
+    """Generate advanced search results as newline-delimited JSON objects.
+    
+    Unranked results are encoded straight off the cursor as SQLite
+    produces them; a text query first needs its (at most 100) rows ranked.
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(search_sql, params)
+        
+        if text_query:
+            rows = rank_search_results(fetch_dicts(cursor), text_query)
+        else:
+            columns = [column[0] for column in cursor.description]
+            cursor.row_factory = None
+            rows = (dict(zip(columns, row)) for row in cursor)
+        
+        for row in rows:
+            yield orjson.dumps(row) + b'\n'
+
+@app.route('/api/personnel/search/advanced.ndjson', methods=['POST'])
+def advanced_personnel_search_ndjson():
+    """Advanced personnel search streamed as NDJSON, one record per line."""
+    try:
+        if not request.is_json:
+            return json_response({'error': 'Request body must be JSON'}, 415)
+        
+        data = request.get_json() or {}
+        if not has_search_criteria(data):
+            return json_response({'error': 'At least one search filter is required'}, 400)
+        
+        # Build (and validate) the query before the response starts
+        query, params = build_advanced_search_query(data)
+        
+        return Response(
+            stream_with_context(ndjson_search_stream(query, params, data.get('query'))),
+            mimetype='application/x-ndjson'
+        )
+        
+    except FilterValidationError as e:
+        return json_response({'error': 'Invalid search filters', 'details': str(e)}, 400)
+    except Exception as e:
+        logger.error(f"Advanced personnel NDJSON search error: {e}")
+        return json_response({'error': 'Advanced search failed', 'details': str(e)}, 500)
 
 @app.route('/api/personnel/search', methods=['POST'])
 def search_personnel():
     """Basic personnel search with enhanced filtering."""
     try:
+        if not request.is_json:
+            return json_response({'error': 'Request body must be JSON'}, 415)
+        
         data = request.get_json() or {}
         query = data.get('query', '').strip()
         
         if not query:
-            return jsonify({'error': 'Search query is required'}), 400
+            return json_response({'error': 'Search query is required'}, 400)
         
         # Use advanced search with just the query parameter
         search_query, params = build_advanced_search_query({'query': query})
@@ -680,10 +1389,11 @@ def search_personnel():
         with get_db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(search_query, params)
-            results = [dict(row) for row in cursor.fetchall()]
+            results = rank_search_results(fetch_dicts(cursor), query)
             
-            return jsonify({
+            return json_response({
                 'results': results,
+                'results_html': render_template('personnel_results.html', results=results),
                 'count': len(results),
                 'query': query,
                 'export_available': True,
@@ -692,49 +1402,77 @@ def search_personnel():
             
     except Exception as e:
         logger.error(f"Personnel search error: {e}")
-        return jsonify({'error': 'Search failed', 'details': str(e)}), 500
+        return json_response({'error': 'Search failed', 'details': str(e)}, 500)
+
+# Built once at import so the sqlite3 statement cache keys on identical text.
+# Each ranked arm excludes the rows of the arms above it, so the exact serial
+# is a single index lookup and no per-row CASE re-runs the LIKE patterns.
+AIRCRAFT_SEARCH_QUERY = '''
+    SELECT a.*, s.base_location as squadron_base, s.group_number 
+    FROM (
+        SELECT id, 1 AS rk FROM aircraft WHERE aircraft_id = ?
+        UNION ALL
+        SELECT id, 2 FROM aircraft WHERE aircraft_id LIKE ? AND aircraft_id != ?
+        UNION ALL
+        SELECT id, 3 FROM aircraft WHERE squadron LIKE ? AND NOT aircraft_id LIKE ?
+        UNION ALL
+        SELECT id, 4 FROM aircraft
+        WHERE ({fields}) AND NOT aircraft_id LIKE ? AND NOT squadron LIKE ?
+    ) ranked
+    JOIN aircraft a ON a.id = ranked.id
+    LEFT JOIN squadrons s ON s.squadron_number = a.squadron_number
+    ORDER BY ranked.rk, a.aircraft_id ASC
+    LIMIT 50
+'''
+# Columns searched beyond aircraft_id and squadron
+AIRCRAFT_PREFIX_FIELDS = ('aircraft_type',)
+AIRCRAFT_SUBSTRING_FIELDS = ('aircraft_type', 'notable_crew', 'manufacturer', 'base_location')
+# Single-token identifiers containing a digit (JB174, 617); plain words such
+# as "Lancaster" still need the substring form to match "Avro Lancaster"
+AIRCRAFT_PREFIX_PATTERN = re.compile(r'^(?=.*\d)[A-Za-z0-9-]+$')
+
+def aircraft_search_sql(fields):
+    """Ranked aircraft search SQL matching aircraft_id, squadron and the given fields."""
+    return AIRCRAFT_SEARCH_QUERY.format(fields=' OR '.join(f'{field} LIKE ?' for field in fields))
+
+AIRCRAFT_SEARCH_SQL = aircraft_search_sql(AIRCRAFT_SUBSTRING_FIELDS)
+AIRCRAFT_PREFIX_SEARCH_SQL = aircraft_search_sql(AIRCRAFT_PREFIX_FIELDS)
+
+def run_aircraft_search(cursor, search_sql, fields, query, search_term):
+    """Execute one form of the ranked aircraft search and return its rows as dicts."""
+    cursor.execute(search_sql, (query, search_term, query, search_term, search_term)
+                   + (search_term,) * len(fields) + (search_term, search_term))
+    return fetch_dicts(cursor)
 
 @app.route('/api/aircraft/search', methods=['POST'])
 def search_aircraft():
     """Enhanced aircraft search with filters."""
     try:
+        if not request.is_json:
+            return json_response({'error': 'Request body must be JSON'}, 415)
+        
         data = request.get_json() or {}
         query = data.get('query', '').strip()
         
         if not query:
-            return jsonify({'error': 'Search query is required'}), 400
+            return json_response({'error': 'Search query is required'}, 400)
         
         with get_db_connection() as conn:
             cursor = conn.cursor()
             
-            # Enhanced aircraft search
-            search_sql = '''
-                SELECT a.*, s.base_location as squadron_base, s.group_number 
-                FROM aircraft a
-                LEFT JOIN squadrons s ON a.squadron LIKE '%' || s.squadron_number || '%'
-                WHERE a.aircraft_id LIKE ? OR a.aircraft_type LIKE ? OR a.squadron LIKE ? 
-                   OR a.notable_crew LIKE ? OR a.manufacturer LIKE ? OR a.base_location LIKE ?
-                ORDER BY 
-                    CASE 
-                        WHEN a.aircraft_id = ? THEN 1
-                        WHEN a.aircraft_id LIKE ? THEN 2
-                        WHEN a.squadron LIKE ? THEN 3
-                        ELSE 4
-                    END,
-                    a.aircraft_id ASC
-                LIMIT 50
-            '''
-            
-            search_term = f'%{query}%'
-            exact_term = query
-            
-            cursor.execute(search_sql, (search_term, search_term, search_term, 
-                                      search_term, search_term, search_term,
-                                      exact_term, search_term, search_term))
-            
-            results = [dict(row) for row in cursor.fetchall()]
+            # Identifiers such as serials and squadron numbers are usually typed
+            # as prefixes, which lets the NOCASE indexes serve the lookup; a
+            # fragment like "174" finds nothing that way and falls through to
+            # the full substring search
+            results = []
+            if AIRCRAFT_PREFIX_PATTERN.match(query):
+                results = run_aircraft_search(cursor, AIRCRAFT_PREFIX_SEARCH_SQL,
+                                              AIRCRAFT_PREFIX_FIELDS, query, f'{query}%')
+            if not results:
+                results = run_aircraft_search(cursor, AIRCRAFT_SEARCH_SQL,
+                                              AIRCRAFT_SUBSTRING_FIELDS, query, f'%{query}%')
             
-            return jsonify({
+            return json_response({
                 'results': results,
                 'count': len(results),
                 'query': query,
@@ -743,60 +1481,79 @@ def search_aircraft():
             
     except Exception as e:
         logger.error(f"Aircraft search error: {e}")
-        return jsonify({'error': 'Aircraft search failed', 'details': str(e)}), 500
+        return json_response({'error': 'Aircraft search failed', 'details': str(e)}, 500)
+
+def personnel_fingerprint(cursor):
+    """Cheap change marker for the personnel table."""
+    cursor.execute("SELECT COUNT(*), MAX(rowid) FROM personnel")
+    return tuple(cursor.fetchone())
+
+@lru_cache(maxsize=4)
+def filter_options_payload(fingerprint):
+    """Build the serialized filter options for one personnel snapshot.
+    
+    All facets come from a single scan; the JSON is cached per fingerprint
+    so unchanged memorial data is never re-read or re-encoded.
+    """
+    aircraft_types, roles, ranks = set(), set(), set()
+    squadrons, base_locations, memorial_locations = set(), set(), set()
+    death_dates, ages = [], []
+    
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT aircraft_type, role, rank, squadron, base_location,
+                   memorial_location, date_of_death, age_at_death
+            FROM personnel
+        ''')
+        for (aircraft_type, role, rank, squadron, base_location,
+             memorial_location, date_of_death, age_at_death) in cursor:
+            if aircraft_type is not None:
+                aircraft_types.add(aircraft_type)
+            roles.add(role)
+            ranks.add(rank)
+            squadrons.add(squadron)
+            if base_location is not None:
+                base_locations.add(base_location)
+            if memorial_location is not None:
+                memorial_locations.add(memorial_location)
+            if date_of_death is not None:
+                death_dates.append(date_of_death)
+            if age_at_death is not None:
+                ages.append(age_at_death)
+    
+    return orjson.dumps({
+        'aircraft_types': sorted(aircraft_types),
+        'roles': sorted(roles),
+        'ranks': sorted(ranks),
+        'squadrons': sorted(squadrons),
+        'base_locations': sorted(base_locations),
+        'memorial_locations': sorted(memorial_locations),
+        'date_range': {
+            'min': min(death_dates, default=None) or '1940-01-01',
+            'max': max(death_dates, default=None) or '1945-12-31'
+        },
+        'age_range': {
+            'min': min(ages, default=None) or 18,
+            'max': max(ages, default=None) or 35
+        }
+    })
 
 @app.route('/api/filters/options', methods=['GET'])
 def get_filter_options():
     """Get available filter options for advanced search."""
     try:
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Get unique values for filter dropdowns
-            cursor.execute("SELECT DISTINCT aircraft_type FROM personnel WHERE aircraft_type IS NOT NULL ORDER BY aircraft_type")
-            aircraft_types = [row[0] for row in cursor.fetchall()]
-            
-            cursor.execute("SELECT DISTINCT role FROM personnel ORDER BY role")
-            roles = [row[0] for row in cursor.fetchall()]
-            
-            cursor.execute("SELECT DISTINCT rank FROM personnel ORDER BY rank")
-            ranks = [row[0] for row in cursor.fetchall()]
-            
-            cursor.execute("SELECT DISTINCT squadron FROM personnel ORDER BY squadron")
-            squadrons = [row[0] for row in cursor.fetchall()]
-            
-            cursor.execute("SELECT DISTINCT base_location FROM personnel WHERE base_location IS NOT NULL ORDER BY base_location")
-            base_locations = [row[0] for row in cursor.fetchall()]
-            
-            cursor.execute("SELECT DISTINCT memorial_location FROM personnel WHERE memorial_location IS NOT NULL ORDER BY memorial_location")
-            memorial_locations = [row[0] for row in cursor.fetchall()]
-            
-            cursor.execute("SELECT MIN(date_of_death), MAX(date_of_death) FROM personnel WHERE date_of_death IS NOT NULL")
-            date_range = cursor.fetchone()
-            
-            cursor.execute("SELECT MIN(age_at_death), MAX(age_at_death) FROM personnel WHERE age_at_death IS NOT NULL")
-            age_range = cursor.fetchone()
-            
-            return jsonify({
-                'aircraft_types': aircraft_types,
-                'roles': roles,
-                'ranks': ranks,
-                'squadrons': squadrons,
-                'base_locations': base_locations,
-                'memorial_locations': memorial_locations,
-                'date_range': {
-                    'min': date_range[0] if date_range[0] else '1940-01-01',
-                    'max': date_range[1] if date_range[1] else '1945-12-31'
-                },
-                'age_range': {
-                    'min': age_range[0] if age_range[0] else 18,
-                    'max': age_range[1] if age_range[1] else 35
-                }
-            })
+            fingerprint = personnel_fingerprint(conn.cursor())
+        
+        # Clients revalidate with If-None-Match and get a bodiless 304 while unchanged
+        response = compressed_json_response(filter_options_payload(fingerprint),
+                                            '-'.join(str(part) for part in fingerprint))
+        return response.make_conditional(request)
             
     except Exception as e:
         logger.error(f"Filter options error: {e}")
-        return jsonify({'error': 'Failed to get filter options', 'details': str(e)}), 500
+        return json_response({'error': 'Failed to get filter options', 'details': str(e)}, 500)
 
 @app.route('/api/export/pdf/memorial/<service_number>', methods=['GET'])
 def export_memorial_pdf(service_number):
@@ -810,85 +1567,65 @@ def export_memorial_pdf(service_number):
             if not person:
                 return jsonify({'error': 'Personnel record not found'}), 404
             
-            # Create PDF in memory
-            buffer = io.BytesIO()
-            create_pdf_memorial_report(dict(person), buffer)
-            buffer.seek(0)
-            
-            # Generate filename
-            name_safe = person['name'].replace(' ', '_').replace(',', '')
-            filename = f"RAF_Memorial_Report_{name_safe}_{service_number}.pdf"
+            # Served straight from the on-disk cache after the first render
+            pdf_file, cache_path = cached_memorial_pdf(person)
             
-            return send_file(
-                buffer,
+            # The open file (not a buffer) goes straight to the server's file
+            # wrapper, so a prune unlinking it mid-request cannot break the
+            # download; the cache name is keyed on the content, so it doubles
+            # as the ETag for answering conditional requests with 304
+            pdf_stat = os.fstat(pdf_file.fileno())
+            response = send_file(
+                pdf_file,
                 as_attachment=True,
-                download_name=filename,
-                mimetype='application/pdf'
+                download_name=memorial_pdf_filename(person),
+                mimetype='application/pdf',
+                conditional=True,
+                etag=os.path.splitext(os.path.basename(cache_path))[0],
+                last_modified=pdf_stat.st_mtime,
+                max_age=min(PDF_CACHE_MAX_AGE, seconds_until_midnight())
             )
+            if response.status_code == 200:
+                response.content_length = pdf_stat.st_size
+            return response
             
     except Exception as e:
         logger.error(f"PDF export error: {e}")
         return jsonify({'error': 'PDF generation failed', 'details': str(e)}), 500
 
-@app.route('/api/export/csv/personnel', methods=['POST'])
+def export_request_filters():
+    """Export filters from a JSON body, a URL-encoded form body, or a GET/HEAD query string."""
+    if request.is_json:
+        data = request.get_json() or {}
+    else:
+        fields = request.form if request.method == 'POST' else request.args
+        data = fields.to_dict()
+        if 'service_numbers' in fields:
+            data['service_numbers'] = fields.getlist('service_numbers')
+    
+    # Query strings and forms only carry text, where "false" would be truthy
+    if isinstance(data.get('advanced_search'), str):
+        data['advanced_search'] = data['advanced_search'].strip().lower() in ('true', '1', 'on', 'yes')
+    return data
+
+@app.route('/api/export/csv/personnel', methods=['GET', 'POST'])
 def export_personnel_csv():
     """Export personnel search results as CSV."""
     try:
-        data = request.get_json() or {}
+        data = export_request_filters()
         
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            
-            if data.get('advanced_search'):
-                # Export advanced search results
-                search_query, params = build_advanced_search_query(data)
-                cursor.execute(search_query, params)
-                filename = "RAF_Personnel_Advanced_Search.csv"
-            elif data.get('query'):
-                # Export basic search results
-                search_query, params = build_advanced_search_query({'query': data['query']})
-                cursor.execute(search_query, params)
-                filename = f"RAF_Personnel_Search_{data['query'].replace(' ', '_')}.csv"
-            else:
-                # Export all personnel
-                cursor.execute('''
-                    SELECT service_number, rank, name, role, squadron, aircraft_type,
-                           date_of_birth, date_of_death, age_at_death, place_of_birth,
-                           memorial_location, memorial_panel, awards, final_mission,
-                           base_location, mission_count, service_start_date, service_end_date
-                    FROM personnel ORDER BY name ASC
-                ''')
-                filename = "RAF_Personnel_Complete_Database.csv"
-            
-            results = cursor.fetchall()
-            
-            if not results:
-                return jsonify({'error': 'No records found for export'}), 404
-            
-            # Create CSV in memory
-            output = io.StringIO()
-            writer = csv.writer(output)
-            
-            # Write header
-            writer.writerow([
-                'Service Number', 'Rank', 'Name', 'Role', 'Squadron', 'Aircraft Type',
-                'Date of Birth', 'Date of Death', 'Age at Death', 'Place of Birth',
-                'Memorial Location', 'Memorial Panel', 'Awards', 'Final Mission',
-                'Base Location', 'Mission Count', 'Service Start', 'Service End'
-            ])
-            
-            # Write data
-            for row in results:
-                writer.writerow(row)
-            
-            # Create response
-            output.seek(0)
-            response = make_response(output.getvalue())
-            response.headers['Content-Type'] = 'text/csv'
-            response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
-            
-            return response
+        stream = csv_export_stream(lambda cursor: select_personnel_for_export(cursor, data),
+                                   PERSONNEL_EXPORT_HEADER)
+        filename = next(stream)
+        
+        if filename is None:
+            stream.close()
+            return jsonify({'error': 'No records found for export'}), 404
+        
+        return csv_export_response(stream, filename)
             
+    except FilterValidationError as e:
+        return jsonify({'error': 'Invalid search filters', 'details': str(e)}), 400
     except Exception as e:
         logger.error(f"CSV export error: {e}")
         return jsonify({'error': 'CSV export failed', 'details': str(e)}), 500
@@ -897,1380 +1634,252 @@ def export_personnel_csv():
 def export_aircraft_csv():
     """Export aircraft database as CSV."""
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT aircraft_id, aircraft_type, squadron, squadron_code,
-                       service_period_start, service_period_end, service_days,
-                       fate, notable_crew, missions_flown, base_location,
-                       manufacturer, first_flight_date
-                FROM aircraft ORDER BY aircraft_id ASC
-            ''')
-            
-            results = cursor.fetchall()
-            
-            if not results:
-                return jsonify({'error': 'No aircraft records found'}), 404
-            
-            # Create CSV in memory
-            output = io.StringIO()
-            writer = csv.writer(output)
-            
-            # Write header
-            writer.writerow([
-                'Aircraft ID', 'Aircraft Type', 'Squadron', 'Squadron Code',
-                'Service Start', 'Service End', 'Service Days',
-                'Fate', 'Notable Crew', 'Missions Flown', 'Base Location',
-                'Manufacturer', 'First Flight Date'
-            ])
-            
-            # Write data
-            for row in results:
-                writer.writerow(row)
-            
-            # Create response
-            output.seek(0)
-            response = make_response(output.getvalue())
-            response.headers['Content-Type'] = 'text/csv'
-            response.headers['Content-Disposition'] = 'attachment; filename="RAF_Aircraft_Database_Advanced.csv"'
-            
-            return response
+        stream = csv_export_stream(select_aircraft_for_export, AIRCRAFT_EXPORT_HEADER)
+        filename = next(stream)
+        
+        if filename is None:
+            stream.close()
+            return jsonify({'error': 'No aircraft records found'}), 404
+        
+        return csv_export_response(stream, filename)
             
     except Exception as e:
         logger.error(f"Aircraft CSV export error: {e}")
         return jsonify({'error': 'Aircraft CSV export failed', 'details': str(e)}), 500
 
-@app.route('/api/statistics', methods=['GET'])
-def get_statistics():
-    """Get enhanced database statistics."""
+@app.route('/api/export/pdf/memorial/<service_number>/job', methods=['POST'])
+def queue_memorial_pdf(service_number):
+    """Queue a memorial PDF report for background generation."""
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Get counts
-            cursor.execute("SELECT COUNT(*) FROM personnel")
-            personnel_count = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM aircraft")
-            aircraft_count = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM squadrons")
-            squadron_count = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM missions")
-            mission_count = cursor.fetchone()[0]
-            
-            # Get enhanced statistics
-            cursor.execute("SELECT AVG(age_at_death) FROM personnel WHERE age_at_death IS NOT NULL")
-            avg_age = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT AVG(mission_count) FROM personnel WHERE mission_count > 0")
-            avg_missions = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM personnel WHERE awards IS NOT NULL AND awards != 'None recorded'")
-            decorated_personnel = cursor.fetchone()[0]
-            
-            # Get featured personnel (including Patrick Cassidy)
-            cursor.execute('''
-                SELECT name, rank, squadron, service_number, mission_count, base_location
-                FROM personnel 
-                WHERE service_number IN ('1802082', 'R156789') 
-                ORDER BY service_number
-            ''')
-            featured_personnel = [dict(row) for row in cursor.fetchall()]
-            
-            # Get squadron distribution
-            cursor.execute('''
-                SELECT squadron, COUNT(*) as count 
-                FROM personnel 
-                GROUP BY squadron 
-                ORDER BY count DESC 
-                LIMIT 5
-            ''')
-            squadron_distribution = [dict(row) for row in cursor.fetchall()]
-            
-            return jsonify({
-                'personnel_records': personnel_count,
-                'aircraft_records': aircraft_count,
-                'squadron_records': squadron_count,
-                'mission_records': mission_count,
-                'average_age_at_death': round(avg_age, 1) if avg_age else None,
-                'average_missions_per_person': round(avg_missions, 1) if avg_missions else None,
-                'decorated_personnel': decorated_personnel,
-                'featured_personnel': featured_personnel,
-                'squadron_distribution': squadron_distribution,
-                'advanced_search_features': {
-                    'date_range_filtering': True,
-                    'aircraft_type_filtering': True,
-                    'geographic_filtering': True,
-                    'mission_count_filtering': True,
-                    'awards_filtering': True,
-                    'multi_criteria_search': True
-                },
-                'export_features': {
-                    'pdf_memorial_reports': True,
-                    'csv_personnel_export': True,
-                    'csv_aircraft_export': True,
-                    'advanced_search_export': True
-                }
-            })
-            
+        job_id = submit_export_job('pdf_memorial', render_memorial_pdf_job, service_number)
+        return export_job_accepted(job_id)
     except Exception as e:
-        logger.error(f"Statistics error: {e}")
-        return jsonify({'error': 'Failed to get statistics', 'details': str(e)}), 500
+        logger.error(f"PDF job submission error: {e}")
+        return jsonify({'error': 'Failed to queue PDF export', 'details': str(e)}), 500
 
-# Serve the enhanced frontend with advanced search
-@app.route('/')
-def serve_frontend():
-    """Serve the enhanced frontend with advanced search filters."""
-    return '''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>RAF Bomber Command Research Database - Advanced Search & Export</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #2c1810 0%, #1a0f08 50%, #0d0704 100%);
-            color: #d4af37;
-            min-height: 100vh;
-            line-height: 1.6;
-        }
-        
-        .header {
-            text-align: center;
-            padding: 2rem 1rem;
-            background: rgba(0, 0, 0, 0.3);
-            border-bottom: 2px solid #d4af37;
-        }
-        
-        .raf-badge {
-            width: 80px;
-            height: 80px;
-            background: linear-gradient(45deg, #d4af37, #f4e976);
-            border-radius: 50%;
-            margin: 0 auto 1rem;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            box-shadow: 0 0 20px rgba(212, 175, 55, 0.5);
-        }
-        
-        .raf-star {
-            font-size: 2rem;
-            color: #2c1810;
-            font-weight: bold;
-        }
-        
-        h1 {
-            font-size: 2.5rem;
-            margin-bottom: 0.5rem;
-            text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.5);
-        }
-        
-        .subtitle {
-            font-size: 1.1rem;
-            color: #b8860b;
-            font-style: italic;
-            margin-bottom: 1rem;
-        }
-        
-        .enhanced-banner {
-            background: linear-gradient(45deg, #d4af37, #f4e976);
-            color: #2c1810;
-            padding: 0.5rem 1rem;
-            border-radius: 20px;
-            font-weight: bold;
-            display: inline-block;
-            margin-top: 1rem;
-        }
-        
-        .container {
-            max-width: 1400px;
-            margin: 0 auto;
-            padding: 2rem 1rem;
-        }
-        
-        .tabs {
-            display: flex;
-            justify-content: center;
-            margin-bottom: 2rem;
-            flex-wrap: wrap;
-            gap: 0.5rem;
-        }
-        
-        .tab {
-            background: rgba(212, 175, 55, 0.1);
-            border: 2px solid #d4af37;
-            color: #d4af37;
-            padding: 0.75rem 1.5rem;
-            border-radius: 25px;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            font-weight: 500;
-        }
-        
-        .tab:hover, .tab.active {
-            background: #d4af37;
-            color: #2c1810;
-            transform: translateY(-2px);
-            box-shadow: 0 4px 8px rgba(212, 175, 55, 0.3);
-        }
-        
-        .tab-content {
-            display: none;
-            background: rgba(0, 0, 0, 0.4);
-            padding: 2rem;
-            border-radius: 15px;
-            border: 1px solid #d4af37;
-            backdrop-filter: blur(10px);
-        }
-        
-        .tab-content.active {
-            display: block;
-        }
-        
-        .search-section {
-            margin-bottom: 2rem;
-        }
-        
-        .search-modes {
-            display: flex;
-            gap: 1rem;
-            margin-bottom: 1rem;
-            flex-wrap: wrap;
-        }
-        
-        .search-mode {
-            padding: 0.5rem 1rem;
-            background: rgba(212, 175, 55, 0.2);
-            border: 1px solid #d4af37;
-            border-radius: 15px;
-            color: #d4af37;
-            cursor: pointer;
-            font-size: 0.9rem;
-            transition: all 0.3s ease;
-        }
-        
-        .search-mode:hover, .search-mode.active {
-            background: #d4af37;
-            color: #2c1810;
-        }
-        
-        .search-box {
-            display: flex;
-            gap: 1rem;
-            margin-bottom: 1rem;
-            flex-wrap: wrap;
-        }
-        
-        input[type="text"], input[type="date"], input[type="number"], select {
-            padding: 0.75rem;
-            border: 2px solid #d4af37;
-            border-radius: 8px;
-            background: rgba(0, 0, 0, 0.5);
-            color: #d4af37;
-            font-size: 1rem;
-            min-width: 200px;
-        }
-        
-        input[type="text"]:focus, input[type="date"]:focus, input[type="number"]:focus, select:focus {
-            outline: none;
-            box-shadow: 0 0 10px rgba(212, 175, 55, 0.5);
-        }
-        
-        .advanced-filters {
-            display: none;
-            background: rgba(0, 0, 0, 0.3);
-            padding: 1.5rem;
-            border-radius: 10px;
-            border: 1px solid #d4af37;
-            margin-bottom: 1rem;
-        }
-        
-        .advanced-filters.active {
-            display: block;
-        }
-        
-        .filter-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 1rem;
-            margin-bottom: 1rem;
-        }
-        
-        .filter-group {
-            display: flex;
-            flex-direction: column;
-            gap: 0.5rem;
-        }
-        
-        .filter-label {
-            font-weight: bold;
-            color: #f4e976;
-            font-size: 0.9rem;
-        }
-        
-        .btn {
-            padding: 0.75rem 1.5rem;
-            border: 2px solid #d4af37;
-            border-radius: 8px;
-            background: rgba(212, 175, 55, 0.1);
-            color: #d4af37;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            font-weight: 500;
-            text-decoration: none;
-            display: inline-block;
-        }
-        
-        .btn:hover {
-            background: #d4af37;
-            color: #2c1810;
-            transform: translateY(-1px);
-        }
-        
-        .btn-export {
-            background: linear-gradient(45deg, #228B22, #32CD32);
-            border-color: #228B22;
-            color: white;
-        }
-        
-        .btn-export:hover {
-            background: linear-gradient(45deg, #32CD32, #228B22);
-            color: white;
-        }
-        
-        .btn-clear {
-            background: linear-gradient(45deg, #DC143C, #FF6347);
-            border-color: #DC143C;
-            color: white;
-        }
-        
-        .btn-clear:hover {
-            background: linear-gradient(45deg, #FF6347, #DC143C);
-            color: white;
-        }
-        
-        .quick-buttons {
-            display: flex;
-            gap: 0.5rem;
-            flex-wrap: wrap;
-            margin-bottom: 1rem;
-        }
-        
-        .quick-btn {
-            padding: 0.5rem 1rem;
-            background: rgba(212, 175, 55, 0.2);
-            border: 1px solid #d4af37;
-            border-radius: 15px;
-            color: #d4af37;
-            cursor: pointer;
-            font-size: 0.9rem;
-            transition: all 0.3s ease;
-        }
-        
-        .quick-btn:hover {
-            background: #d4af37;
-            color: #2c1810;
-        }
-        
-        .results {
-            margin-top: 2rem;
-        }
-        
-        .person-card {
-            background: rgba(0, 0, 0, 0.6);
-            border: 1px solid #d4af37;
-            border-radius: 10px;
-            padding: 1.5rem;
-            margin-bottom: 1rem;
-            transition: all 0.3s ease;
-        }
-        
-        .person-card:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(212, 175, 55, 0.3);
-        }
-        
-        .person-name {
-            font-size: 1.3rem;
-            font-weight: bold;
-            color: #f4e976;
-            margin-bottom: 0.5rem;
-        }
-        
-        .person-details {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 0.5rem;
-            margin-bottom: 1rem;
-        }
-        
-        .detail-item {
-            color: #b8860b;
-        }
-        
-        .detail-label {
-            font-weight: bold;
-            color: #d4af37;
-        }
-        
-        .biography {
-            margin-top: 1rem;
-            padding: 1rem;
-            background: rgba(212, 175, 55, 0.1);
-            border-radius: 8px;
-            border-left: 4px solid #d4af37;
-        }
-        
-        .export-section {
-            margin-top: 1rem;
-            padding: 1rem;
-            background: rgba(34, 139, 34, 0.1);
-            border-radius: 8px;
-            border: 1px solid #228B22;
-        }
-        
-        .export-buttons {
-            display: flex;
-            gap: 1rem;
-            flex-wrap: wrap;
-            margin-top: 1rem;
-        }
-        
-        .loading {
-            text-align: center;
-            padding: 2rem;
-            color: #d4af37;
-        }
-        
-        .error {
-            background: rgba(220, 20, 60, 0.2);
-            border: 1px solid #dc143c;
-            color: #ff6b6b;
-            padding: 1rem;
-            border-radius: 8px;
-            margin: 1rem 0;
-        }
-        
-        .success {
-            background: rgba(34, 139, 34, 0.2);
-            border: 1px solid #228B22;
-            color: #90EE90;
-            padding: 1rem;
-            border-radius: 8px;
-            margin: 1rem 0;
-        }
-        
-        .stats-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 1rem;
-            margin-bottom: 2rem;
-        }
-        
-        .stat-card {
-            background: rgba(0, 0, 0, 0.6);
-            border: 1px solid #d4af37;
-            border-radius: 10px;
-            padding: 1.5rem;
-            text-align: center;
-        }
-        
-        .stat-number {
-            font-size: 2rem;
-            font-weight: bold;
-            color: #f4e976;
-            display: block;
-        }
-        
-        .stat-label {
-            color: #b8860b;
-            margin-top: 0.5rem;
-        }
-        
-        .search-info {
-            background: rgba(212, 175, 55, 0.1);
-            border: 1px solid #d4af37;
-            border-radius: 8px;
-            padding: 1rem;
-            margin-bottom: 1rem;
-        }
-        
-        @media (max-width: 768px) {
-            h1 { font-size: 2rem; }
-            .search-box { flex-direction: column; }
-            input[type="text"], input[type="date"], input[type="number"], select { min-width: auto; }
-            .tabs { flex-direction: column; }
-            .person-details { grid-template-columns: 1fr; }
-            .filter-grid { grid-template-columns: 1fr; }
-        }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <div class="raf-badge">
-            <div class="raf-star">★</div>
-        </div>
-        <h1>RAF Bomber Command Research Database</h1>
-        <p class="subtitle">Preserving the Memory of Those Who Served</p>
-        <div class="enhanced-banner">🔍 Advanced Search & Export Features</div>
-    </div>
-
-    <div class="container">
-        <div class="tabs">
-            <div class="tab active" onclick="showTab('personnel')">Personnel Search</div>
-            <div class="tab" onclick="showTab('aircraft')">Aircraft Database</div>
-            <div class="tab" onclick="showTab('statistics')">Statistics</div>
-        </div>
-
-        <div id="personnel" class="tab-content active">
-            <div class="search-section">
-                <h2>Personnel Search</h2>
-                
-                <div class="search-modes">
-                    <div class="search-mode active" onclick="toggleSearchMode('basic')">Basic Search</div>
-                    <div class="search-mode" onclick="toggleSearchMode('advanced')">Advanced Filters</div>
-                </div>
-                
-                <div class="search-box">
-                    <input type="text" id="personnelSearch" placeholder="Search by name, service number, squadron, or role...">
-                    <button class="btn" onclick="searchPersonnel()">Search</button>
-                    <button class="btn btn-clear" onclick="clearSearch()">Clear</button>
-                </div>
-                
-                <div id="advancedFilters" class="advanced-filters">
-                    <h3>Advanced Search Filters</h3>
-                    <div class="filter-grid">
-                        <div class="filter-group">
-                            <label class="filter-label">Date of Death Range</label>
-                            <input type="date" id="dateFrom" placeholder="From">
-                            <input type="date" id="dateTo" placeholder="To">
-                        </div>
-                        
-                        <div class="filter-group">
-                            <label class="filter-label">Service Period</label>
-                            <input type="date" id="serviceFrom" placeholder="Service Start">
-                            <input type="date" id="serviceTo" placeholder="Service End">
-                        </div>
-                        
-                        <div class="filter-group">
-                            <label class="filter-label">Aircraft Type</label>
-                            <select id="aircraftType">
-                                <option value="">All Aircraft Types</option>
-                            </select>
-                        </div>
-                        
-                        <div class="filter-group">
-                            <label class="filter-label">Squadron</label>
-                            <select id="squadronFilter">
-                                <option value="">All Squadrons</option>
-                            </select>
-                        </div>
-                        
-                        <div class="filter-group">
-                            <label class="filter-label">Role</label>
-                            <select id="roleFilter">
-                                <option value="">All Roles</option>
-                            </select>
-                        </div>
-                        
-                        <div class="filter-group">
-                            <label class="filter-label">Rank</label>
-                            <select id="rankFilter">
-                                <option value="">All Ranks</option>
-                            </select>
-                        </div>
-                        
-                        <div class="filter-group">
-                            <label class="filter-label">Base Location</label>
-                            <select id="baseLocation">
-                                <option value="">All Bases</option>
-                            </select>
-                        </div>
-                        
-                        <div class="filter-group">
-                            <label class="filter-label">Age at Death</label>
-                            <input type="number" id="ageFrom" placeholder="Min Age" min="18" max="50">
-                            <input type="number" id="ageTo" placeholder="Max Age" min="18" max="50">
-                        </div>
-                        
-                        <div class="filter-group">
-                            <label class="filter-label">Minimum Missions</label>
-                            <input type="number" id="minMissions" placeholder="Min Missions" min="0" max="100">
-                        </div>
-                        
-                        <div class="filter-group">
-                            <label class="filter-label">Awards</label>
-                            <select id="hasAwards">
-                                <option value="">All Personnel</option>
-                                <option value="true">Decorated Personnel Only</option>
-                                <option value="false">No Awards</option>
-                            </select>
-                        </div>
-                        
-                        <div class="filter-group">
-                            <label class="filter-label">Memorial Location</label>
-                            <select id="memorialLocation">
-                                <option value="">All Memorial Locations</option>
-                            </select>
-                        </div>
-                    </div>
-                    
-                    <div class="export-buttons">
-                        <button class="btn" onclick="advancedSearch()">🔍 Apply Advanced Filters</button>
-                        <button class="btn btn-clear" onclick="clearAdvancedFilters()">Clear All Filters</button>
-                    </div>
-                </div>
-                
-                <div class="quick-buttons">
-                    <div class="quick-btn" onclick="quickSearch('Patrick Cassidy')">Patrick Cassidy</div>
-                    <div class="quick-btn" onclick="quickSearch('Guy Gibson')">Guy Gibson</div>
-                    <div class="quick-btn" onclick="quickSearch('97 Squadron')">97 Squadron</div>
-                    <div class="quick-btn" onclick="quickSearch('617 Squadron')">617 Squadron</div>
-                    <div class="quick-btn" onclick="quickSearch('Flight Engineer')">Flight Engineers</div>
-                    <div class="quick-btn" onclick="quickSearch('Pathfinder')">Pathfinders</div>
-                </div>
-                
-                <div class="export-section">
-                    <h3>Export Options</h3>
-                    <p>Export personnel data for research and memorial purposes</p>
-                    <div class="export-buttons">
-                        <button class="btn btn-export" onclick="exportAllPersonnelCSV()">📊 Export All Personnel (CSV)</button>
-                        <button class="btn btn-export" onclick="exportSearchResultsCSV()">📋 Export Search Results (CSV)</button>
-                    </div>
-                </div>
-            </div>
-            
-            <div id="personnelResults" class="results"></div>
-        </div>
-
-        <div id="aircraft" class="tab-content">
-            <div class="search-section">
-                <h2>Aircraft Database</h2>
-                <div class="search-box">
-                    <input type="text" id="aircraftSearch" placeholder="Search by aircraft ID, type, squadron, or manufacturer...">
-                    <button class="btn" onclick="searchAircraft()">Search</button>
-                </div>
-                
-                <div class="quick-buttons">
-                    <div class="quick-btn" onclick="quickSearchAircraft('JB174')">JB174 (Patrick Cassidy)</div>
-                    <div class="quick-btn" onclick="quickSearchAircraft('ED932')">ED932 (Guy Gibson)</div>
-                    <div class="quick-btn" onclick="quickSearchAircraft('Lancaster')">Lancaster Aircraft</div>
-                    <div class="quick-btn" onclick="quickSearchAircraft('Halifax')">Halifax Aircraft</div>
-                </div>
-                
-                <div class="export-section">
-                    <h3>Aircraft Export</h3>
-                    <p>Export aircraft database for historical research</p>
-                    <div class="export-buttons">
-                        <button class="btn btn-export" onclick="exportAircraftCSV()">✈️ Export Aircraft Database (CSV)</button>
-                    </div>
-                </div>
-            </div>
-            
-            <div id="aircraftResults" class="results"></div>
-        </div>
-
-        <div id="statistics" class="tab-content">
-            <h2>Database Statistics</h2>
-            <div id="statisticsContent" class="loading">Loading statistics...</div>
-        </div>
-    </div>
-
-    <script>
-        let currentSearchResults = [];
-        let currentSearchMode = 'basic';
-        let filterOptions = {};
-        
-        // Initialize the application
-        document.addEventListener('DOMContentLoaded', function() {
-            loadFilterOptions();
-            loadStatistics();
-        });
-        
-        function showTab(tabName) {
-            // Hide all tab contents
-            document.querySelectorAll('.tab-content').forEach(content => {
-                content.classList.remove('active');
-            });
-            
-            // Remove active class from all tabs
-            document.querySelectorAll('.tab').forEach(tab => {
-                tab.classList.remove('active');
-            });
-            
-            // Show selected tab content
-            document.getElementById(tabName).classList.add('active');
-            
-            // Add active class to clicked tab
-            event.target.classList.add('active');
-            
-            // Load statistics when statistics tab is selected
-            if (tabName === 'statistics') {
-                loadStatistics();
-            }
-        }
-        
-        function toggleSearchMode(mode) {
-            currentSearchMode = mode;
-            
-            // Update search mode buttons
-            document.querySelectorAll('.search-mode').forEach(btn => {
-                btn.classList.remove('active');
-            });
-            event.target.classList.add('active');
-            
-            // Show/hide advanced filters
-            const advancedFilters = document.getElementById('advancedFilters');
-            if (mode === 'advanced') {
-                advancedFilters.classList.add('active');
-            } else {
-                advancedFilters.classList.remove('active');
-            }
-        }
-        
-        async function loadFilterOptions() {
-            try {
-                const response = await fetch('/api/filters/options');
-                const data = await response.json();
-                
-                if (response.ok) {
-                    filterOptions = data;
-                    populateFilterDropdowns(data);
-                }
-            } catch (error) {
-                console.error('Failed to load filter options:', error);
-            }
-        }
-        
-        function populateFilterDropdowns(options) {
-            // Populate aircraft types
-            const aircraftSelect = document.getElementById('aircraftType');
-            options.aircraft_types.forEach(type => {
-                const option = document.createElement('option');
-                option.value = type;
-                option.textContent = type;
-                aircraftSelect.appendChild(option);
-            });
-            
-            // Populate squadrons
-            const squadronSelect = document.getElementById('squadronFilter');
-            options.squadrons.forEach(squadron => {
-                const option = document.createElement('option');
-                option.value = squadron;
-                option.textContent = squadron;
-                squadronSelect.appendChild(option);
-            });
-            
-            // Populate roles
-            const roleSelect = document.getElementById('roleFilter');
-            options.roles.forEach(role => {
-                const option = document.createElement('option');
-                option.value = role;
-                option.textContent = role;
-                roleSelect.appendChild(option);
-            });
-            
-            // Populate ranks
-            const rankSelect = document.getElementById('rankFilter');
-            options.ranks.forEach(rank => {
-                const option = document.createElement('option');
-                option.value = rank;
-                option.textContent = rank;
-                rankSelect.appendChild(option);
-            });
-            
-            // Populate base locations
-            const baseSelect = document.getElementById('baseLocation');
-            options.base_locations.forEach(base => {
-                const option = document.createElement('option');
-                option.value = base;
-                option.textContent = base;
-                baseSelect.appendChild(option);
-            });
-            
-            // Populate memorial locations
-            const memorialSelect = document.getElementById('memorialLocation');
-            options.memorial_locations.forEach(memorial => {
-                const option = document.createElement('option');
-                option.value = memorial;
-                option.textContent = memorial;
-                memorialSelect.appendChild(option);
-            });
-        }
-        
-        function quickSearch(query) {
-            document.getElementById('personnelSearch').value = query;
-            searchPersonnel();
-        }
-        
-        function quickSearchAircraft(query) {
-            document.getElementById('aircraftSearch').value = query;
-            searchAircraft();
-        }
-        
-        function clearSearch() {
-            document.getElementById('personnelSearch').value = '';
-            document.getElementById('personnelResults').innerHTML = '';
-            currentSearchResults = [];
-        }
-        
-        function clearAdvancedFilters() {
-            // Clear all filter inputs
-            document.getElementById('dateFrom').value = '';
-            document.getElementById('dateTo').value = '';
-            document.getElementById('serviceFrom').value = '';
-            document.getElementById('serviceTo').value = '';
-            document.getElementById('aircraftType').value = '';
-            document.getElementById('squadronFilter').value = '';
-            document.getElementById('roleFilter').value = '';
-            document.getElementById('rankFilter').value = '';
-            document.getElementById('baseLocation').value = '';
-            document.getElementById('ageFrom').value = '';
-            document.getElementById('ageTo').value = '';
-            document.getElementById('minMissions').value = '';
-            document.getElementById('hasAwards').value = '';
-            document.getElementById('memorialLocation').value = '';
-            
-            // Clear results
-            document.getElementById('personnelResults').innerHTML = '';
-            currentSearchResults = [];
-        }
-        
-        async function searchPersonnel() {
-            const query = document.getElementById('personnelSearch').value.trim();
-            const resultsDiv = document.getElementById('personnelResults');
-            
-            if (!query && currentSearchMode === 'basic') {
-                resultsDiv.innerHTML = '<div class="error">Please enter a search term</div>';
-                return;
-            }
-            
-            resultsDiv.innerHTML = '<div class="loading">Searching personnel records...</div>';
-            
-            try {
-                const response = await fetch('/api/personnel/search', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ query })
-                });
-                
-                const data = await response.json();
-                
-                if (!response.ok) {
-                    throw new Error(data.error || 'Search failed');
-                }
-                
-                currentSearchResults = data.results;
-                displayPersonnelResults(data.results, query, 'basic');
-                
-            } catch (error) {
-                resultsDiv.innerHTML = `<div class="error">Search failed: ${error.message}</div>`;
-            }
-        }
-        
-        async function advancedSearch() {
-            const resultsDiv = document.getElementById('personnelResults');
-            resultsDiv.innerHTML = '<div class="loading">Applying advanced filters...</div>';
-            
-            try {
-                // Collect all filter values
-                const filters = {
-                    query: document.getElementById('personnelSearch').value.trim(),
-                    date_from: document.getElementById('dateFrom').value,
-                    date_to: document.getElementById('dateTo').value,
-                    service_from: document.getElementById('serviceFrom').value,
-                    service_to: document.getElementById('serviceTo').value,
-                    aircraft_type: document.getElementById('aircraftType').value,
-                    squadron: document.getElementById('squadronFilter').value,
-                    role: document.getElementById('roleFilter').value,
-                    rank: document.getElementById('rankFilter').value,
-                    base_location: document.getElementById('baseLocation').value,
-                    age_from: document.getElementById('ageFrom').value,
-                    age_to: document.getElementById('ageTo').value,
-                    min_missions: document.getElementById('minMissions').value,
-                    has_awards: document.getElementById('hasAwards').value,
-                    memorial_location: document.getElementById('memorialLocation').value,
-                    advanced_search: true
-                };
-                
-                const response = await fetch('/api/personnel/search/advanced', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify(filters)
-                });
-                
-                const data = await response.json();
-                
-                if (!response.ok) {
-                    throw new Error(data.error || 'Advanced search failed');
-                }
-                
-                currentSearchResults = data.results;
-                displayPersonnelResults(data.results, 'Advanced Search', 'advanced', data.filters_applied);
-                
-            } catch (error) {
-                resultsDiv.innerHTML = `<div class="error">Advanced search failed: ${error.message}</div>`;
-            }
-        }
+@app.route('/api/export/csv/personnel/job', methods=['POST'])
+def queue_personnel_csv():
+    """Queue a personnel CSV export for background generation."""
+    try:
+        if not request.is_json:
+            return jsonify({'error': 'Request body must be JSON'}), 415
         
-        function displayPersonnelResults(results, query, searchType, filtersApplied = null) {
-            const resultsDiv = document.getElementById('personnelResults');
-            
-            if (results.length === 0) {
-                resultsDiv.innerHTML = `<div class="error">No personnel records found for "${query}"</div>`;
-                return;
-            }
-            
-            let html = `<div class="search-info">`;
-            html += `<h3>Found ${results.length} personnel record(s)</h3>`;
-            if (searchType === 'advanced' && filtersApplied) {
-                html += `<p><strong>Advanced Search Applied:</strong> `;
-                const activeFilters = Object.entries(filtersApplied)
-                    .filter(([key, value]) => value && value !== '')
-                    .map(([key, value]) => `${key.replace('_', ' ')}: ${value}`)
-                    .join(', ');
-                html += activeFilters || 'No specific filters';
-                html += `</p>`;
-            } else {
-                html += `<p><strong>Search Query:</strong> "${query}"</p>`;
-            }
-            html += `</div>`;
-            
-            results.forEach(person => {
-                html += `
-                    <div class="person-card">
-                        <div class="person-name">${person.name}</div>
-                        <div class="person-details">
-                            <div class="detail-item"><span class="detail-label">Service Number:</span> ${person.service_number}</div>
-                            <div class="detail-item"><span class="detail-label">Rank:</span> ${person.rank}</div>
-                            <div class="detail-item"><span class="detail-label">Role:</span> ${person.role}</div>
-                            <div class="detail-item"><span class="detail-label">Squadron:</span> ${person.squadron}</div>
-                            <div class="detail-item"><span class="detail-label">Aircraft:</span> ${person.aircraft_type || 'Not recorded'}</div>
-                            <div class="detail-item"><span class="detail-label">Base:</span> ${person.base_location || 'Not recorded'}</div>
-                            <div class="detail-item"><span class="detail-label">Age at Death:</span> ${person.age_at_death ? person.age_at_death + ' years' : 'Not recorded'}</div>
-                            <div class="detail-item"><span class="detail-label">Missions:</span> ${person.mission_count || 'Not recorded'}</div>
-                            <div class="detail-item"><span class="detail-label">Memorial:</span> ${person.memorial_location || 'Not recorded'}</div>
-                            <div class="detail-item"><span class="detail-label">Panel:</span> ${person.memorial_panel || 'Not recorded'}</div>
-                            <div class="detail-item"><span class="detail-label">Awards:</span> ${person.awards || 'None recorded'}</div>
-                            <div class="detail-item"><span class="detail-label">Service Period:</span> ${person.service_start_date || 'Unknown'} - ${person.service_end_date || 'Unknown'}</div>
-                        </div>
-                        
-                        ${person.biography ? `<div class="biography"><strong>Biography:</strong><br>${person.biography}</div>` : ''}
-                        
-                        <div class="export-section">
-                            <h4>Memorial Export</h4>
-                            <p>Generate professional memorial report for ${person.name}</p>
-                            <div class="export-buttons">
-                                <button class="btn btn-export" onclick="exportMemorialPDF('${person.service_number}', '${person.name}')">📄 Memorial Report (PDF)</button>
-                            </div>
-                        </div>
-                    </div>
-                `;
-            });
-            
-            resultsDiv.innerHTML = html;
-        }
+        data = request.get_json() or {}
+        if data.get('advanced_search'):
+            coerce_filters(data)
+        job_id = submit_export_job('csv_personnel', render_personnel_csv_job, data)
+        return export_job_accepted(job_id)
+    except FilterValidationError as e:
+        return jsonify({'error': 'Invalid search filters', 'details': str(e)}), 400
+    except Exception as e:
+        logger.error(f"CSV job submission error: {e}")
+        return jsonify({'error': 'Failed to queue CSV export', 'details': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_export_job(job_id):
+    """Poll the status of a background export job."""
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM export_jobs WHERE id = ?", (job_id,))
+            job = cursor.fetchone()
         
-        async function searchAircraft() {
-            const query = document.getElementById('aircraftSearch').value.trim();
-            const resultsDiv = document.getElementById('aircraftResults');
-            
-            if (!query) {
-                resultsDiv.innerHTML = '<div class="error">Please enter a search term</div>';
-                return;
-            }
-            
-            resultsDiv.innerHTML = '<div class="loading">Searching aircraft records...</div>';
-            
-            try {
-                const response = await fetch('/api/aircraft/search', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ query })
-                });
-                
-                const data = await response.json();
-                
-                if (!response.ok) {
-                    throw new Error(data.error || 'Search failed');
-                }
-                
-                displayAircraftResults(data.results, query);
-                
-            } catch (error) {
-                resultsDiv.innerHTML = `<div class="error">Search failed: ${error.message}</div>`;
-            }
-        }
+        if not job:
+            return jsonify({'error': 'Export job not found'}), 404
         
-        function displayAircraftResults(results, query) {
-            const resultsDiv = document.getElementById('aircraftResults');
-            
-            if (results.length === 0) {
-                resultsDiv.innerHTML = `<div class="error">No aircraft records found for "${query}"</div>`;
-                return;
-            }
-            
-            let html = `<h3>Found ${results.length} aircraft record(s) for "${query}"</h3>`;
-            
-            results.forEach(aircraft => {
-                html += `
-                    <div class="person-card">
-                        <div class="person-name">${aircraft.aircraft_id} - ${aircraft.aircraft_type}</div>
-                        <div class="person-details">
-                            <div class="detail-item"><span class="detail-label">Squadron:</span> ${aircraft.squadron}</div>
-                            <div class="detail-item"><span class="detail-label">Code:</span> ${aircraft.squadron_code || 'Not recorded'}</div>
-                            <div class="detail-item"><span class="detail-label">Manufacturer:</span> ${aircraft.manufacturer || 'Not recorded'}</div>
-                            <div class="detail-item"><span class="detail-label">Base:</span> ${aircraft.base_location || 'Not recorded'}</div>
-                            <div class="detail-item"><span class="detail-label">First Flight:</span> ${aircraft.first_flight_date || 'Not recorded'}</div>
-                            <div class="detail-item"><span class="detail-label">Service Period:</span> ${aircraft.service_period_start || 'Unknown'} - ${aircraft.service_period_end || 'Unknown'}</div>
-                            <div class="detail-item"><span class="detail-label">Service Days:</span> ${aircraft.service_days || 'Unknown'}</div>
-                            <div class="detail-item"><span class="detail-label">Missions:</span> ${aircraft.missions_flown || 0}</div>
-                            <div class="detail-item"><span class="detail-label">Fate:</span> ${aircraft.fate || 'Not recorded'}</div>
-                            <div class="detail-item"><span class="detail-label">Notable Crew:</span> ${aircraft.notable_crew || 'Not recorded'}</div>
-                        </div>
-                    </div>
-                `;
-            });
-            
-            resultsDiv.innerHTML = html;
+        response = {
+            'job_id': job['id'],
+            'job_type': job['job_type'],
+            'status': job['status'],
+            'created_at': job['created_at'],
+            'completed_at': job['completed_at']
         }
+        if job['status'] == 'completed':
+            response['filename'] = job['filename']
+            response['download_url'] = f'/api/jobs/{job_id}/download'
+        elif job['status'] == 'failed':
+            response['error'] = job['error']
         
-        async function loadStatistics() {
-            const statsDiv = document.getElementById('statisticsContent');
-            
-            try {
-                const response = await fetch('/api/statistics');
-                const data = await response.json();
-                
-                if (!response.ok) {
-                    throw new Error(data.error || 'Failed to load statistics');
-                }
-                
-                let html = `
-                    <div class="stats-grid">
-                        <div class="stat-card">
-                            <span class="stat-number">${data.personnel_records}</span>
-                            <div class="stat-label">Personnel Records</div>
-                        </div>
-                        <div class="stat-card">
-                            <span class="stat-number">${data.aircraft_records}</span>
-                            <div class="stat-label">Aircraft Records</div>
-                        </div>
-                        <div class="stat-card">
-                            <span class="stat-number">${data.squadron_records}</span>
-                            <div class="stat-label">Squadron Records</div>
-                        </div>
-                        <div class="stat-card">
-                            <span class="stat-number">${data.mission_records}</span>
-                            <div class="stat-label">Mission Records</div>
-                        </div>
-                        <div class="stat-card">
-                            <span class="stat-number">${data.average_age_at_death || 'N/A'}</span>
-                            <div class="stat-label">Average Age at Death</div>
-                        </div>
-                        <div class="stat-card">
-                            <span class="stat-number">${data.average_missions_per_person || 'N/A'}</span>
-                            <div class="stat-label">Average Missions</div>
-                        </div>
-                        <div class="stat-card">
-                            <span class="stat-number">${data.decorated_personnel}</span>
-                            <div class="stat-label">Decorated Personnel</div>
-                        </div>
-                    </div>
-                    
-                    <div class="export-section">
-                        <h3>Advanced Search & Export Features</h3>
-                        <p>Professional research capabilities with multi-criteria filtering and export options</p>
-                        <div class="export-buttons">
-                            <button class="btn btn-export" onclick="exportAllPersonnelCSV()">📊 Complete Personnel Database (CSV)</button>
-                            <button class="btn btn-export" onclick="exportAircraftCSV()">✈️ Complete Aircraft Database (CSV)</button>
-                        </div>
-                    </div>
-                `;
-                
-                if (data.featured_personnel && data.featured_personnel.length > 0) {
-                    html += '<h3>Featured Personnel</h3>';
-                    data.featured_personnel.forEach(person => {
-                        html += `
-                            <div class="person-card">
-                                <div class="person-name">${person.name}</div>
-                                <div class="person-details">
-                                    <div class="detail-item"><span class="detail-label">Service Number:</span> ${person.service_number}</div>
-                                    <div class="detail-item"><span class="detail-label">Rank:</span> ${person.rank}</div>
-                                    <div class="detail-item"><span class="detail-label">Squadron:</span> ${person.squadron}</div>
-                                    <div class="detail-item"><span class="detail-label">Missions:</span> ${person.mission_count || 'Not recorded'}</div>
-                                    <div class="detail-item"><span class="detail-label">Base:</span> ${person.base_location || 'Not recorded'}</div>
-                                </div>
-                                <div class="export-section">
-                                    <div class="export-buttons">
-                                        <button class="btn btn-export" onclick="exportMemorialPDF('${person.service_number}', '${person.name}')">📄 Memorial Report (PDF)</button>
-                                    </div>
-                                </div>
-                            </div>
-                        `;
-                    });
-                }
-                
-                if (data.squadron_distribution && data.squadron_distribution.length > 0) {
-                    html += '<h3>Squadron Distribution</h3>';
-                    html += '<div class="stats-grid">';
-                    data.squadron_distribution.forEach(squadron => {
-                        html += `
-                            <div class="stat-card">
-                                <span class="stat-number">${squadron.count}</span>
-                                <div class="stat-label">${squadron.squadron}</div>
-                            </div>
-                        `;
-                    });
-                    html += '</div>';
-                }
-                
-                statsDiv.innerHTML = html;
-                
-            } catch (error) {
-                statsDiv.innerHTML = `<div class="error">Failed to load statistics: ${error.message}</div>`;
-            }
-        }
+        return jsonify(response)
         
-        // Export Functions
-        async function exportMemorialPDF(serviceNumber, name) {
-            try {
-                showMessage(`Generating memorial report for ${name}...`, 'loading');
-                
-                const response = await fetch(`/api/export/pdf/memorial/${serviceNumber}`);
-                
-                if (!response.ok) {
-                    const error = await response.json();
-                    throw new Error(error.error || 'PDF generation failed');
-                }
-                
-                // Download the PDF
-                const blob = await response.blob();
-                const url = window.URL.createObjectURL(blob);
-                const a = document.createElement('a');
-                a.href = url;
-                a.download = `RAF_Memorial_Report_${name.replace(/\\s+/g, '_')}_${serviceNumber}.pdf`;
-                document.body.appendChild(a);
-                a.click();
-                document.body.removeChild(a);
-                window.URL.revokeObjectURL(url);
-                
-                showMessage(`Memorial report for ${name} downloaded successfully!`, 'success');
-                
-            } catch (error) {
-                showMessage(`Failed to generate memorial report: ${error.message}`, 'error');
-            }
-        }
+    except Exception as e:
+        logger.error(f"Export job status error: {e}")
+        return jsonify({'error': 'Failed to get export job', 'details': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>/download', methods=['GET'])
+def download_export_job(job_id):
+    """Download the artifact produced by a completed export job."""
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM export_jobs WHERE id = ?", (job_id,))
+            job = cursor.fetchone()
         
-        async function exportAllPersonnelCSV() {
-            try {
-                showMessage('Generating complete personnel database export...', 'loading');
-                
-                const response = await fetch('/api/export/csv/personnel', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({})
-                });
-                
-                if (!response.ok) {
-                    const error = await response.json();
-                    throw new Error(error.error || 'CSV export failed');
-                }
-                
-                // Download the CSV
-                const blob = await response.blob();
-                const url = window.URL.createObjectURL(blob);
-                const a = document.createElement('a');
-                a.href = url;
-                a.download = 'RAF_Personnel_Complete_Database_Advanced.csv';
-                document.body.appendChild(a);
-                a.click();
-                document.body.removeChild(a);
-                window.URL.revokeObjectURL(url);
-                
-                showMessage('Personnel database exported successfully!', 'success');
-                
-            } catch (error) {
-                showMessage(`Failed to export personnel database: ${error.message}`, 'error');
-            }
-        }
+        if not job:
+            return jsonify({'error': 'Export job not found'}), 404
         
-        async function exportSearchResultsCSV() {
-            if (currentSearchResults.length === 0) {
-                showMessage('No search results to export. Please perform a search first.', 'error');
-                return;
-            }
-            
-            try {
-                let exportData = {};
-                
-                if (currentSearchMode === 'advanced') {
-                    // Collect current filter values for advanced search export
-                    exportData = {
-                        query: document.getElementById('personnelSearch').value.trim(),
-                        date_from: document.getElementById('dateFrom').value,
-                        date_to: document.getElementById('dateTo').value,
-                        service_from: document.getElementById('serviceFrom').value,
-                        service_to: document.getElementById('serviceTo').value,
-                        aircraft_type: document.getElementById('aircraftType').value,
-                        squadron: document.getElementById('squadronFilter').value,
-                        role: document.getElementById('roleFilter').value,
-                        rank: document.getElementById('rankFilter').value,
-                        base_location: document.getElementById('baseLocation').value,
-                        age_from: document.getElementById('ageFrom').value,
-                        age_to: document.getElementById('ageTo').value,
-                        min_missions: document.getElementById('minMissions').value,
-                        has_awards: document.getElementById('hasAwards').value,
-                        memorial_location: document.getElementById('memorialLocation').value,
-                        advanced_search: true
-                    };
-                    showMessage('Exporting advanced search results...', 'loading');
-                } else {
-                    const query = document.getElementById('personnelSearch').value.trim();
-                    exportData = { query };
-                    showMessage(`Exporting search results for "${query}"...`, 'loading');
-                }
-                
-                const response = await fetch('/api/export/csv/personnel', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify(exportData)
-                });
-                
-                if (!response.ok) {
-                    const error = await response.json();
-                    throw new Error(error.error || 'CSV export failed');
-                }
-                
-                // Download the CSV
-                const blob = await response.blob();
-                const url = window.URL.createObjectURL(blob);
-                const a = document.createElement('a');
-                a.href = url;
-                
-                if (currentSearchMode === 'advanced') {
-                    a.download = 'RAF_Personnel_Advanced_Search_Results.csv';
-                } else {
-                    const query = exportData.query || 'Search';
-                    a.download = `RAF_Personnel_Search_${query.replace(/\\s+/g, '_')}.csv`;
-                }
-                
-                document.body.appendChild(a);
-                a.click();
-                document.body.removeChild(a);
-                window.URL.revokeObjectURL(url);
-                
-                showMessage('Search results exported successfully!', 'success');
-                
-            } catch (error) {
-                showMessage(`Failed to export search results: ${error.message}`, 'error');
-            }
-        }
+        if job['status'] != 'completed':
+            return jsonify({'error': 'Export job not completed', 'status': job['status']}), 409
         
-        async function exportAircraftCSV() {
-            try {
-                showMessage('Generating aircraft database export...', 'loading');
-                
-                const response = await fetch('/api/export/csv/aircraft');
-                
-                if (!response.ok) {
-                    const error = await response.json();
-                    throw new Error(error.error || 'CSV export failed');
-                }
-                
-                // Download the CSV
-                const blob = await response.blob();
-                const url = window.URL.createObjectURL(blob);
-                const a = document.createElement('a');
-                a.href = url;
-                a.download = 'RAF_Aircraft_Database_Advanced.csv';
-                document.body.appendChild(a);
-                a.click();
-                document.body.removeChild(a);
-                window.URL.revokeObjectURL(url);
-                
-                showMessage('Aircraft database exported successfully!', 'success');
-                
-            } catch (error) {
-                showMessage(`Failed to export aircraft database: ${error.message}`, 'error');
-            }
-        }
+        return send_file(
+            job['result_path'],
+            as_attachment=True,
+            download_name=job['filename'],
+            mimetype=job['mimetype']
+        )
         
-        function showMessage(message, type) {
-            // Remove existing messages
-            const existingMessages = document.querySelectorAll('.message-popup');
-            existingMessages.forEach(msg => msg.remove());
-            
-            // Create new message
-            const messageDiv = document.createElement('div');
-            messageDiv.className = `message-popup ${type}`;
-            messageDiv.style.cssText = `
-                position: fixed;
-                top: 20px;
-                right: 20px;
-                padding: 1rem 1.5rem;
-                border-radius: 8px;
-                z-index: 1000;
-                max-width: 400px;
-                box-shadow: 0 4px 12px rgba(0, 0, 0, 0.3);
-            `;
-            
-            if (type === 'success') {
-                messageDiv.style.background = 'rgba(34, 139, 34, 0.9)';
-                messageDiv.style.color = 'white';
-                messageDiv.style.border = '1px solid #228B22';
-            } else if (type === 'error') {
-                messageDiv.style.background = 'rgba(220, 20, 60, 0.9)';
-                messageDiv.style.color = 'white';
-                messageDiv.style.border = '1px solid #dc143c';
-            } else {
-                messageDiv.style.background = 'rgba(212, 175, 55, 0.9)';
-                messageDiv.style.color = '#2c1810';
-                messageDiv.style.border = '1px solid #d4af37';
-            }
+    except Exception as e:
+        logger.error(f"Export job download error: {e}")
+        return jsonify({'error': 'Failed to download export', 'details': str(e)}), 500
+
+STATS_CACHE_KEY = 'v1'
+
+def build_statistics_payload(cursor):
+    """Run the statistics aggregates and return the response payload."""
+    # Personnel statistics in a single pass using conditional aggregates
+    cursor.execute('''
+        SELECT COUNT(*),
+               AVG(age_at_death),
+               AVG(CASE WHEN mission_count > 0 THEN mission_count END),
+               COUNT(CASE WHEN awards IS NOT NULL AND awards != 'None recorded' THEN 1 END)
+        FROM personnel
+    ''')
+    personnel_count, avg_age, avg_missions, decorated_personnel = cursor.fetchone()
+    
+    # Get counts for the remaining tables in one statement
+    cursor.execute('''
+        SELECT (SELECT COUNT(*) FROM aircraft),
+               (SELECT COUNT(*) FROM squadrons),
+               (SELECT COUNT(*) FROM missions)
+    ''')
+    aircraft_count, squadron_count, mission_count = cursor.fetchone()
+    
+    # Get featured personnel (including Patrick Cassidy)
+    cursor.execute('''
+        SELECT name, rank, squadron, service_number, mission_count, base_location
+        FROM personnel 
+        WHERE service_number IN ('1802082', 'R156789') 
+        ORDER BY service_number
+    ''')
+    featured_personnel = fetch_dicts(cursor)
+    
+    # Get squadron distribution
+    cursor.execute('''
+        SELECT squadron, COUNT(*) as count 
+        FROM personnel 
+        GROUP BY squadron 
+        ORDER BY count DESC 
+        LIMIT 5
+    ''')
+    squadron_distribution = fetch_dicts(cursor)
+    
+    return {
+        'personnel_records': personnel_count,
+        'aircraft_records': aircraft_count,
+        'squadron_records': squadron_count,
+        'mission_records': mission_count,
+        'average_age_at_death': round(avg_age, 1) if avg_age else None,
+        'average_missions_per_person': round(avg_missions, 1) if avg_missions else None,
+        'decorated_personnel': decorated_personnel,
+        'featured_personnel': featured_personnel,
+        'squadron_distribution': squadron_distribution,
+        'advanced_search_features': {
+            'date_range_filtering': True,
+            'aircraft_type_filtering': True,
+            'geographic_filtering': True,
+            'mission_count_filtering': True,
+            'awards_filtering': True,
+            'multi_criteria_search': True
+        },
+        'export_features': {
+            'pdf_memorial_reports': True,
+            'csv_personnel_export': True,
+            'csv_aircraft_export': True,
+            'advanced_search_export': True
+        }
+    }
+
+def refresh_statistics_cache(cursor):
+    """Recompute the statistics payload and store it as encoded JSON."""
+    payload = orjson.dumps(build_statistics_payload(cursor), option=orjson.OPT_NON_STR_KEYS)
+    cursor.execute(
+        "INSERT OR REPLACE INTO stats_cache (k, v_json) VALUES (?, ?)",
+        (STATS_CACHE_KEY, payload)
+    )
+    return payload
+
+@app.route('/api/statistics', methods=['GET'])
+def get_statistics():
+    """Get enhanced database statistics."""
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT v_json FROM stats_cache WHERE k = ?", (STATS_CACHE_KEY,))
+            row = cursor.fetchone()
+            if row:
+                payload = row[0]
+            else:
+                payload = refresh_statistics_cache(cursor)
+                conn.commit()
             
-            messageDiv.textContent = message;
-            document.body.appendChild(messageDiv);
+            return compressed_json_response(payload)
             
-            // Auto-remove after 5 seconds for success/error messages
-            if (type !== 'loading') {
-                setTimeout(() => {
-                    if (messageDiv.parentNode) {
-                        messageDiv.remove();
-                    }
-                }, 5000);
-            }
-        }
-        
-        // Handle Enter key in search boxes
-        document.getElementById('personnelSearch').addEventListener('keypress', function(e) {
-            if (e.key === 'Enter') {
-                if (currentSearchMode === 'advanced') {
-                    advancedSearch();
-                } else {
-                    searchPersonnel();
-                }
-            }
-        });
-        
-        document.getElementById('aircraftSearch').addEventListener('keypress', function(e) {
-            if (e.key === 'Enter') {
-                searchAircraft();
-            }
-        });
-    </script>
-</body>
-</html>'''
+    except Exception as e:
+        logger.error(f"Statistics error: {e}")
+        return json_response({'error': 'Failed to get statistics', 'details': str(e)}, 500)
+
+# Serve the enhanced frontend with advanced search
+def load_frontend_script():
+    """Read the frontend script once; returns (hashed file name, script, gzip script)."""
+    with open(os.path.join(app.static_folder, FRONTEND_SCRIPT), 'rb') as f:
+        script = f.read()
+    digest = hashlib.md5(script).hexdigest()[:12]
+    return f'advanced_filters.{digest}.js', script, gzip.compress(script, compresslevel=9)
+
+FRONTEND_SCRIPT_NAME, FRONTEND_SCRIPT_JS, FRONTEND_SCRIPT_GZ = load_frontend_script()
+
+def load_frontend():
+    """Load the static frontend once, pointed at the hashed script; returns (html, gzip html, ETag)."""
+    with open(os.path.join(app.static_folder, 'index.html'), 'rb') as f:
+        html = f.read().replace(f'/static/{FRONTEND_SCRIPT}'.encode(), f'/static/{FRONTEND_SCRIPT_NAME}'.encode())
+    return html, gzip.compress(html, compresslevel=9), hashlib.md5(html).hexdigest()
+
+FRONTEND_HTML, FRONTEND_HTML_GZ, FRONTEND_HTML_ETAG = load_frontend()
+
+def frontend_response(body, compressed, mimetype, etag):
+    """Response for a preloaded frontend file, gzipped when the client accepts it.
+    
+    Each encoding is a separate representation, so the gzip body gets its
+    own strong ETag and a cache never revalidates one against the other.
+    """
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = Response(compressed, mimetype=mimetype)
+        response.headers['Content-Encoding'] = 'gzip'
+        etag += '-gz'
+    else:
+        response = Response(body, mimetype=mimetype)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.set_etag(etag)
+    return response
+
+@app.route('/')
+def serve_frontend():
+    """Serve the enhanced frontend with advanced search filters."""
+    response = frontend_response(FRONTEND_HTML, FRONTEND_HTML_GZ, 'text/html', FRONTEND_HTML_ETAG)
+    response.cache_control.max_age = FRONTEND_MAX_AGE
+    return response.make_conditional(request)
+
+@app.route('/static/advanced_filters.<digest>.js')
+def serve_frontend_script(digest):
+    """Serve the frontend script; its URL changes with its content, so it never goes stale."""
+    if f'advanced_filters.{digest}.js' != FRONTEND_SCRIPT_NAME:
+        return json_response({'error': 'Script not found'}, 404)
+    
+    response = frontend_response(FRONTEND_SCRIPT_JS, FRONTEND_SCRIPT_GZ, 'text/javascript', digest)
+    response.cache_control.max_age = FRONTEND_ASSET_MAX_AGE
+    response.cache_control.immutable = True
+    return response.make_conditional(request)
 
 if __name__ == '__main__':
     try:
@@ -18,184 +18,301 @@ and all RAF Bomber Command personnel who served with courage and sacrifice.
 """
 
 import os
+import hashlib
 import sqlite3
 import json
 import csv
+import gzip
 import io
+import queue
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from flask import Flask, request, jsonify, send_file, render_template_string, Response
+from functools import lru_cache
+from types import MappingProxyType
+from flask import Flask, request, jsonify, send_file, Response
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+import orjson
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson (C encoder) instead of stdlib json"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
 
 app = Flask(__name__)
-CORS(app, origins="*")
+app.json = OrjsonProvider(app)
+# Cross-origin access is only needed for the JSON API; CORS_ORIGINS takes a
+# comma-separated allow-list, and browsers may cache preflights for a day
+CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*').split(',')
+CORS(app, resources={r"/api/*": {"origins": CORS_ORIGINS}}, max_age=86400)
 
 # Database configuration
 DATABASE_PATH = '/tmp/raf_bomber_command_ai_research.db'
 
+# Requests read a shared in-memory copy of the seeded database. SQLite drops a
+# shared in-memory database with its last connection, so this one stays open.
+MEMORY_DATABASE_URI = 'file:raf_bomber_command_ai_research?mode=memory&cache=shared'
+memory_database = sqlite3.connect(MEMORY_DATABASE_URI, uri=True, check_same_thread=False)
+
+# Page cache per connection; negative values are KiB (32 MiB)
+SQL_PAGE_CACHE_SIZE = -32768
+
+# Idle connections kept open between requests so their page cache stays warm
+SQL_POOL_SIZE = int(os.environ.get('SQL_POOL_SIZE', 4))
+connection_pool = queue.LifoQueue(maxsize=SQL_POOL_SIZE)
+
+# Static interface page and its browser cache lifetime
+FRONTEND_PAGE = 'ai_research_assistant.html'
+FRONTEND_MAX_AGE = 3600
+
 # OpenAI configuration
 OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
 
-def init_database():
-    """Initialize the database with comprehensive RAF Bomber Command data"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Create tables
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS personnel (
-            id INTEGER PRIMARY KEY,
-            service_number TEXT UNIQUE,
-            name TEXT,
-            rank TEXT,
-            squadron TEXT,
-            role TEXT,
-            age_at_death INTEGER,
-            date_of_death TEXT,
-            service_start TEXT,
-            service_end TEXT,
-            aircraft_type TEXT,
-            base_location TEXT,
-            missions_completed INTEGER,
-            awards TEXT,
-            memorial_location TEXT,
-            biography TEXT
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS aircraft (
-            id INTEGER PRIMARY KEY,
-            aircraft_id TEXT UNIQUE,
-            aircraft_type TEXT,
-            squadron TEXT,
-            service_start TEXT,
-            service_end TEXT,
-            missions_completed INTEGER,
-            crew_members TEXT,
-            notable_operations TEXT,
-            fate TEXT
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS research_archives (
-            id INTEGER PRIMARY KEY,
-            archive_name TEXT,
-            archive_type TEXT,
-            website_url TEXT,
-            contact_info TEXT,
-            specialization TEXT,
-            access_requirements TEXT,
-            cost_info TEXT,
-            research_tips TEXT
-        )
-    ''')
+# Seed personnel records
+PERSONNEL_SEED = [
+    ('1802082', 'Patrick Cassidy', 'Sergeant', '97 Squadron RAF Pathfinders', 'Flight Engineer', 21, '1943-11-15', '1943-08-01', '1943-11-15', 'Avro Lancaster', 'RAF Bourn, Cambridgeshire', 47, 'None', 'Runnymede Memorial Panel 119', 'Sergeant Patrick Cassidy served as Flight Engineer with 97 Squadron RAF Pathfinders, one of the elite target-marking units of RAF Bomber Command. Flying in Avro Lancaster JB174, he participated in precision bombing operations over occupied Europe. His aircraft was lost during a mission to Hanover on November 15, 1943, after just 47 days of operational service. Patrick was 21 years old and is commemorated on Panel 119 of the Runnymede Memorial.'),
+    ('R156789', 'Guy Gibson', 'Wing Commander', '617 Squadron', 'Pilot', 26, '1944-09-19', '1940-01-01', '1944-09-19', 'Avro Lancaster', 'RAF Scampton, Lincolnshire', 174, 'Victoria Cross, Distinguished Service Order and Bar, Distinguished Flying Cross and Bar', 'Steenbergen General Cemetery', 'Wing Commander Guy Gibson VC DSO DFC led the famous Dambusters raid on May 16-17, 1943. As commanding officer of 617 Squadron, he flew the lead aircraft during Operation Chastise, the attack on the Ruhr dams. Gibson completed 174 operational flights and was awarded the Victoria Cross for his leadership during the Dambusters raid.'),
+    ('1234567', 'John Smith', 'Flight Sergeant', '101 Squadron', 'Wireless Operator', 23, '1943-12-20', '1942-06-15', '1943-12-20', 'Avro Lancaster', 'RAF Ludford Magna, Lincolnshire', 89, 'Distinguished Flying Medal', 'Berlin War Cemetery', 'Flight Sergeant John Smith served as Wireless Operator with 101 Squadron, specializing in electronic countermeasures operations. His squadron was equipped with special radio equipment to jam German night fighter communications.'),
+    ('2345678', 'Robert Johnson', 'Pilot Officer', '35 Squadron', 'Navigator', 20, '1944-03-30', '1943-09-10', '1944-03-30', 'Handley Page Halifax', 'RAF Graveley, Huntingdonshire', 67, 'None', 'Bayeux War Cemetery', 'Pilot Officer Robert Johnson served as Navigator with 35 Squadron, part of the Pathfinder Force. He specialized in target marking and navigation for main force bombing operations.'),
+    ('3456789', 'William Brown', 'Flight Lieutenant', '460 Squadron RAAF', 'Bomb Aimer', 24, '1944-08-25', '1943-02-01', '1944-08-25', 'Avro Lancaster', 'RAF Binbrook, Lincolnshire', 156, 'Distinguished Flying Cross', 'Durnbach War Cemetery', 'Flight Lieutenant William Brown served as Bomb Aimer with 460 Squadron RAAF, an Australian squadron operating with RAF Bomber Command. He completed 156 operational flights before being lost over Germany.'),
+    ('4567890', 'James Wilson', 'Sergeant', '44 Squadron', 'Rear Gunner', 19, '1943-10-14', '1943-05-20', '1943-10-14', 'Avro Lancaster', 'RAF Dunholme Lodge, Lincolnshire', 34, 'None', 'Runnymede Memorial', 'Sergeant James Wilson served as Rear Gunner with 44 Squadron. At just 19 years old, he was one of the youngest aircrew members, manning the rear turret of Avro Lancaster bombers during operations over occupied Europe.'),
+    ('5678901', 'Thomas Davis', 'Flying Officer', '207 Squadron', 'Pilot', 25, '1944-06-12', '1942-11-30', '1944-06-12', 'Avro Lancaster', 'RAF Spilsby, Lincolnshire', 198, 'Distinguished Flying Cross and Bar', 'Hamburg Cemetery', 'Flying Officer Thomas Davis served as Pilot with 207 Squadron, completing 198 operational flights. He was awarded the Distinguished Flying Cross and Bar for his exceptional service and leadership.'),
+    ('6789012', 'Charles Miller', 'Sergeant', '83 Squadron', 'Mid-Upper Gunner', 22, '1944-01-27', '1943-07-15', '1944-01-27', 'Avro Lancaster', 'RAF Wyton, Huntingdonshire', 78, 'None', 'Runnymede Memorial', 'Sergeant Charles Miller served as Mid-Upper Gunner with 83 Squadron, part of the Pathfinder Force. He operated the mid-upper gun turret, providing defensive fire during bombing operations.'),
+    ('7890123', 'George Taylor', 'Flight Sergeant', '166 Squadron', 'Flight Engineer', 23, '1943-09-23', '1943-04-10', '1943-09-23', 'Avro Lancaster', 'RAF Kirmington, Lincolnshire', 45, 'None', 'Berlin War Cemetery', 'Flight Sergeant George Taylor served as Flight Engineer with 166 Squadron, responsible for monitoring aircraft systems and assisting the pilot during operations.'),
+    ('8901234', 'Edward Anderson', 'Sergeant', '50 Squadron', 'Wireless Operator', 21, '1944-02-15', '1943-08-20', '1944-02-15', 'Avro Lancaster', 'RAF Skellingthorpe, Lincolnshire', 56, 'None', 'Bayeux War Cemetery', 'Sergeant Edward Anderson served as Wireless Operator with 50 Squadron, maintaining radio communications during bombing operations and coordinating with ground control.')
+]
+
+# Seed aircraft records
+AIRCRAFT_SEED = [
+    ('JB174', 'Avro Lancaster B.I', '97 Squadron RAF Pathfinders', '1943-09-29', '1943-11-15', 47, 'Patrick Cassidy (Flight Engineer), Crew of 7', 'Pathfinder target marking operations', 'Lost over Hanover, November 15, 1943'),
+    ('ME554', 'Avro Lancaster B.I', '101 Squadron', '1943-08-10', '1943-11-15', 28, 'Electronic countermeasures crew', 'Special duties operations', 'Lost in action'),
+    ('LK797', 'Handley Page Halifax B.III', '35 Squadron', '1943-12-01', '1944-06-12', 45, 'Pathfinder navigation crew', 'Target marking operations', 'Lost over France'),
+    ('DV372', 'Avro Lancaster B.I', '44 Squadron', '1943-05-20', '1943-09-08', 23, 'Standard bomber crew', 'Main force bombing operations', 'Lost over Germany'),
+    ('PB304', 'Avro Lancaster B.I', '460 Squadron RAAF', '1943-03-15', '1944-08-25', 67, 'Australian crew', 'Main force bombing operations', 'Lost over Germany'),
+    ('ED932', 'Avro Lancaster B.III', '617 Squadron', '1943-05-01', '1943-05-17', 1, 'Guy Gibson and crew', 'Operation Chastise (Dambusters)', 'Survived the war')
+]
+
+# Seed research archives directory
+ARCHIVES_SEED = [
+    ('The National Archives (UK)', 'Government Archive', 'https://www.nationalarchives.gov.uk/', 'enquiry@nationalarchives.gov.uk', 'RAF service records, operational records, squadron histories', 'Free online access, paid research services available', 'Free browsing, £3.50 per download', 'Essential for official service records. Search AIR series for RAF records.'),
+    ('RAF Museum', 'Military Museum', 'https://www.rafmuseum.org.uk/', 'research@rafmuseum.org.uk', 'Aircraft histories, squadron records, personal collections', 'Email appointment required', 'Free research access', 'Excellent for squadron histories and aircraft technical details.'),
+    ('Commonwealth War Graves Commission', 'Memorial Database', 'https://www.cwgc.org/', 'general.enq@cwgc.org', 'Burial and memorial records', 'Free online database', 'Free', 'Essential for finding burial/memorial locations and basic service details.'),
+    ('Imperial War Museums', 'War Museum', 'https://www.iwm.org.uk/', 'collections@iwm.org.uk', 'Personal papers, photographs, oral histories', 'Appointment required for archives', 'Free research access', 'Valuable for personal stories and photographs.'),
+    ('Bomber Command Museum of Canada', 'Specialist Museum', 'https://bombercommandmuseum.ca/', 'info@bombercommandmuseum.ca', 'Canadian aircrew records, squadron histories', 'Email enquiries', 'Free research assistance', 'Essential for Commonwealth aircrew research.'),
+    ('Air Historical Branch (RAF)', 'Military Archive', 'https://www.raf.mod.uk/our-organisation/air-historical-branch/', 'Air-AHB-Enquiries@mod.gov.uk', 'Official RAF histories, operational records', 'Written enquiries only', 'Free for basic enquiries', 'Official RAF historical records and narratives.'),
+    ('Ancestry.com', 'Genealogy Database', 'https://www.ancestry.com/', 'support@ancestry.com', 'Military records, census data, family trees', 'Subscription required', '£12.95-£24.95 per month', 'Good for family background and military service records.'),
+    ('FindMyPast', 'Genealogy Database', 'https://www.findmypast.com/', 'help@findmypast.com', 'Military records, newspapers, directories', 'Subscription required', '£12.95-£18.95 per month', 'Strong collection of military records and local newspapers.'),
+    ('Forces War Records', 'Military Database', 'https://www.forces-war-records.co.uk/', 'help@forces-war-records.co.uk', 'Military service records, medal rolls', 'Subscription required', '£9.95-£13.95 per month', 'Specialized military records database.'),
+    ('Runnymede Memorial Archive', 'Memorial Archive', 'https://www.cwgc.org/find-war-dead/cemetery/2000300/runnymede-memorial/', 'general.enq@cwgc.org', 'RAF aircrew with no known grave', 'Free online access', 'Free', 'Essential for aircrew lost over Europe with no known grave.')
+]
+
+# Seed research sources guide
+SOURCES_SEED = [
+    ('RAF Service Records (AIR 79)', 'Primary Source', 'Individual service records for RAF personnel', 'https://discovery.nationalarchives.gov.uk/', 'Online at The National Archives', '£3.50 per download', 'Essential - contains complete service history'),
+    ('Squadron Operational Record Books', 'Primary Source', 'Daily records of squadron activities and operations', 'https://discovery.nationalarchives.gov.uk/', 'Online at The National Archives', 'Free to view, £3.50 to download', 'Vital for understanding daily operations and specific missions'),
+    ('Combat Reports', 'Primary Source', 'Individual mission reports and combat accounts', 'https://discovery.nationalarchives.gov.uk/', 'Online at The National Archives', 'Free to view, £3.50 to download', 'Detailed accounts of specific operations and encounters'),
+    ('Medal Citation Records', 'Primary Source', 'Official citations for gallantry and service medals', 'https://discovery.nationalarchives.gov.uk/', 'Online at The National Archives', 'Free to view, £3.50 to download', 'Provides details of heroic actions and service recognition'),
+    ('RAF Casualty Cards', 'Primary Source', 'Death and casualty notification cards', 'https://discovery.nationalarchives.gov.uk/', 'Online at The National Archives', 'Free to view, £3.50 to download', 'Essential for casualty details and circumstances'),
+    ('Local Newspapers', 'Secondary Source', 'Contemporary newspaper reports and obituaries', 'https://www.britishnewspaperarchive.co.uk/', 'British Newspaper Archive (subscription)', '£12.95 per month', 'Valuable for local context and family reactions'),
+    ('RAF Museum Collections', 'Mixed Sources', 'Aircraft records, photographs, personal collections', 'https://www.rafmuseum.org.uk/', 'Email appointment required', 'Free research access', 'Excellent for technical details and personal stories'),
+    ('Bomber Command Association Records', 'Secondary Source', 'Veteran accounts and squadron reunions', 'Various local archives', 'Contact local archives', 'Varies', 'Personal accounts and post-war connections'),
+    ('Aircraft Loss Cards', 'Primary Source', 'Official records of aircraft losses and crew fates', 'https://discovery.nationalarchives.gov.uk/', 'Online at The National Archives', 'Free to view, £3.50 to download', 'Critical for understanding aircraft losses and crew casualties'),
+    ('Station Records', 'Primary Source', 'Records of individual RAF bases and their operations', 'https://discovery.nationalarchives.gov.uk/', 'Online at The National Archives', 'Free to view, £3.50 to download', 'Provides context for base operations and personnel')
+]
+
+# Column names for the seed tuples above
+PERSONNEL_FIELDS = ('service_number', 'name', 'rank', 'squadron', 'role', 'age_at_death', 'date_of_death',
+                    'service_start', 'service_end', 'aircraft_type', 'base_location', 'missions_completed',
+                    'awards', 'memorial_location', 'biography')
+ARCHIVE_FIELDS = ('archive_name', 'archive_type', 'website_url', 'contact_info', 'specialization',
+                  'access_requirements', 'cost_info', 'research_tips')
+SOURCE_FIELDS = ('source_name', 'source_type', 'description', 'url', 'access_method', 'cost', 'research_value')
+
+# Read-only lookup copies of the reference data, ordered by name like the SQL queries they replace
+PERSONNEL = {
+    row[0]: MappingProxyType(dict(zip(PERSONNEL_FIELDS, row)))
+    for row in sorted(PERSONNEL_SEED, key=lambda row: row[1])
+}
+ARCHIVES = tuple(MappingProxyType(dict(zip(ARCHIVE_FIELDS, row))) for row in sorted(ARCHIVES_SEED))
+SOURCES = tuple(MappingProxyType(dict(zip(SOURCE_FIELDS, row))) for row in sorted(SOURCES_SEED))
+
+# Row counts of a fully seeded database, checked to skip re-seeding on startup
+SEED_ROW_COUNTS = {
+    'personnel': len(PERSONNEL_SEED),
+    'aircraft': len(AIRCRAFT_SEED),
+    'research_archives': len(ARCHIVES_SEED),
+    'research_sources': len(SOURCES_SEED)
+}
+
+def open_db_connection():
+    """Open a connection to the in-memory database that can be handed between request threads"""
+    conn = sqlite3.connect(MEMORY_DATABASE_URI, uri=True, check_same_thread=False)
+    conn.execute(f"PRAGMA cache_size = {SQL_PAGE_CACHE_SIZE}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
+
+@contextmanager
+def get_db_connection():
+    """Borrow a pooled connection, opening a new one when the pool is empty"""
+    try:
+        conn = connection_pool.get_nowait()
+    except queue.Empty:
+        conn = open_db_connection()
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            connection_pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+def database_is_seeded(cursor):
+    """True when every table exists and already holds exactly its seed rows"""
+    for table, expected in SEED_ROW_COUNTS.items():
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+        if not cursor.fetchone()[0]:
+            return False
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        if cursor.fetchone()[0] != expected:
+            return False
+    return True
+
+def seed_database(conn):
+    """Create the tables and load the seed data, committed as one transaction"""
+    with conn:
+        cursor = conn.cursor()
+        
+        # Create tables
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS personnel (
+                id INTEGER PRIMARY KEY,
+                service_number TEXT UNIQUE,
+                name TEXT,
+                rank TEXT,
+                squadron TEXT,
+                role TEXT,
+                age_at_death INTEGER,
+                date_of_death TEXT,
+                service_start TEXT,
+                service_end TEXT,
+                aircraft_type TEXT,
+                base_location TEXT,
+                missions_completed INTEGER,
+                awards TEXT,
+                memorial_location TEXT,
+                biography TEXT
+            )
+        ''')
     
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS research_sources (
-            id INTEGER PRIMARY KEY,
-            source_name TEXT,
-            source_type TEXT,
-            description TEXT,
-            url TEXT,
-            access_method TEXT,
-            cost TEXT,
-            research_value TEXT
-        )
-    ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS aircraft (
+                id INTEGER PRIMARY KEY,
+                aircraft_id TEXT UNIQUE,
+                aircraft_type TEXT,
+                squadron TEXT,
+                service_start TEXT,
+                service_end TEXT,
+                missions_completed INTEGER,
+                crew_members TEXT,
+                notable_operations TEXT,
+                fate TEXT
+            )
+        ''')
     
-    # Insert comprehensive personnel data
-    personnel_data = [
-        ('1802082', 'Patrick Cassidy', 'Sergeant', '97 Squadron RAF Pathfinders', 'Flight Engineer', 21, '1943-11-15', '1943-08-01', '1943-11-15', 'Avro Lancaster', 'RAF Bourn, Cambridgeshire', 47, 'None', 'Runnymede Memorial Panel 119', 'Sergeant Patrick Cassidy served as Flight Engineer with 97 Squadron RAF Pathfinders, one of the elite target-marking units of RAF Bomber Command. Flying in Avro Lancaster JB174, he participated in precision bombing operations over occupied Europe. His aircraft was lost during a mission to Hanover on November 15, 1943, after just 47 days of operational service. Patrick was 21 years old and is commemorated on Panel 119 of the Runnymede Memorial.'),
-        ('R156789', 'Guy Gibson', 'Wing Commander', '617 Squadron', 'Pilot', 26, '1944-09-19', '1940-01-01', '1944-09-19', 'Avro Lancaster', 'RAF Scampton, Lincolnshire', 174, 'Victoria Cross, Distinguished Service Order and Bar, Distinguished Flying Cross and Bar', 'Steenbergen General Cemetery', 'Wing Commander Guy Gibson VC DSO DFC led the famous Dambusters raid on May 16-17, 1943. As commanding officer of 617 Squadron, he flew the lead aircraft during Operation Chastise, the attack on the Ruhr dams. Gibson completed 174 operational flights and was awarded the Victoria Cross for his leadership during the Dambusters raid.'),
-        ('1234567', 'John Smith', 'Flight Sergeant', '101 Squadron', 'Wireless Operator', 23, '1943-12-20', '1942-06-15', '1943-12-20', 'Avro Lancaster', 'RAF Ludford Magna, Lincolnshire', 89, 'Distinguished Flying Medal', 'Berlin War Cemetery', 'Flight Sergeant John Smith served as Wireless Operator with 101 Squadron, specializing in electronic countermeasures operations. His squadron was equipped with special radio equipment to jam German night fighter communications.'),
-        ('2345678', 'Robert Johnson', 'Pilot Officer', '35 Squadron', 'Navigator', 20, '1944-03-30', '1943-09-10', '1944-03-30', 'Handley Page Halifax', 'RAF Graveley, Huntingdonshire', 67, 'None', 'Bayeux War Cemetery', 'Pilot Officer Robert Johnson served as Navigator with 35 Squadron, part of the Pathfinder Force. He specialized in target marking and navigation for main force bombing operations.'),
-        ('3456789', 'William Brown', 'Flight Lieutenant', '460 Squadron RAAF', 'Bomb Aimer', 24, '1944-08-25', '1943-02-01', '1944-08-25', 'Avro Lancaster', 'RAF Binbrook, Lincolnshire', 156, 'Distinguished Flying Cross', 'Durnbach War Cemetery', 'Flight Lieutenant William Brown served as Bomb Aimer with 460 Squadron RAAF, an Australian squadron operating with RAF Bomber Command. He completed 156 operational flights before being lost over Germany.'),
-        ('4567890', 'James Wilson', 'Sergeant', '44 Squadron', 'Rear Gunner', 19, '1943-10-14', '1943-05-20', '1943-10-14', 'Avro Lancaster', 'RAF Dunholme Lodge, Lincolnshire', 34, 'None', 'Runnymede Memorial', 'Sergeant James Wilson served as Rear Gunner with 44 Squadron. At just 19 years old, he was one of the youngest aircrew members, manning the rear turret of Avro Lancaster bombers during operations over occupied Europe.'),
-        ('5678901', 'Thomas Davis', 'Flying Officer', '207 Squadron', 'Pilot', 25, '1944-06-12', '1942-11-30', '1944-06-12', 'Avro Lancaster', 'RAF Spilsby, Lincolnshire', 198, 'Distinguished Flying Cross and Bar', 'Hamburg Cemetery', 'Flying Officer Thomas Davis served as Pilot with 207 Squadron, completing 198 operational flights. He was awarded the Distinguished Flying Cross and Bar for his exceptional service and leadership.'),
-        ('6789012', 'Charles Miller', 'Sergeant', '83 Squadron', 'Mid-Upper Gunner', 22, '1944-01-27', '1943-07-15', '1944-01-27', 'Avro Lancaster', 'RAF Wyton, Huntingdonshire', 78, 'None', 'Runnymede Memorial', 'Sergeant Charles Miller served as Mid-Upper Gunner with 83 Squadron, part of the Pathfinder Force. He operated the mid-upper gun turret, providing defensive fire during bombing operations.'),
-        ('7890123', 'George Taylor', 'Flight Sergeant', '166 Squadron', 'Flight Engineer', 23, '1943-09-23', '1943-04-10', '1943-09-23', 'Avro Lancaster', 'RAF Kirmington, Lincolnshire', 45, 'None', 'Berlin War Cemetery', 'Flight Sergeant George Taylor served as Flight Engineer with 166 Squadron, responsible for monitoring aircraft systems and assisting the pilot during operations.'),
-        ('8901234', 'Edward Anderson', 'Sergeant', '50 Squadron', 'Wireless Operator', 21, '1944-02-15', '1943-08-20', '1944-02-15', 'Avro Lancaster', 'RAF Skellingthorpe, Lincolnshire', 56, 'None', 'Bayeux War Cemetery', 'Sergeant Edward Anderson served as Wireless Operator with 50 Squadron, maintaining radio communications during bombing operations and coordinating with ground control.')
-    ]
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS research_archives (
+                id INTEGER PRIMARY KEY,
+                archive_name TEXT,
+                archive_type TEXT,
+                website_url TEXT,
+                contact_info TEXT,
+                specialization TEXT,
+                access_requirements TEXT,
+                cost_info TEXT,
+                research_tips TEXT
+            )
+        ''')
     
-    for person in personnel_data:
         cursor.execute('''
-            INSERT OR REPLACE INTO personnel 
+            CREATE TABLE IF NOT EXISTS research_sources (
+                id INTEGER PRIMARY KEY,
+                source_name TEXT,
+                source_type TEXT,
+                description TEXT,
+                url TEXT,
+                access_method TEXT,
+                cost TEXT,
+                research_value TEXT
+            )
+        ''')
+    
+        cursor.executemany('''
+            INSERT INTO personnel 
             (service_number, name, rank, squadron, role, age_at_death, date_of_death, 
              service_start, service_end, aircraft_type, base_location, missions_completed, 
              awards, memorial_location, biography)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', person)
-    
-    # Insert aircraft data
-    aircraft_data = [
-        ('JB174', 'Avro Lancaster B.I', '97 Squadron RAF Pathfinders', '1943-09-29', '1943-11-15', 47, 'Patrick Cassidy (Flight Engineer), Crew of 7', 'Pathfinder target marking operations', 'Lost over Hanover, November 15, 1943'),
-        ('ME554', 'Avro Lancaster B.I', '101 Squadron', '1943-08-10', '1943-11-15', 28, 'Electronic countermeasures crew', 'Special duties operations', 'Lost in action'),
-        ('LK797', 'Handley Page Halifax B.III', '35 Squadron', '1943-12-01', '1944-06-12', 45, 'Pathfinder navigation crew', 'Target marking operations', 'Lost over France'),
-        ('DV372', 'Avro Lancaster B.I', '44 Squadron', '1943-05-20', '1943-09-08', 23, 'Standard bomber crew', 'Main force bombing operations', 'Lost over Germany'),
-        ('PB304', 'Avro Lancaster B.I', '460 Squadron RAAF', '1943-03-15', '1944-08-25', 67, 'Australian crew', 'Main force bombing operations', 'Lost over Germany'),
-        ('ED932', 'Avro Lancaster B.III', '617 Squadron', '1943-05-01', '1943-05-17', 1, 'Guy Gibson and crew', 'Operation Chastise (Dambusters)', 'Survived the war')
-    ]
+            ON CONFLICT(service_number) DO NOTHING
+        ''', PERSONNEL_SEED)
     
-    for aircraft in aircraft_data:
-        cursor.execute('''
-            INSERT OR REPLACE INTO aircraft 
+        cursor.executemany('''
+            INSERT INTO aircraft 
             (aircraft_id, aircraft_type, squadron, service_start, service_end, 
              missions_completed, crew_members, notable_operations, fate)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', aircraft)
+            ON CONFLICT(aircraft_id) DO NOTHING
+        ''', AIRCRAFT_SEED)
     
-    # Insert research archives data
-    archives_data = [
-        ('The National Archives (UK)', 'Government Archive', 'https://www.nationalarchives.gov.uk/', 'enquiry@nationalarchives.gov.uk', 'RAF service records, operational records, squadron histories', 'Free online access, paid research services available', 'Free browsing, £3.50 per download', 'Essential for official service records. Search AIR series for RAF records.'),
-        ('RAF Museum', 'Military Museum', 'https://www.rafmuseum.org.uk/', 'research@rafmuseum.org.uk', 'Aircraft histories, squadron records, personal collections', 'Email appointment required', 'Free research access', 'Excellent for squadron histories and aircraft technical details.'),
-        ('Commonwealth War Graves Commission', 'Memorial Database', 'https://www.cwgc.org/', 'general.enq@cwgc.org', 'Burial and memorial records', 'Free online database', 'Free', 'Essential for finding burial/memorial locations and basic service details.'),
-        ('Imperial War Museums', 'War Museum', 'https://www.iwm.org.uk/', 'collections@iwm.org.uk', 'Personal papers, photographs, oral histories', 'Appointment required for archives', 'Free research access', 'Valuable for personal stories and photographs.'),
-        ('Bomber Command Museum of Canada', 'Specialist Museum', 'https://bombercommandmuseum.ca/', 'info@bombercommandmuseum.ca', 'Canadian aircrew records, squadron histories', 'Email enquiries', 'Free research assistance', 'Essential for Commonwealth aircrew research.'),
-        ('Air Historical Branch (RAF)', 'Military Archive', 'https://www.raf.mod.uk/our-organisation/air-historical-branch/', 'Air-AHB-Enquiries@mod.gov.uk', 'Official RAF histories, operational records', 'Written enquiries only', 'Free for basic enquiries', 'Official RAF historical records and narratives.'),
-        ('Ancestry.com', 'Genealogy Database', 'https://www.ancestry.com/', 'support@ancestry.com', 'Military records, census data, family trees', 'Subscription required', '£12.95-£24.95 per month', 'Good for family background and military service records.'),
-        ('FindMyPast', 'Genealogy Database', 'https://www.findmypast.com/', 'help@findmypast.com', 'Military records, newspapers, directories', 'Subscription required', '£12.95-£18.95 per month', 'Strong collection of military records and local newspapers.'),
-        ('Forces War Records', 'Military Database', 'https://www.forces-war-records.co.uk/', 'help@forces-war-records.co.uk', 'Military service records, medal rolls', 'Subscription required', '£9.95-£13.95 per month', 'Specialized military records database.'),
-        ('Runnymede Memorial Archive', 'Memorial Archive', 'https://www.cwgc.org/find-war-dead/cemetery/2000300/runnymede-memorial/', 'general.enq@cwgc.org', 'RAF aircrew with no known grave', 'Free online access', 'Free', 'Essential for aircrew lost over Europe with no known grave.')
-    ]
-    
-    for archive in archives_data:
-        cursor.execute('''
-            INSERT OR REPLACE INTO research_archives 
+        # Archives and sources have no natural key, so a re-seed replaces them wholesale
+        cursor.execute("DELETE FROM research_archives")
+        cursor.executemany('''
+            INSERT INTO research_archives 
             (archive_name, archive_type, website_url, contact_info, specialization, 
              access_requirements, cost_info, research_tips)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', archive)
+        ''', ARCHIVES_SEED)
     
-    # Insert research sources data
-    sources_data = [
-        ('RAF Service Records (AIR 79)', 'Primary Source', 'Individual service records for RAF personnel', 'https://discovery.nationalarchives.gov.uk/', 'Online at The National Archives', '£3.50 per download', 'Essential - contains complete service history'),
-        ('Squadron Operational Record Books', 'Primary Source', 'Daily records of squadron activities and operations', 'https://discovery.nationalarchives.gov.uk/', 'Online at The National Archives', 'Free to view, £3.50 to download', 'Vital for understanding daily operations and specific missions'),
-        ('Combat Reports', 'Primary Source', 'Individual mission reports and combat accounts', 'https://discovery.nationalarchives.gov.uk/', 'Online at The National Archives', 'Free to view, £3.50 to download', 'Detailed accounts of specific operations and encounters'),
-        ('Medal Citation Records', 'Primary Source', 'Official citations for gallantry and service medals', 'https://discovery.nationalarchives.gov.uk/', 'Online at The National Archives', 'Free to view, £3.50 to download', 'Provides details of heroic actions and service recognition'),
-        ('RAF Casualty Cards', 'Primary Source', 'Death and casualty notification cards', 'https://discovery.nationalarchives.gov.uk/', 'Online at The National Archives', 'Free to view, £3.50 to download', 'Essential for casualty details and circumstances'),
-        ('Local Newspapers', 'Secondary Source', 'Contemporary newspaper reports and obituaries', 'https://www.britishnewspaperarchive.co.uk/', 'British Newspaper Archive (subscription)', '£12.95 per month', 'Valuable for local context and family reactions'),
-        ('RAF Museum Collections', 'Mixed Sources', 'Aircraft records, photographs, personal collections', 'https://www.rafmuseum.org.uk/', 'Email appointment required', 'Free research access', 'Excellent for technical details and personal stories'),
-        ('Bomber Command Association Records', 'Secondary Source', 'Veteran accounts and squadron reunions', 'Various local archives', 'Contact local archives', 'Varies', 'Personal accounts and post-war connections'),
-        ('Aircraft Loss Cards', 'Primary Source', 'Official records of aircraft losses and crew fates', 'https://discovery.nationalarchives.gov.uk/', 'Online at The National Archives', 'Free to view, £3.50 to download', 'Critical for understanding aircraft losses and crew casualties'),
-        ('Station Records', 'Primary Source', 'Records of individual RAF bases and their operations', 'https://discovery.nationalarchives.gov.uk/', 'Online at The National Archives', 'Free to view, £3.50 to download', 'Provides context for base operations and personnel')
-    ]
-    
-    for source in sources_data:
-        cursor.execute('''
-            INSERT OR REPLACE INTO research_sources 
+        cursor.execute("DELETE FROM research_sources")
+        cursor.executemany('''
+            INSERT INTO research_sources 
             (source_name, source_type, description, url, access_method, cost, research_value)
             VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', source)
+        ''', SOURCES_SEED)
+
+def init_database():
+    """Initialize the database with comprehensive RAF Bomber Command data"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    # page_size only takes effect on a new database, so it goes before anything is written
+    conn.execute("PRAGMA page_size = 32768")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = {SQL_PAGE_CACHE_SIZE}")
+    cursor = conn.cursor()
     
-    conn.commit()
-    conn.close()
+    if not database_is_seeded(cursor):
+        seed_database(conn)
+    
+    # Secondary indexes, created here too so databases seeded before they existed pick them up
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_personnel_squadron ON personnel(squadron)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_personnel_name ON personnel(name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_aircraft_squadron ON aircraft(squadron)")
     
     # Verify Patrick Cassidy memorial record
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
     cursor.execute("SELECT name, service_number FROM personnel WHERE service_number = '1802082'")
     patrick_record = cursor.fetchone()
+    
+    conn.execute("PRAGMA optimize")
+    conn.backup(memory_database)
     conn.close()
     
     if patrick_record:
@@ -206,8 +323,23 @@ def init_database():
 # Initialize database on startup
 init_database()
 
+def find_person(query):
+    """First person, by name, whose name or service number contains the query"""
+    needle = query.lower()
+    for person in PERSONNEL.values():
+        if needle in person['name'].lower() or needle in person['service_number'].lower():
+            return person
+    return None
+
 def get_ai_research_guidance(research_query, person_data=None):
     """Generate AI research guidance like a professional historian"""
+    service_number = person_data.get('service_number') if person_data else None
+    return cached_research_guidance(research_query.lower().strip(), service_number)
+
+@lru_cache(maxsize=256)
+def cached_research_guidance(research_query, service_number):
+    """Guidance for a normalised query and optional seeded person, memoised per pair"""
+    person_data = PERSONNEL.get(service_number)
     
     # If OpenAI is not available, provide comprehensive fallback guidance
     if not OPENAI_API_KEY:
@@ -220,80 +352,8 @@ def get_ai_research_guidance(research_query, person_data=None):
     except Exception as e:
         return generate_fallback_research_guidance(research_query, person_data)
 
-def generate_professional_research_guidance(research_query, person_data=None):
-    """Generate professional historian-level research guidance"""
-    
-    guidance = {
-        "research_strategy": "",
-        "primary_sources": [],
-        "secondary_sources": [],
-        "archival_signposts": [],
-        "research_pathway": [],
-        "expert_tips": [],
-        "estimated_timeline": "",
-        "potential_challenges": [],
-        "success_indicators": []
-    }
-    
-    # Analyze the research query
-    query_lower = research_query.lower()
-    
-    if person_data:
-        # Personalized guidance based on known information
-        name = person_data.get('name', 'Unknown')
-        service_number = person_data.get('service_number', 'Unknown')
-        squadron = person_data.get('squadron', 'Unknown')
-        
-        guidance["research_strategy"] = f"""
-        **Comprehensive Research Strategy for {name}**
-        
-        Based on the available information about {name} (Service Number: {service_number}, {squadron}), 
-        I recommend a multi-layered approach combining official records, squadron histories, and personal accounts.
-        
-        **Phase 1: Official Records Foundation (Weeks 1-2)**
-        Start with The National Archives to establish the official service record and squadron operational records.
-        
-        **Phase 2: Contextual Research (Weeks 3-4)**
-        Expand into squadron histories, base records, and operational context.
-        
-        **Phase 3: Personal Dimension (Weeks 5-6)**
-        Search for personal accounts, photographs, and family connections.
-        """
-        
-        guidance["primary_sources"] = [
-            f"RAF Service Record (AIR 79) for Service Number {service_number}",
-            f"{squadron} Operational Record Book (AIR 27 series)",
-            f"Combat Reports for {squadron} operations",
-            "Aircraft Loss Cards if applicable",
-            "Medal Citation Records if decorated"
-        ]
-        
-        guidance["archival_signposts"] = [
-            {
-                "archive": "The National Archives",
-                "priority": "Essential",
-                "search_terms": f"Service Number {service_number}, {name}, {squadron}",
-                "specific_series": "AIR 79 (service records), AIR 27 (squadron records)",
-                "url": "https://discovery.nationalarchives.gov.uk/"
-            },
-            {
-                "archive": "RAF Museum",
-                "priority": "High",
-                "search_terms": f"{squadron} history, aircraft records",
-                "contact": "research@rafmuseum.org.uk",
-                "url": "https://www.rafmuseum.org.uk/"
-            },
-            {
-                "archive": "Commonwealth War Graves Commission",
-                "priority": "Essential",
-                "search_terms": f"{name}, Service Number {service_number}",
-                "url": "https://www.cwgc.org/"
-            }
-        ]
-        
-    else:
-        # General research guidance
-        guidance["research_strategy"] = """
+# Professional guidance text; the personalised strings are filled in per person with str.format_map
+GENERAL_RESEARCH_STRATEGY = """
         **General RAF Bomber Command Research Strategy**
         
         For researching RAF Bomber Command personnel, follow this systematic approach:
@@ -314,8 +374,74 @@ def generate_professional_research_guidance(research_query, person_data=None):
         - Search for photographs and personal accounts
         - Connect with family members and veteran associations
         """
-    
-    guidance["research_pathway"] = [
+
+PERSONAL_RESEARCH_STRATEGY = """
+        **Comprehensive Research Strategy for {name}**
+        
+        Based on the available information about {name} (Service Number: {service_number}, {squadron}), 
+        I recommend a multi-layered approach combining official records, squadron histories, and personal accounts.
+        
+        **Phase 1: Official Records Foundation (Weeks 1-2)**
+        Start with The National Archives to establish the official service record and squadron operational records.
+        
+        **Phase 2: Contextual Research (Weeks 3-4)**
+        Expand into squadron histories, base records, and operational context.
+        
+        **Phase 3: Personal Dimension (Weeks 5-6)**
+        Search for personal accounts, photographs, and family connections.
+        """
+
+PERSONAL_PRIMARY_SOURCES = (
+    "RAF Service Record (AIR 79) for Service Number {service_number}",
+    "{squadron} Operational Record Book (AIR 27 series)",
+    "Combat Reports for {squadron} operations",
+    "Aircraft Loss Cards if applicable",
+    "Medal Citation Records if decorated"
+)
+
+PERSONAL_ARCHIVAL_SIGNPOSTS = (
+    {
+        "archive": "The National Archives",
+        "priority": "Essential",
+        "search_terms": "Service Number {service_number}, {name}, {squadron}",
+        "specific_series": "AIR 79 (service records), AIR 27 (squadron records)",
+        "url": "https://discovery.nationalarchives.gov.uk/"
+    },
+    {
+        "archive": "RAF Museum",
+        "priority": "High",
+        "search_terms": "{squadron} history, aircraft records",
+        "contact": "research@rafmuseum.org.uk",
+        "url": "https://www.rafmuseum.org.uk/"
+    },
+    {
+        "archive": "Commonwealth War Graves Commission",
+        "priority": "Essential",
+        "search_terms": "{name}, Service Number {service_number}",
+        "url": "https://www.cwgc.org/"
+    }
+)
+
+def personal_signposts(person):
+    """Archival signposts filled in with a person's name, service number and squadron"""
+    return [
+        {key: value.format_map(person) for key, value in signpost.items()}
+        for signpost in PERSONAL_ARCHIVAL_SIGNPOSTS
+    ]
+
+# Signposts for everyone in the seed data, built once and shared by their responses
+ARCHIVAL_SIGNPOSTS_BY_SERVICE_NUMBER = {
+    service_number: personal_signposts(person)
+    for service_number, person in PERSONNEL.items()
+}
+
+# Static skeleton shared by every professional guidance response
+GUIDANCE_TEMPLATE = {
+    "research_strategy": GENERAL_RESEARCH_STRATEGY,
+    "primary_sources": (),
+    "secondary_sources": (),
+    "archival_signposts": (),
+    "research_pathway": (
         {
             "step": 1,
             "title": "Establish Basic Facts",
@@ -351,9 +477,8 @@ def generate_professional_research_guidance(research_query, person_data=None):
             "sources": ["Imperial War Museums", "Local archives", "Family collections"],
             "estimated_time": "1-2 weeks"
         }
-    ]
-    
-    guidance["expert_tips"] = [
+    ),
+    "expert_tips": (
         "Always start with the Commonwealth War Graves Commission database - it's free and provides essential basic information",
         "RAF service records (AIR 79) are the gold standard - worth the £3.50 cost for complete service history",
         "Squadron Operational Record Books often contain daily entries about specific personnel and operations",
@@ -362,26 +487,60 @@ def generate_professional_research_guidance(research_query, person_data=None):
         "Medal citations provide detailed accounts of specific heroic actions",
         "Station records provide context about base life and operations",
         "Contact the RAF Museum early - their researchers are extremely knowledgeable and helpful"
-    ]
-    
-    guidance["estimated_timeline"] = "4-8 weeks for comprehensive research, depending on availability of records and complexity of service history"
-    
-    guidance["potential_challenges"] = [
+    ),
+    "estimated_timeline": "4-8 weeks for comprehensive research, depending on availability of records and complexity of service history",
+    "potential_challenges": (
         "Some records may be closed or restricted",
         "Handwritten documents can be difficult to read",
         "Records may be incomplete or damaged",
         "Family information may be limited if no surviving relatives",
         "Some squadron records may be missing for certain periods"
-    ]
-    
-    guidance["success_indicators"] = [
+    ),
+    "success_indicators": (
         "Complete service record obtained",
         "Squadron operational context understood",
         "Specific missions and operations identified",
         "Personal photographs or accounts located",
         "Family connections established",
         "Memorial or burial location confirmed"
-    ]
+    )
+}
+
+# Pre-encoded JSON for each template section, reused whenever a response still shares it
+GUIDANCE_TEMPLATE_JSON = {
+    key: orjson.dumps(value)
+    for key, value in GUIDANCE_TEMPLATE.items()
+}
+
+def guidance_json(guidance):
+    """Serialise guidance, encoding only the sections that differ from GUIDANCE_TEMPLATE"""
+    parts = []
+    for key, value in guidance.items():
+        if value is GUIDANCE_TEMPLATE.get(key):
+            encoded = GUIDANCE_TEMPLATE_JSON[key]
+        else:
+            encoded = orjson.dumps(value)
+        parts.append(orjson.dumps(key) + b':' + encoded)
+    return b'{' + b','.join(parts) + b'}'
+
+def generate_professional_research_guidance(research_query, person_data=None):
+    """Generate professional historian-level research guidance"""
+    
+    guidance = {**GUIDANCE_TEMPLATE}
+    
+    if person_data:
+        # Personalized guidance based on known information
+        person = {
+            'name': person_data.get('name', 'Unknown'),
+            'service_number': person_data.get('service_number', 'Unknown'),
+            'squadron': person_data.get('squadron', 'Unknown')
+        }
+        
+        guidance["research_strategy"] = PERSONAL_RESEARCH_STRATEGY.format_map(person)
+        guidance["primary_sources"] = [source.format_map(person) for source in PERSONAL_PRIMARY_SOURCES]
+        guidance["archival_signposts"] = (
+            ARCHIVAL_SIGNPOSTS_BY_SERVICE_NUMBER.get(person['service_number']) or personal_signposts(person)
+        )
     
     return guidance
 
@@ -427,661 +586,53 @@ def generate_fallback_research_guidance(research_query, person_data=None):
         "estimated_timeline": "4-8 weeks for comprehensive research"
     }
 
-# HTML template for the AI Research Assistant interface
-HTML_TEMPLATE = '''
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>RAF Bomber Command - AI Historical Research Assistant</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Georgia', serif;
-            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 50%, #0f3460 100%);
-            color: #f4f4f4;
-            min-height: 100vh;
-        }
-        
-        .header {
-            text-align: center;
-            padding: 2rem 1rem;
-            background: rgba(0, 0, 0, 0.3);
-            border-bottom: 3px solid #d4af37;
-        }
-        
-        .raf-badge {
-            width: 80px;
-            height: 80px;
-            background: linear-gradient(45deg, #d4af37, #f4e87c);
-            border-radius: 50%;
-            margin: 0 auto 1rem;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            box-shadow: 0 4px 15px rgba(212, 175, 55, 0.3);
-        }
-        
-        .raf-badge::before {
-            content: "★";
-            font-size: 2.5rem;
-            color: #1a1a2e;
-            font-weight: bold;
-        }
-        
-        h1 {
-            font-size: 2.5rem;
-            color: #d4af37;
-            margin-bottom: 0.5rem;
-            text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.5);
-        }
-        
-        .subtitle {
-            font-size: 1.2rem;
-            color: #b8860b;
-            font-style: italic;
-            margin-bottom: 1rem;
-        }
-        
-        .banner {
-            background: linear-gradient(45deg, #d4af37, #b8860b);
-            color: #1a1a2e;
-            padding: 0.8rem 2rem;
-            border-radius: 25px;
-            font-weight: bold;
-            display: inline-block;
-            box-shadow: 0 4px 15px rgba(212, 175, 55, 0.3);
-        }
-        
-        .nav-tabs {
-            display: flex;
-            justify-content: center;
-            gap: 1rem;
-            padding: 2rem 1rem;
-            flex-wrap: wrap;
-        }
-        
-        .nav-tab {
-            background: linear-gradient(45deg, #2c3e50, #34495e);
-            color: #d4af37;
-            border: 2px solid #d4af37;
-            padding: 1rem 2rem;
-            border-radius: 10px;
-            cursor: pointer;
-            font-size: 1rem;
-            font-weight: bold;
-            transition: all 0.3s ease;
-            text-decoration: none;
-            display: inline-block;
-        }
-        
-        .nav-tab:hover, .nav-tab.active {
-            background: linear-gradient(45deg, #d4af37, #b8860b);
-            color: #1a1a2e;
-            transform: translateY(-2px);
-            box-shadow: 0 6px 20px rgba(212, 175, 55, 0.4);
-        }
-        
-        .content-section {
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 2rem;
-        }
-        
-        .memorial-quote {
-            text-align: center;
-            font-style: italic;
-            color: #d4af37;
-            font-size: 1.2rem;
-            margin: 3rem 0;
-            padding: 2rem;
-            background: rgba(0, 0, 0, 0.3);
-            border-radius: 15px;
-            border: 2px solid #d4af37;
-        }
-        
-        .research-container {
-            background: rgba(44, 62, 80, 0.9);
-            border: 2px solid #d4af37;
-            border-radius: 15px;
-            padding: 2rem;
-            margin-bottom: 2rem;
-        }
-        
-        .research-input {
-            width: 100%;
-            padding: 1rem;
-            border: 2px solid #d4af37;
-            border-radius: 10px;
-            background: rgba(26, 26, 46, 0.8);
-            color: #f4f4f4;
-            font-size: 1.1rem;
-            margin-bottom: 1rem;
-            min-height: 100px;
-            resize: vertical;
-        }
-        
-        .research-btn {
-            background: linear-gradient(45deg, #d4af37, #b8860b);
-            color: #1a1a2e;
-            border: none;
-            padding: 1rem 2rem;
-            border-radius: 10px;
-            font-size: 1.1rem;
-            font-weight: bold;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            margin-right: 1rem;
-            margin-bottom: 1rem;
-        }
-        
-        .research-btn:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 6px 20px rgba(212, 175, 55, 0.4);
-        }
-        
-        .guidance-container {
-            margin-top: 2rem;
-        }
-        
-        .guidance-section {
-            background: rgba(44, 62, 80, 0.9);
-            border: 2px solid #d4af37;
-            border-radius: 15px;
-            padding: 2rem;
-            margin-bottom: 2rem;
-            box-shadow: 0 8px 25px rgba(0, 0, 0, 0.3);
-        }
-        
-        .guidance-title {
-            color: #d4af37;
-            font-size: 1.5rem;
-            margin-bottom: 1rem;
-            font-weight: bold;
-            display: flex;
-            align-items: center;
-            gap: 0.5rem;
-        }
-        
-        .guidance-content {
-            line-height: 1.6;
-        }
-        
-        .pathway-step {
-            background: rgba(26, 26, 46, 0.5);
-            padding: 1rem;
-            border-radius: 8px;
-            border-left: 4px solid #d4af37;
-            margin-bottom: 1rem;
-        }
-        
-        .pathway-step-number {
-            background: #d4af37;
-            color: #1a1a2e;
-            width: 30px;
-            height: 30px;
-            border-radius: 50%;
-            display: inline-flex;
-            align-items: center;
-            justify-content: center;
-            font-weight: bold;
-            margin-right: 1rem;
-        }
-        
-        .archive-card {
-            background: rgba(26, 26, 46, 0.5);
-            padding: 1.5rem;
-            border-radius: 10px;
-            border: 1px solid #d4af37;
-            margin-bottom: 1rem;
-        }
-        
-        .archive-name {
-            color: #d4af37;
-            font-size: 1.2rem;
-            font-weight: bold;
-            margin-bottom: 0.5rem;
-        }
-        
-        .archive-link {
-            color: #87ceeb;
-            text-decoration: none;
-            font-weight: bold;
-        }
-        
-        .archive-link:hover {
-            color: #d4af37;
-        }
-        
-        .tip-item {
-            background: rgba(26, 26, 46, 0.3);
-            padding: 1rem;
-            border-radius: 8px;
-            border-left: 4px solid #d4af37;
-            margin-bottom: 0.8rem;
-        }
-        
-        .loading {
-            text-align: center;
-            color: #d4af37;
-            font-style: italic;
-            padding: 2rem;
-        }
-        
-        @media (max-width: 768px) {
-            .nav-tabs {
-                flex-direction: column;
-                align-items: center;
-            }
-            
-            .research-btn {
-                width: 100%;
-                margin-right: 0;
-            }
-        }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <div class="raf-badge"></div>
-        <h1>RAF Bomber Command Research Database</h1>
-        <p class="subtitle">AI Historical Research Assistant</p>
-        <div class="banner">🤖 Professional Historian Guidance - Like Hiring a Real Researcher</div>
-    </div>
-    
-    <div class="nav-tabs">
-        <button class="nav-tab active" onclick="showSection('research')">🔍 AI Research Assistant</button>
-        <button class="nav-tab" onclick="showSection('archives')">📚 Archive Directory</button>
-        <button class="nav-tab" onclick="showSection('sources')">📄 Source Guide</button>
-        <button class="nav-tab" onclick="showSection('database')">🎖️ Search Database</button>
-    </div>
-    
-    <div id="research-section" class="content-section">
-        <div class="memorial-quote">
-            "Their memory lives on - preserved in code, honored in history, accessible to all, never to be forgotten."
-        </div>
-        
-        <div class="research-container">
-            <h2 style="color: #d4af37; margin-bottom: 1rem;">🤖 AI Historical Research Assistant</h2>
-            <p style="margin-bottom: 1rem;">Describe who you're researching or what information you're looking for. I'll provide professional historian-level guidance, research pathways, and archival signposting.</p>
-            
-            <textarea id="researchQuery" class="research-input" placeholder="Example: I'm researching my grandfather who served with RAF Bomber Command. His name was John Smith and I think he was with 617 Squadron. I'd like to find his service record and any information about his missions..."></textarea>
-            
-            <button class="research-btn" onclick="getResearchGuidance()">🔍 Get Research Guidance</button>
-            <button class="research-btn" onclick="researchPatrickCassidy()">🎖️ Research Patrick Cassidy</button>
-            <button class="research-btn" onclick="researchGuyGibson()">⭐ Research Guy Gibson</button>
-        </div>
-        
-        <div id="guidance" class="guidance-container"></div>
-    </div>
-    
-    <div id="archives-section" class="content-section" style="display: none;">
-        <h2 style="color: #d4af37; text-align: center; margin-bottom: 2rem;">📚 Research Archive Directory</h2>
-        <div id="archives-list"></div>
-    </div>
-    
-    <div id="sources-section" class="content-section" style="display: none;">
-        <h2 style="color: #d4af37; text-align: center; margin-bottom: 2rem;">📄 Research Source Guide</h2>
-        <div id="sources-list"></div>
-    </div>
-    
-    <div id="database-section" class="content-section" style="display: none;">
-        <h2 style="color: #d4af37; text-align: center; margin-bottom: 2rem;">🎖️ Search Personnel Database</h2>
-        <div class="research-container">
-            <input type="text" id="searchInput" class="research-input" style="min-height: auto;" placeholder="Search by name, service number, or squadron...">
-            <button class="research-btn" onclick="searchPersonnel()">🔍 Search</button>
-        </div>
-        <div id="search-results"></div>
-    </div>
-    
-    <script>
-        function showSection(sectionName) {
-            // Hide all sections
-            const sections = ['research', 'archives', 'sources', 'database'];
-            sections.forEach(section => {
-                document.getElementById(section + '-section').style.display = 'none';
-            });
-            
-            // Remove active class from all tabs
-            document.querySelectorAll('.nav-tab').forEach(tab => {
-                tab.classList.remove('active');
-            });
-            
-            // Show selected section
-            document.getElementById(sectionName + '-section').style.display = 'block';
-            
-            // Add active class to clicked tab
-            event.target.classList.add('active');
-            
-            // Load section-specific data
-            if (sectionName === 'archives') {
-                loadArchives();
-            } else if (sectionName === 'sources') {
-                loadSources();
-            }
-        }
-        
-        function getResearchGuidance() {
-            const query = document.getElementById('researchQuery').value;
-            if (!query.trim()) {
-                alert('Please enter your research question or describe who you\'re researching.');
-                return;
-            }
-            
-            const guidanceContainer = document.getElementById('guidance');
-            guidanceContainer.innerHTML = '<div class="loading">🤖 Analyzing your research needs and preparing professional guidance...</div>';
-            
-            fetch('/api/ai/research-guidance', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({ query: query })
-            })
-            .then(response => response.json())
-            .then(data => {
-                displayResearchGuidance(data);
-            })
-            .catch(error => {
-                console.error('Error:', error);
-                guidanceContainer.innerHTML = '<p style="color: #dc3545;">Error getting research guidance</p>';
-            });
-        }
-        
-        function researchPatrickCassidy() {
-            document.getElementById('researchQuery').value = 'I want to research Sergeant Patrick Cassidy, Service Number 1802082, who served with 97 Squadron RAF Pathfinders as a Flight Engineer. He was lost on November 15, 1943.';
-            getResearchGuidance();
-        }
-        
-        function researchGuyGibson() {
-            document.getElementById('researchQuery').value = 'I want to research Wing Commander Guy Gibson, who led the famous Dambusters raid with 617 Squadron.';
-            getResearchGuidance();
-        }
-        
-        function displayResearchGuidance(guidance) {
-            const container = document.getElementById('guidance');
-            let html = '';
-            
-            // Research Strategy
-            if (guidance.research_strategy) {
-                html += `
-                    <div class="guidance-section">
-                        <div class="guidance-title">🎯 Research Strategy</div>
-                        <div class="guidance-content">${guidance.research_strategy.replace(/\\n/g, '<br>')}</div>
-                    </div>
-                `;
-            }
-            
-            // Research Pathway
-            if (guidance.research_pathway && guidance.research_pathway.length > 0) {
-                html += `
-                    <div class="guidance-section">
-                        <div class="guidance-title">🗺️ Research Pathway</div>
-                        <div class="guidance-content">
-                `;
-                
-                guidance.research_pathway.forEach((step, index) => {
-                    if (typeof step === 'object') {
-                        html += `
-                            <div class="pathway-step">
-                                <span class="pathway-step-number">${step.step}</span>
-                                <strong>${step.title}</strong><br>
-                                ${step.description}<br>
-                                <em>Sources: ${step.sources ? step.sources.join(', ') : 'Various'}</em><br>
-                                <em>Estimated time: ${step.estimated_time || 'Varies'}</em>
-                            </div>
-                        `;
-                    } else {
-                        html += `
-                            <div class="pathway-step">
-                                <span class="pathway-step-number">${index + 1}</span>
-                                ${step}
-                            </div>
-                        `;
-                    }
-                });
-                
-                html += `
-                        </div>
-                    </div>
-                `;
-            }
-            
-            // Archival Signposts
-            if (guidance.archival_signposts && guidance.archival_signposts.length > 0) {
-                html += `
-                    <div class="guidance-section">
-                        <div class="guidance-title">📚 Archival Signposts</div>
-                        <div class="guidance-content">
-                `;
-                
-                guidance.archival_signposts.forEach(archive => {
-                    if (typeof archive === 'object') {
-                        html += `
-                            <div class="archive-card">
-                                <div class="archive-name">${archive.archive} (${archive.priority} Priority)</div>
-                                <p><strong>Search terms:</strong> ${archive.search_terms || 'General search'}</p>
-                                ${archive.specific_series ? `<p><strong>Specific series:</strong> ${archive.specific_series}</p>` : ''}
-                                ${archive.contact ? `<p><strong>Contact:</strong> ${archive.contact}</p>` : ''}
-                                <p><a href="${archive.url}" target="_blank" class="archive-link">Visit Archive →</a></p>
-                            </div>
-                        `;
-                    } else {
-                        html += `<div class="archive-card">${archive}</div>`;
-                    }
-                });
-                
-                html += `
-                        </div>
-                    </div>
-                `;
-            }
-            
-            // Expert Tips
-            if (guidance.expert_tips && guidance.expert_tips.length > 0) {
-                html += `
-                    <div class="guidance-section">
-                        <div class="guidance-title">💡 Expert Tips</div>
-                        <div class="guidance-content">
-                `;
-                
-                guidance.expert_tips.forEach(tip => {
-                    html += `<div class="tip-item">💡 ${tip}</div>`;
-                });
-                
-                html += `
-                        </div>
-                    </div>
-                `;
-            }
-            
-            // Timeline and Challenges
-            if (guidance.estimated_timeline || guidance.potential_challenges) {
-                html += `
-                    <div class="guidance-section">
-                        <div class="guidance-title">⏱️ Timeline & Considerations</div>
-                        <div class="guidance-content">
-                `;
-                
-                if (guidance.estimated_timeline) {
-                    html += `<p><strong>Estimated Timeline:</strong> ${guidance.estimated_timeline}</p>`;
-                }
-                
-                if (guidance.potential_challenges && guidance.potential_challenges.length > 0) {
-                    html += `<p><strong>Potential Challenges:</strong></p><ul>`;
-                    guidance.potential_challenges.forEach(challenge => {
-                        html += `<li>${challenge}</li>`;
-                    });
-                    html += `</ul>`;
-                }
-                
-                html += `
-                        </div>
-                    </div>
-                `;
-            }
-            
-            container.innerHTML = html;
-        }
-        
-        function loadArchives() {
-            fetch('/api/archives')
-            .then(response => response.json())
-            .then(data => {
-                const container = document.getElementById('archives-list');
-                let html = '';
-                
-                data.archives.forEach(archive => {
-                    html += `
-                        <div class="archive-card">
-                            <div class="archive-name">${archive.archive_name}</div>
-                            <p><strong>Type:</strong> ${archive.archive_type}</p>
-                            <p><strong>Specialization:</strong> ${archive.specialization}</p>
-                            <p><strong>Access:</strong> ${archive.access_requirements}</p>
-                            <p><strong>Cost:</strong> ${archive.cost_info}</p>
-                            <p><strong>Research Tips:</strong> ${archive.research_tips}</p>
-                            <p><a href="${archive.website_url}" target="_blank" class="archive-link">Visit Archive →</a></p>
-                            ${archive.contact_info ? `<p><strong>Contact:</strong> ${archive.contact_info}</p>` : ''}
-                        </div>
-                    `;
-                });
-                
-                container.innerHTML = html;
-            })
-            .catch(error => {
-                console.error('Error:', error);
-                document.getElementById('archives-list').innerHTML = '<p style="color: #dc3545;">Error loading archives</p>';
-            });
-        }
-        
-        function loadSources() {
-            fetch('/api/sources')
-            .then(response => response.json())
-            .then(data => {
-                const container = document.getElementById('sources-list');
-                let html = '';
-                
-                data.sources.forEach(source => {
-                    html += `
-                        <div class="archive-card">
-                            <div class="archive-name">${source.source_name}</div>
-                            <p><strong>Type:</strong> ${source.source_type}</p>
-                            <p><strong>Description:</strong> ${source.description}</p>
-                            <p><strong>Access:</strong> ${source.access_method}</p>
-                            <p><strong>Cost:</strong> ${source.cost}</p>
-                            <p><strong>Research Value:</strong> ${source.research_value}</p>
-                            ${source.url ? `<p><a href="${source.url}" target="_blank" class="archive-link">Access Source →</a></p>` : ''}
-                        </div>
-                    `;
-                });
-                
-                container.innerHTML = html;
-            })
-            .catch(error => {
-                console.error('Error:', error);
-                document.getElementById('sources-list').innerHTML = '<p style="color: #dc3545;">Error loading sources</p>';
-            });
-        }
-        
-        function searchPersonnel() {
-            const searchTerm = document.getElementById('searchInput').value;
-            
-            fetch('/api/personnel/search', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({ search_term: searchTerm })
-            })
-            .then(response => response.json())
-            .then(data => {
-                displaySearchResults(data.results);
-            })
-            .catch(error => {
-                console.error('Error:', error);
-                document.getElementById('search-results').innerHTML = '<p style="color: #dc3545;">Error searching database</p>';
-            });
-        }
-        
-        function displaySearchResults(results) {
-            const container = document.getElementById('search-results');
-            
-            if (results.length === 0) {
-                container.innerHTML = '<p style="color: #dc3545;">No records found</p>';
-                return;
-            }
-            
-            let html = '';
-            results.forEach(person => {
-                html += `
-                    <div class="archive-card">
-                        <div class="archive-name">${person.name}</div>
-                        <p><strong>Service Number:</strong> ${person.service_number}</p>
-                        <p><strong>Rank:</strong> ${person.rank}</p>
-                        <p><strong>Squadron:</strong> ${person.squadron}</p>
-                        <p><strong>Role:</strong> ${person.role}</p>
-                        <p><strong>Memorial Location:</strong> ${person.memorial_location}</p>
-                        <button class="research-btn" onclick="researchPerson('${person.name}', '${person.service_number}', '${person.squadron}')">🔍 Get Research Guidance</button>
-                    </div>
-                `;
-            });
-            
-            container.innerHTML = html;
-        }
-        
-        function researchPerson(name, serviceNumber, squadron) {
-            document.getElementById('researchQuery').value = `I want to research ${name}, Service Number ${serviceNumber}, who served with ${squadron}.`;
-            showSection('research');
-            getResearchGuidance();
-        }
-        
-        // Allow Enter key to trigger search
-        document.getElementById('searchInput').addEventListener('keypress', function(e) {
-            if (e.key === 'Enter') {
-                searchPersonnel();
-            }
-        });
-    </script>
-</body>
-</html>
-'''
+def load_frontend():
+    """Read the interface page once; returns (html, gzip html, ETag from its SHA-1)"""
+    with open(os.path.join(app.static_folder, FRONTEND_PAGE), 'rb') as f:
+        html = f.read()
+    return html, gzip.compress(html, compresslevel=9), hashlib.sha1(html).hexdigest()
+
+FRONTEND_HTML, FRONTEND_HTML_GZ, FRONTEND_ETAG = load_frontend()
 
 @app.route('/')
 def index():
     """Serve the main AI Research Assistant interface"""
-    return render_template_string(HTML_TEMPLATE)
+    # The gzip body is a separate representation, so it gets its own strong ETag
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = Response(FRONTEND_HTML_GZ, mimetype='text/html')
+        response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(FRONTEND_ETAG + '-gz')
+    else:
+        response = Response(FRONTEND_HTML, mimetype='text/html')
+        response.set_etag(FRONTEND_ETAG)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.max_age = FRONTEND_MAX_AGE
+    return response.make_conditional(request)
 
 @app.route('/api/health')
 def health_check():
     """Health check endpoint"""
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
-        # Count records in each table
-        cursor.execute("SELECT COUNT(*) FROM personnel")
-        personnel_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM aircraft")
-        aircraft_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM research_archives")
-        archives_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM research_sources")
-        sources_count = cursor.fetchone()[0]
-        
-        # Verify Patrick Cassidy memorial
-        cursor.execute("SELECT name FROM personnel WHERE service_number = '1802082'")
-        patrick_memorial = cursor.fetchone()
-        
-        conn.close()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            
+            # Count records in each table
+            cursor.execute("SELECT COUNT(*) FROM personnel")
+            personnel_count = cursor.fetchone()[0]
+            
+            cursor.execute("SELECT COUNT(*) FROM aircraft")
+            aircraft_count = cursor.fetchone()[0]
+            
+            cursor.execute("SELECT COUNT(*) FROM research_archives")
+            archives_count = cursor.fetchone()[0]
+            
+            cursor.execute("SELECT COUNT(*) FROM research_sources")
+            sources_count = cursor.fetchone()[0]
+            
+            # Verify Patrick Cassidy memorial
+            cursor.execute("SELECT name FROM personnel WHERE service_number = '1802082'")
+            patrick_memorial = cursor.fetchone()
         
         return jsonify({
             'status': 'healthy',
@@ -1109,40 +660,12 @@ def ai_research_guidance():
             return jsonify({'error': 'Research query is required'}), 400
         
         # Check if query mentions a specific person in our database
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
-        # Search for person in database
-        cursor.execute('''
-            SELECT service_number, name, rank, squadron, role, age_at_death, 
-                   date_of_death, memorial_location, biography
-            FROM personnel 
-            WHERE name LIKE ? OR service_number LIKE ?
-            ORDER BY name
-            LIMIT 1
-        ''', (f'%{query}%', f'%{query}%'))
-        
-        person_data = None
-        result = cursor.fetchone()
-        if result:
-            person_data = {
-                'service_number': result[0],
-                'name': result[1],
-                'rank': result[2],
-                'squadron': result[3],
-                'role': result[4],
-                'age_at_death': result[5],
-                'date_of_death': result[6],
-                'memorial_location': result[7],
-                'biography': result[8]
-            }
-        
-        conn.close()
+        person_data = find_person(query)
         
         # Get AI research guidance
         guidance = get_ai_research_guidance(query, person_data)
         
-        return jsonify(guidance)
+        return Response(guidance_json(guidance), mimetype='application/json')
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1151,30 +674,7 @@ def ai_research_guidance():
 def get_archives():
     """Get research archives directory"""
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT archive_name, archive_type, website_url, contact_info, 
-                   specialization, access_requirements, cost_info, research_tips
-            FROM research_archives
-            ORDER BY archive_name
-        ''')
-        
-        archives = []
-        for row in cursor.fetchall():
-            archives.append({
-                'archive_name': row[0],
-                'archive_type': row[1],
-                'website_url': row[2],
-                'contact_info': row[3],
-                'specialization': row[4],
-                'access_requirements': row[5],
-                'cost_info': row[6],
-                'research_tips': row[7]
-            })
-        
-        conn.close()
+        archives = [dict(archive) for archive in ARCHIVES]
         
         return jsonify({
             'status': 'success',
@@ -1189,29 +689,7 @@ def get_archives():
 def get_sources():
     """Get research sources guide"""
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT source_name, source_type, description, url, 
-                   access_method, cost, research_value
-            FROM research_sources
-            ORDER BY source_name
-        ''')
-        
-        sources = []
-        for row in cursor.fetchall():
-            sources.append({
-                'source_name': row[0],
-                'source_type': row[1],
-                'description': row[2],
-                'url': row[3],
-                'access_method': row[4],
-                'cost': row[5],
-                'research_value': row[6]
-            })
-        
-        conn.close()
+        sources = [dict(source) for source in SOURCES]
         
         return jsonify({
             'status': 'success',
@@ -1229,40 +707,38 @@ def search_personnel():
         data = request.get_json()
         search_term = data.get('search_term', '').strip()
         
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
-        if search_term:
-            cursor.execute('''
-                SELECT service_number, name, rank, squadron, role, age_at_death, 
-                       date_of_death, memorial_location, biography
-                FROM personnel 
-                WHERE name LIKE ? OR service_number LIKE ? OR squadron LIKE ?
-                ORDER BY name
-            ''', (f'%{search_term}%', f'%{search_term}%', f'%{search_term}%'))
-        else:
-            cursor.execute('''
-                SELECT service_number, name, rank, squadron, role, age_at_death, 
-                       date_of_death, memorial_location, biography
-                FROM personnel 
-                ORDER BY name
-            ''')
-        
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'service_number': row[0],
-                'name': row[1],
-                'rank': row[2],
-                'squadron': row[3],
-                'role': row[4],
-                'age_at_death': row[5],
-                'date_of_death': row[6],
-                'memorial_location': row[7],
-                'biography': row[8]
-            })
-        
-        conn.close()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            
+            if search_term:
+                cursor.execute('''
+                    SELECT service_number, name, rank, squadron, role, age_at_death, 
+                           date_of_death, memorial_location, biography
+                    FROM personnel 
+                    WHERE name LIKE ? OR service_number LIKE ? OR squadron LIKE ?
+                    ORDER BY name
+                ''', (f'%{search_term}%', f'%{search_term}%', f'%{search_term}%'))
+            else:
+                cursor.execute('''
+                    SELECT service_number, name, rank, squadron, role, age_at_death, 
+                           date_of_death, memorial_location, biography
+                    FROM personnel 
+                    ORDER BY name
+                ''')
+            
+            results = []
+            for row in cursor.fetchall():
+                results.append({
+                    'service_number': row[0],
+                    'name': row[1],
+                    'rank': row[2],
+                    'squadron': row[3],
+                    'role': row[4],
+                    'age_at_death': row[5],
+                    'date_of_death': row[6],
+                    'memorial_location': row[7],
+                    'biography': row[8]
+                })
         
         return jsonify({
             'status': 'success',
@@ -18,12 +18,13 @@ and all RAF Bomber Command personnel who served with courage and sacrifice.
 """
 
 import os
+import hashlib
 import sqlite3
 import json
 import csv
 import io
 from datetime import datetime, timedelta
-from flask import Flask, request, jsonify, send_file, render_template_string, Response
+from flask import Flask, request, jsonify, send_file, Response
 from flask_cors import CORS
 
 app = Flask(__name__)
@@ -1327,10 +1328,21 @@ HTML_TEMPLATE = '''
 </html>
 '''
 
+# The template has no Jinja markup, so it is encoded once and served as-is
+INDEX_HTML = HTML_TEMPLATE.encode('utf-8')
+INDEX_ETAG = hashlib.sha1(INDEX_HTML).hexdigest()
+
+# Browser cache lifetime for the interface page
+INDEX_MAX_AGE = 600
+
 @app.route('/')
 def index():
     """Serve the enhanced AI Research Assistant interface"""
-    return render_template_string(HTML_TEMPLATE)
+    response = Response(INDEX_HTML, mimetype='text/html')
+    response.cache_control.public = True
+    response.cache_control.max_age = INDEX_MAX_AGE
+    response.set_etag(INDEX_ETAG)
+    return response.make_conditional(request)
 
 @app.route('/api/health')
 def health_check():
@@ -0,0 +1,793 @@
+let currentSearchResults = [];
+let currentSearchMode = 'basic';
+let filterOptions = {};
+
+// The <link rel="preload"> in index.html starts this request during parsing; this deferred
+// script only runs afterwards, and picks up the preloaded response rather than refetching
+const initialStatisticsRequest = fetch('/api/statistics');
+
+// Advanced filter request keys and their input element IDs; inputs are looked up once at startup
+const ADVANCED_FILTER_FIELDS = [
+    ['date_from', 'dateFrom'], ['date_to', 'dateTo'],
+    ['service_from', 'serviceFrom'], ['service_to', 'serviceTo'],
+    ['aircraft_type', 'aircraftType'], ['squadron', 'squadronFilter'],
+    ['role', 'roleFilter'], ['rank', 'rankFilter'], ['base_location', 'baseLocation'],
+    ['age_from', 'ageFrom'], ['age_to', 'ageTo'], ['min_missions', 'minMissions'],
+    ['has_awards', 'hasAwards'], ['memorial_location', 'memorialLocation']
+];
+const filterInputs = {};
+
+// Display labels for the applied-filter summary; keys without a label are not shown
+const FILTER_LABELS = {
+    query: 'Search Terms',
+    date_from: 'Died From', date_to: 'Died To',
+    service_from: 'Service From', service_to: 'Service To',
+    aircraft_type: 'Aircraft Type', squadron: 'Squadron',
+    role: 'Role', rank: 'Rank', base_location: 'Base Location',
+    age_from: 'Minimum Age', age_to: 'Maximum Age', min_missions: 'Minimum Missions',
+    has_awards: 'Awards', memorial_location: 'Memorial Location'
+};
+let personnelSearchInput = null;
+
+let lastFilterKey = '';
+let lastFilterSummary = '';
+
+// Filter dropdowns are filled in idle time; a newer fill supersedes an unfinished one
+let dropdownGeneration = 0;
+const scheduleIdle = window.requestIdleCallback
+    ? callback => window.requestIdleCallback(callback)
+    : callback => setTimeout(() => callback({ timeRemaining: () => 16 }), 1);
+
+// Search responses keyed by endpoint and request body (least-frequently-used eviction)
+const SEARCH_CACHE_SIZE = 32;
+const searchCache = new Map();
+
+// In-flight search per results panel; a newer search aborts the older one
+const searchControllers = {};
+
+// Recent search-result CSVs keyed by export filters (least recently used evicted first)
+const EXPORT_CACHE_SIZE = 4;
+const exportCache = new Map();
+
+// Running exports keyed by target, so a double click does not start a second one
+const exportsInFlight = new Map();
+
+// In-flight CSV download per export family; starting another CSV export aborts it
+const exportControllers = {};
+
+// Live collections: looked up once, they track the DOM without re-querying
+const TAB_CONTENTS = document.getElementsByClassName('tab-content');
+const TABS = document.getElementsByClassName('tab');
+const SEARCH_MODES = document.getElementsByClassName('search-mode');
+
+// The message popup currently on screen, if any
+let currentMessage = null;
+
+// Initialize the application
+document.addEventListener('DOMContentLoaded', function() {
+    // One delegated click listener per container instead of a handler per button
+    const quickButtons = document.getElementsByClassName('quick-buttons');
+    for (let i = 0; i < quickButtons.length; i++) {
+        quickButtons[i].addEventListener('click', handleQuickSearch);
+    }
+    document.getElementById('personnelResults').addEventListener('click', handleResultAction);
+    document.getElementById('statisticsContent').addEventListener('click', handleResultAction);
+    document.getElementById('tabBar').addEventListener('click', e => {
+        const tab = e.target.closest('.tab');
+        if (tab) showTab(tab.dataset.tab);
+    });
+    document.getElementById('searchModes').addEventListener('click', e => {
+        const mode = e.target.closest('.search-mode');
+        if (mode) toggleSearchMode(mode.dataset.mode);
+    });
+
+    for (const [, id] of ADVANCED_FILTER_FIELDS) {
+        filterInputs[id] = document.getElementById(id);
+    }
+    personnelSearchInput = document.getElementById('personnelSearch');
+
+    Promise.all([loadFilterOptions(), loadStatistics(initialStatisticsRequest)]);
+});
+
+function handleQuickSearch(e) {
+    const button = e.target.closest('.quick-btn');
+    if (!button) return;
+
+    if (e.currentTarget.dataset.search === 'aircraft') {
+        quickSearchAircraft(button.dataset.query);
+    } else {
+        quickSearch(button.dataset.query);
+    }
+}
+
+function handleResultAction(e) {
+    const button = e.target.closest('[data-action]');
+    if (!button) return;
+
+    if (button.dataset.action === 'exportMemorial') {
+        exportMemorialPDF(button.dataset.serviceNumber, button.dataset.name, button);
+    }
+}
+
+function showTab(tabName) {
+    // Tabs and their contents are switched on in the same pass that switches the others off
+    for (let i = 0; i < TAB_CONTENTS.length; i++) {
+        TAB_CONTENTS[i].classList.toggle('active', TAB_CONTENTS[i].id === tabName);
+    }
+    for (let i = 0; i < TABS.length; i++) {
+        TABS[i].classList.toggle('active', TABS[i].dataset.tab === tabName);
+    }
+
+    // Load statistics when statistics tab is selected
+    if (tabName === 'statistics') {
+        loadStatistics();
+    }
+}
+
+function toggleSearchMode(mode) {
+    currentSearchMode = mode;
+
+    // Update search mode buttons
+    for (let i = 0; i < SEARCH_MODES.length; i++) {
+        SEARCH_MODES[i].classList.toggle('active', SEARCH_MODES[i].dataset.mode === mode);
+    }
+
+    // Show/hide advanced filters
+    document.getElementById('advancedFilters').classList.toggle('active', mode === 'advanced');
+}
+
+// Filter options change only when the memorial data does
+const FILTER_OPTIONS_CACHE_KEY = 'filterOptions';
+const FILTER_OPTIONS_TTL_MS = 60 * 60 * 1000;
+
+function readCachedFilterOptions() {
+    try {
+        return JSON.parse(localStorage.getItem(FILTER_OPTIONS_CACHE_KEY) || 'null');
+    } catch (error) {
+        return null;
+    }
+}
+
+function writeCachedFilterOptions(entry) {
+    try {
+        localStorage.setItem(FILTER_OPTIONS_CACHE_KEY, JSON.stringify(entry));
+    } catch (error) {
+        // Storage full or disabled; the next visit simply fetches again
+    }
+}
+
+async function loadFilterOptions() {
+    // Fill the dropdowns from the local copy straight away, then revalidate once it expires
+    const cached = readCachedFilterOptions();
+    if (cached) {
+        filterOptions = cached.data;
+        populateFilterDropdowns(cached.data);
+        if (Date.now() - cached.time < FILTER_OPTIONS_TTL_MS) {
+            return;
+        }
+    }
+
+    try {
+        const headers = cached && cached.etag ? { 'If-None-Match': cached.etag } : {};
+        const response = await fetch('/api/filters/options', { headers });
+
+        if (response.status === 304) {
+            writeCachedFilterOptions({ ...cached, time: Date.now() });
+            return;
+        }
+
+        const data = await response.json();
+
+        if (response.ok) {
+            filterOptions = data;
+            populateFilterDropdowns(data);
+            writeCachedFilterOptions({ time: Date.now(), etag: response.headers.get('ETag'), data });
+        }
+    } catch (error) {
+        console.error('Failed to load filter options:', error);
+    }
+}
+
+function fillSelect(id, items, placeholder) {
+    // Options are built off-document as text nodes and swapped in with one DOM operation
+    const fragment = document.createDocumentFragment();
+    fragment.appendChild(new Option(placeholder, ''));
+    for (const item of items) {
+        fragment.appendChild(new Option(item, item));
+    }
+    document.getElementById(id).replaceChildren(fragment);
+}
+
+function populateFilterDropdowns(options) {
+    // Dropdowns are filled while the browser is idle so the first paint and typing are not held up;
+    // each select stays disabled until its options are in
+    const tasks = [
+        ['aircraftType', options.aircraft_types, 'All Aircraft Types'],
+        ['squadronFilter', options.squadrons, 'All Squadrons'],
+        ['roleFilter', options.roles, 'All Roles'],
+        ['rankFilter', options.ranks, 'All Ranks'],
+        ['baseLocation', options.base_locations, 'All Bases'],
+        ['memorialLocation', options.memorial_locations, 'All Memorial Locations']
+    ];
+    const generation = ++dropdownGeneration;
+    for (const [id] of tasks) {
+        document.getElementById(id).disabled = true;
+    }
+    
+    let next = 0;
+    function work(deadline) {
+        // A newer set of options has taken over
+        if (generation !== dropdownGeneration) return;
+        
+        do {
+            const [id, items, placeholder] = tasks[next++];
+            fillSelect(id, items, placeholder);
+            document.getElementById(id).disabled = false;
+        } while (next < tasks.length && deadline.timeRemaining() > 2);
+        
+        if (next < tasks.length) {
+            scheduleIdle(work);
+        }
+    }
+    scheduleIdle(work);
+}
+
+function quickSearch(query) {
+    personnelSearchInput.value = query;
+    searchPersonnel();
+}
+
+function quickSearchAircraft(query) {
+    document.getElementById('aircraftSearch').value = query;
+    searchAircraft();
+}
+
+function clearSearch() {
+    personnelSearchInput.value = '';
+    document.getElementById('personnelResults').innerHTML = '';
+    currentSearchResults = [];
+}
+
+function clearAdvancedFilters() {
+    // Clear all filter inputs
+    for (const [, id] of ADVANCED_FILTER_FIELDS) {
+        filterInputs[id].value = '';
+    }
+
+    // Clear results
+    document.getElementById('personnelResults').innerHTML = '';
+    currentSearchResults = [];
+}
+
+function startSearch(panel) {
+    if (searchControllers[panel]) {
+        searchControllers[panel].abort();
+    }
+    searchControllers[panel] = new AbortController();
+    return searchControllers[panel].signal;
+}
+
+async function cachedSearch(url, body, failureMessage, signal) {
+    // Repeated searches are answered from memory; the least used entry is evicted when full
+    const key = url + JSON.stringify(body);
+    const cached = searchCache.get(key);
+    if (cached) {
+        cached.hits++;
+        return cached.data;
+    }
+
+    const response = await fetch(url, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body),
+        signal
+    });
+
+    const data = await response.json();
+
+    if (!response.ok) {
+        throw new Error(data.error || failureMessage);
+    }
+
+    if (searchCache.size >= SEARCH_CACHE_SIZE) {
+        let leastUsedKey = null;
+        let fewestHits = Infinity;
+        for (const [entryKey, entry] of searchCache) {
+            if (entry.hits < fewestHits) {
+                leastUsedKey = entryKey;
+                fewestHits = entry.hits;
+            }
+        }
+        searchCache.delete(leastUsedKey);
+    }
+    searchCache.set(key, { data, hits: 1 });
+
+    return data;
+}
+
+async function searchPersonnel() {
+    const query = personnelSearchInput.value.trim();
+    const resultsDiv = document.getElementById('personnelResults');
+
+    if (!query && currentSearchMode === 'basic') {
+        resultsDiv.innerHTML = '<div class="error">Please enter a search term</div>';
+        return;
+    }
+
+    resultsDiv.innerHTML = '<div class="loading">Searching personnel records...</div>';
+    const signal = startSearch('personnel');
+
+    try {
+        const data = await cachedSearch('/api/personnel/search', { query }, 'Search failed', signal);
+
+        currentSearchResults = data.results;
+        displayPersonnelResults(data.results, query, 'basic', null, data.results_html);
+
+    } catch (error) {
+        if (error.name === 'AbortError') return;
+        resultsDiv.innerHTML = `<div class="error">Search failed: ${error.message}</div>`;
+    }
+}
+
+function collectAdvancedFilters() {
+    // Reads only: callers do their DOM writes after collecting
+    const filters = { advanced_search: true };
+    const query = personnelSearchInput.value.trim();
+    if (query) {
+        filters.query = query;
+    }
+    for (const [key, id] of ADVANCED_FILTER_FIELDS) {
+        const value = filterInputs[id].value;
+        if (value) {
+            filters[key] = value;
+        }
+    }
+    return filters;
+}
+
+async function advancedSearch() {
+    // Read every filter input before the first DOM write; empty inputs are left out of the request
+    const filters = collectAdvancedFilters();
+
+    const resultsDiv = document.getElementById('personnelResults');
+    resultsDiv.innerHTML = '<div class="loading">Applying advanced filters...</div>';
+    const signal = startSearch('personnel');
+
+    try {
+        const data = await cachedSearch('/api/personnel/search/advanced', filters, 'Advanced search failed', signal);
+
+        currentSearchResults = data.results;
+        displayPersonnelResults(data.results, 'Advanced Search', 'advanced', data.filters_applied, data.results_html);
+
+    } catch (error) {
+        if (error.name === 'AbortError') return;
+        resultsDiv.innerHTML = `<div class="error">Advanced search failed: ${error.message}</div>`;
+    }
+}
+
+function displayPersonnelResults(results, query, searchType, filtersApplied, resultsHtml) {
+    const resultsDiv = document.getElementById('personnelResults');
+
+    if (results.length === 0) {
+        resultsDiv.innerHTML = `<div class="error">No personnel records found for "${query}"</div>`;
+        return;
+    }
+
+    let html = `<div class="search-info">`;
+    html += `<h3>Found ${results.length} personnel record(s)</h3>`;
+    if (searchType === 'advanced' && filtersApplied) {
+        html += `<p><strong>Advanced Search Applied:</strong> `;
+        html += activeFilterSummary(filtersApplied) || 'No specific filters';
+        html += `</p>`;
+    } else {
+        html += `<p><strong>Search Query:</strong> "${query}"</p>`;
+    }
+    html += `</div>`;
+
+    // Cards pre-rendered (and escaped) by the server go in with a single assignment
+    resultsDiv.innerHTML = html + resultsHtml;
+}
+
+function activeFilterSummary(filtersApplied) {
+    // Re-rendering the same filter set reuses the previous summary
+    const key = JSON.stringify(filtersApplied);
+    if (key !== lastFilterKey) {
+        const parts = [];
+        for (const name in filtersApplied) {
+            const value = filtersApplied[name];
+            if (value && value !== '' && FILTER_LABELS[name]) {
+                parts.push(FILTER_LABELS[name] + ': ' + value);
+            }
+        }
+        lastFilterSummary = parts.join(', ');
+        lastFilterKey = key;
+    }
+    return lastFilterSummary;
+}
+
+async function searchAircraft() {
+    const query = document.getElementById('aircraftSearch').value.trim();
+    const resultsDiv = document.getElementById('aircraftResults');
+
+    if (!query) {
+        resultsDiv.innerHTML = '<div class="error">Please enter a search term</div>';
+        return;
+    }
+
+    resultsDiv.innerHTML = '<div class="loading">Searching aircraft records...</div>';
+    const signal = startSearch('aircraft');
+
+    try {
+        const data = await cachedSearch('/api/aircraft/search', { query }, 'Search failed', signal);
+
+        displayAircraftResults(data.results, query);
+
+    } catch (error) {
+        if (error.name === 'AbortError') return;
+        resultsDiv.innerHTML = `<div class="error">Search failed: ${error.message}</div>`;
+    }
+}
+
+function displayAircraftResults(results, query) {
+    const resultsDiv = document.getElementById('aircraftResults');
+
+    if (results.length === 0) {
+        resultsDiv.innerHTML = `<div class="error">No aircraft records found for "${query}"</div>`;
+        return;
+    }
+
+    let html = `<h3>Found ${results.length} aircraft record(s) for "${query}"</h3>`;
+
+    results.forEach(aircraft => {
+        html += `
+            <div class="person-card">
+                <div class="person-name">${aircraft.aircraft_id} - ${aircraft.aircraft_type}</div>
+                <div class="person-details">
+                    <div class="detail-item"><span class="detail-label">Squadron:</span> ${aircraft.squadron}</div>
+                    <div class="detail-item"><span class="detail-label">Code:</span> ${aircraft.squadron_code || 'Not recorded'}</div>
+                    <div class="detail-item"><span class="detail-label">Manufacturer:</span> ${aircraft.manufacturer || 'Not recorded'}</div>
+                    <div class="detail-item"><span class="detail-label">Base:</span> ${aircraft.base_location || 'Not recorded'}</div>
+                    <div class="detail-item"><span class="detail-label">First Flight:</span> ${aircraft.first_flight_date || 'Not recorded'}</div>
+                    <div class="detail-item"><span class="detail-label">Service Period:</span> ${aircraft.service_period_start || 'Unknown'} - ${aircraft.service_period_end || 'Unknown'}</div>
+                    <div class="detail-item"><span class="detail-label">Service Days:</span> ${aircraft.service_days || 'Unknown'}</div>
+                    <div class="detail-item"><span class="detail-label">Missions:</span> ${aircraft.missions_flown || 0}</div>
+                    <div class="detail-item"><span class="detail-label">Fate:</span> ${aircraft.fate || 'Not recorded'}</div>
+                    <div class="detail-item"><span class="detail-label">Notable Crew:</span> ${aircraft.notable_crew || 'Not recorded'}</div>
+                </div>
+            </div>
+        `;
+    });
+
+    resultsDiv.innerHTML = html;
+}
+
+function statsGrid(cards) {
+    const tpl = document.getElementById('statCardTpl').content.firstElementChild;
+    const grid = document.createElement('div');
+    grid.className = 'stats-grid';
+    for (const [number, label] of cards) {
+        const card = tpl.cloneNode(true);
+        card.getElementsByClassName('stat-number')[0].textContent = number;
+        card.getElementsByClassName('stat-label')[0].textContent = label;
+        grid.appendChild(card);
+    }
+    return grid;
+}
+
+function statsHeading(text) {
+    const heading = document.createElement('h3');
+    heading.textContent = text;
+    return heading;
+}
+
+async function loadStatistics(request = fetch('/api/statistics')) {
+    const statsDiv = document.getElementById('statisticsContent');
+
+    try {
+        const response = await request;
+        const data = await response.json();
+
+        if (!response.ok) {
+            throw new Error(data.error || 'Failed to load statistics');
+        }
+
+        // Cards are cloned from <template>s and filled through textContent, so nothing is re-parsed
+        const frag = document.createDocumentFragment();
+        frag.appendChild(statsGrid([
+            [data.personnel_records, 'Personnel Records'],
+            [data.aircraft_records, 'Aircraft Records'],
+            [data.squadron_records, 'Squadron Records'],
+            [data.mission_records, 'Mission Records'],
+            [data.average_age_at_death || 'N/A', 'Average Age at Death'],
+            [data.average_missions_per_person || 'N/A', 'Average Missions'],
+            [data.decorated_personnel, 'Decorated Personnel']
+        ]));
+        frag.appendChild(document.getElementById('statsExportTpl').content.cloneNode(true));
+
+        if (data.featured_personnel && data.featured_personnel.length > 0) {
+            frag.appendChild(statsHeading('Featured Personnel'));
+            const personTpl = document.getElementById('featuredPersonTpl').content.firstElementChild;
+            for (const person of data.featured_personnel) {
+                const card = personTpl.cloneNode(true);
+                card.getElementsByClassName('person-name')[0].textContent = person.name;
+                const values = card.getElementsByClassName('detail-value');
+                values[0].textContent = person.service_number;
+                values[1].textContent = person.rank;
+                values[2].textContent = person.squadron;
+                values[3].textContent = person.mission_count || 'Not recorded';
+                values[4].textContent = person.base_location || 'Not recorded';
+                const button = card.getElementsByTagName('button')[0];
+                button.dataset.serviceNumber = person.service_number;
+                button.dataset.name = person.name;
+                frag.appendChild(card);
+            }
+        }
+
+        if (data.squadron_distribution && data.squadron_distribution.length > 0) {
+            frag.appendChild(statsHeading('Squadron Distribution'));
+            frag.appendChild(statsGrid(data.squadron_distribution.map(squadron => [squadron.count, squadron.squadron])));
+        }
+
+        statsDiv.replaceChildren(frag);
+
+    } catch (error) {
+        statsDiv.innerHTML = `<div class="error">Failed to load statistics: ${error.message}</div>`;
+    }
+}
+
+// Export Functions
+// Whitespace runs in download filenames become underscores
+const FILENAME_WHITESPACE = /\s+/g;
+
+function sanitizeFilename(text) {
+    return text.replace(FILENAME_WHITESPACE, '_');
+}
+
+function downloadURL(url, filename) {
+    const a = Object.assign(document.createElement('a'), { href: url, download: filename });
+    document.body.appendChild(a);
+    a.click();
+    a.remove();
+}
+
+function downloadBlob(blob, filename) {
+    const url = URL.createObjectURL(blob);
+    downloadURL(url, filename);
+    URL.revokeObjectURL(url);
+}
+
+function startExport(family) {
+    if (exportControllers[family]) {
+        exportControllers[family].abort();
+    }
+    exportControllers[family] = new AbortController();
+    return exportControllers[family].signal;
+}
+
+function trackExport(key, button, task) {
+    // A repeat click while the same export is running joins it instead of starting another
+    if (exportsInFlight.has(key)) {
+        return exportsInFlight.get(key);
+    }
+
+    if (button) button.disabled = true;
+    const promise = task().finally(() => {
+        exportsInFlight.delete(key);
+        if (button) button.disabled = false;
+    });
+    exportsInFlight.set(key, promise);
+    return promise;
+}
+
+// Export fetches are user-initiated downloads, so they ask for high fetch priority
+function exportMemorialPDF(serviceNumber, name, button) {
+    return trackExport(`pdf:${serviceNumber}`, button, async () => {
+        try {
+            showMessage(`Generating memorial report for ${name}...`, 'loading');
+
+            const response = await fetch(`/api/export/pdf/memorial/${serviceNumber}`, { priority: 'high' });
+
+            if (!response.ok) {
+                const error = await response.json();
+                throw new Error(error.error || 'PDF generation failed');
+            }
+
+            downloadBlob(await response.blob(), `RAF_Memorial_Report_${sanitizeFilename(name)}_${serviceNumber}.pdf`);
+
+            showMessage(`Memorial report for ${name} downloaded successfully!`, 'success');
+
+        } catch (error) {
+            showMessage(`Failed to generate memorial report: ${error.message}`, 'error');
+        }
+    });
+}
+
+function exportURL(path, params) {
+    const query = new URLSearchParams(params).toString();
+    return query ? `${path}?${query}` : path;
+}
+
+// Messages for failed CSV export checks; HEAD responses carry no JSON error body
+const CSV_EXPORT_ERRORS = {
+    400: 'Invalid search filters',
+    404: 'No records found for export'
+};
+
+async function streamCSVExport(url, filename) {
+    // Where supported, ask for the destination first (while the click still counts as a
+    // user gesture) and stream the response straight to disk; returns false if cancelled
+    if ('showSaveFilePicker' in window) {
+        let fileHandle;
+        try {
+            fileHandle = await window.showSaveFilePicker({
+                suggestedName: filename,
+                types: [{ description: 'CSV file', accept: { 'text/csv': ['.csv'] } }]
+            });
+        } catch (error) {
+            if (error.name === 'AbortError') return false;
+            throw error;
+        }
+
+        const response = await fetch(url, { signal: startExport('csv'), priority: 'high' });
+
+        if (!response.ok) {
+            const error = await response.json();
+            throw new Error(error.error || 'CSV export failed');
+        }
+
+        await response.body.pipeTo(await fileHandle.createWritable());
+        return true;
+    }
+
+    // Otherwise let the browser download the streamed response itself, so the CSV is
+    // written to disk as it arrives instead of being collected into a Blob first. A
+    // navigation can't report failure, so a HEAD request checks the export beforehand
+    const check = await fetch(url, { method: 'HEAD', signal: startExport('csv') });
+
+    if (!check.ok) {
+        throw new Error(CSV_EXPORT_ERRORS[check.status] || 'CSV export failed');
+    }
+
+    downloadURL(url, filename);
+    return true;
+}
+
+function exportAllPersonnelCSV(button) {
+    return trackExport('csv:personnel', button, async () => {
+        try {
+            showMessage('Generating complete personnel database export...', 'loading');
+
+            const saved = await streamCSVExport('/api/export/csv/personnel', 'RAF_Personnel_Complete_Database_Advanced.csv');
+
+            if (saved) {
+                showMessage('Personnel database exported successfully!', 'success');
+            } else {
+                showMessage('Personnel database export cancelled.', 'error');
+            }
+
+        } catch (error) {
+            if (error.name === 'AbortError') return;
+            showMessage(`Failed to export personnel database: ${error.message}`, 'error');
+        }
+    });
+}
+
+function exportSearchResultsCSV(button) {
+    if (currentSearchResults.length === 0) {
+        showMessage('No search results to export. Please perform a search first.', 'error');
+        return;
+    }
+
+    let exportData;
+    let filename;
+    let message;
+
+    if (currentSearchMode === 'advanced') {
+        // Same filter values as the search itself, read from the cached inputs
+        exportData = collectAdvancedFilters();
+        filename = 'RAF_Personnel_Advanced_Search_Results.csv';
+        message = 'Exporting advanced search results...';
+    } else {
+        const query = personnelSearchInput.value.trim();
+        exportData = { query };
+        filename = `RAF_Personnel_Search_${sanitizeFilename(query || 'Search')}.csv`;
+        message = `Exporting search results for "${query}"...`;
+    }
+
+    // Search exports are capped at the result limit, so the CSV is small enough to keep;
+    // exporting the same search again is served from memory
+    const key = JSON.stringify(exportData);
+
+    return trackExport(`csv:search:${key}`, button, async () => {
+        try {
+            showMessage(message, 'loading');
+
+            let blob = exportCache.get(key);
+            if (blob) {
+                exportCache.delete(key);
+            } else {
+                const response = await fetch(exportURL('/api/export/csv/personnel', exportData), {
+                    signal: startExport('csv'),
+                    priority: 'high'
+                });
+
+                if (!response.ok) {
+                    const error = await response.json();
+                    throw new Error(error.error || 'CSV export failed');
+                }
+
+                blob = await response.blob();
+                if (exportCache.size >= EXPORT_CACHE_SIZE) {
+                    exportCache.delete(exportCache.keys().next().value);
+                }
+            }
+            exportCache.set(key, blob);
+
+            downloadBlob(blob, filename);
+            showMessage('Search results exported successfully!', 'success');
+
+        } catch (error) {
+            if (error.name === 'AbortError') return;
+            showMessage(`Failed to export search results: ${error.message}`, 'error');
+        }
+    });
+}
+
+function exportAircraftCSV(button) {
+    return trackExport('csv:aircraft', button, async () => {
+        try {
+            showMessage('Generating aircraft database export...', 'loading');
+
+            const saved = await streamCSVExport('/api/export/csv/aircraft', 'RAF_Aircraft_Database_Advanced.csv');
+
+            if (saved) {
+                showMessage('Aircraft database exported successfully!', 'success');
+            } else {
+                showMessage('Aircraft database export cancelled.', 'error');
+            }
+
+        } catch (error) {
+            if (error.name === 'AbortError') return;
+            showMessage(`Failed to export aircraft database: ${error.message}`, 'error');
+        }
+    });
+}
+
+function showMessage(message, type) {
+    // Only one message is shown at a time
+    if (currentMessage) {
+        currentMessage.remove();
+    }
+
+    // Position and colours come from the .message-popup classes
+    const messageDiv = document.createElement('div');
+    messageDiv.className = `message-popup ${type}`;
+    messageDiv.textContent = message;
+    document.body.appendChild(messageDiv);
+    currentMessage = messageDiv;
+
+    // Auto-remove after 5 seconds for success/error messages, once the browser is idle
+    if (type !== 'loading') {
+        setTimeout(() => scheduleIdle(() => {
+            messageDiv.remove();
+            if (currentMessage === messageDiv) {
+                currentMessage = null;
+            }
+        }), 5000);
+    }
+}
+
+// Handle Enter key in search boxes (one delegated listener for both)
+document.addEventListener('keydown', function(e) {
+    if (e.key !== 'Enter' || e.isComposing) return;
+
+    if (e.target.id === 'personnelSearch') {
+        if (currentSearchMode === 'advanced') {
+            advancedSearch();
+        } else {
+            searchPersonnel();
+        }
+    } else if (e.target.id === 'aircraftSearch') {
+        searchAircraft();
+    }
+}, { passive: true });